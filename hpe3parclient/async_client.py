@@ -0,0 +1,649 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" HPE 3PAR asyncio REST Client.
+
+.. module: async_client
+
+:Description: This is the asyncio version of the 3PAR Client.  Every method
+ is a coroutine with the same arguments, return value and exceptions as the
+ method of the same name on :class:`~hpe3parclient.client.HPE3ParClient`.
+ It covers the volume, host, VLUN, volume set, CPG, QoS and task calls, so
+ many WSAPI calls can be in flight on a single event loop, and a few CLI
+ calls run over :class:`~hpe3parclient.async_ssh.AsyncHPE3PARSSHClient`.
+
+ This module needs Python 3.5 or later and the aiohttp package, and the
+ asyncssh package for the CLI calls.
+
+.. code-block:: python
+
+    async with AsyncHPE3ParClient(api_url) as cl:
+        await cl.login(username, password)
+        volumes = await asyncio.gather(*[cl.getVolume(name)
+                                         for name in names])
+        await cl.logout()
+
+"""
+
+import logging
+
+try:
+    # For Python 3.0 and later
+    from urllib.parse import quote
+except ImportError:
+    # Fall back to Python 2's urllib2
+    from urllib2 import quote
+
+from hpe3parclient import async_http
+from hpe3parclient import async_ssh
+from hpe3parclient import exceptions
+from hpe3parclient.client import HPE3ParClient
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHPE3ParClient(object):
+    """ The asyncio 3PAR REST API Client.
+
+    The constants of :class:`~hpe3parclient.client.HPE3ParClient`, like
+    ``HPE3ParClient.SET_MEM_ADD``, apply to this client too.
+
+    :param api_url: The url to the WSAPI service on 3PAR
+                    ie. http://<3par server>:8080/api/v1
+    :type api_url: str
+    :param pool_maxsize: The maximum number of connections kept open to the
+                         WSAPI server
+    :type pool_maxsize: int
+    :param pool_idle_timeout: Seconds an unused pooled connection is kept
+    :type pool_idle_timeout: float
+    :param retry_policy: Decides which failed WSAPI requests are retried
+    :type retry_policy: :class:`~hpe3parclient.retry.RetryPolicy`
+    :param json_codec: The codec used for request and response bodies
+    :type json_codec: str or :class:`~hpe3parclient.codec.JSONCodec`
+
+    """
+
+    def __init__(self, api_url, secure=False, timeout=None, pool_maxsize=10,
+                 pool_idle_timeout=15, retry_policy=None, json_codec=None):
+        self.api_url = api_url
+        self.http = async_http.AsyncHTTPJSONRESTClient(
+            self.api_url, secure=secure, timeout=timeout,
+            pool_maxsize=pool_maxsize, pool_idle_timeout=pool_idle_timeout,
+            retry_policy=retry_policy, json_codec=json_codec)
+        self.vlun_query_supported = True
+        self.primera_supported = False
+        self.ssh = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Close the pooled connections to the WSAPI server, and the SSH
+        connection."""
+        await self.http.close()
+        if self.ssh is not None:
+            await self.ssh.close()
+
+    def setSSHOptions(self, ip, login, password, port=22,
+                      conn_timeout=None, privatekey=None,
+                      **kwargs):
+        """Set SSH Options for ssh calls.
+
+        See :meth:`HPE3ParClient.setSSHOptions`. The keyword arguments are
+        passed on to :class:`~hpe3parclient.async_ssh.AsyncHPE3PARSSHClient`.
+
+        """
+        self.ssh = async_ssh.AsyncHPE3PARSSHClient(ip, login, password, port,
+                                                   conn_timeout, privatekey,
+                                                   **kwargs)
+
+    async def _run(self, cmd):
+        if self.ssh is None:
+            raise exceptions.SSHException('SSH is not initialized. Initialize'
+                                          ' it by calling "setSSHOptions".')
+        await self.ssh.open()
+        return await self.ssh.run(cmd)
+
+    def is_primera_array(self):
+        return self.primera_supported
+
+    async def getWsApiVersion(self):
+        """Get the 3PAR WS API version.
+
+        :returns: Version dict
+
+        """
+        # The version lives at host:port/api, outside of the api_url.
+        host_url = self.api_url.split('/api')[0].rstrip('/')
+        response, body = await self.http.get(host_url + '/api')
+
+        if body['build'] >= HPE3ParClient.HPE3PAR_WS_PRIMERA_MIN_BUILD_VERSION:
+            self.primera_supported = True
+
+        return body
+
+    async def login(self, username, password, optional=None):
+        """This authenticates against the 3PAR wsapi server and creates a
+           session.
+
+        :param username: The username
+        :type username: str
+        :param password: The Password
+        :type password: str
+
+        :returns: None
+
+        """
+        await self.http.authenticate(username, password, optional)
+
+    async def logout(self):
+        """This destroys the session and logs out from the 3PAR server.
+
+        :returns: None
+
+        """
+        await self.http.unauthenticate()
+
+    async def getStorageSystemInfo(self):
+        """See :meth:`HPE3ParClient.getStorageSystemInfo`."""
+        response, body = await self.http.get('/system')
+        return body
+
+    # Volume methods
+    async def getVolumes(self):
+        """See :meth:`HPE3ParClient.getVolumes`."""
+        response, body = await self.http.get('/volumes')
+        return body
+
+    async def getVolume(self, name):
+        """See :meth:`HPE3ParClient.getVolume`."""
+        response, body = await self.http.get('/volumes/%s' % name)
+        return body
+
+    async def createVolume(self, name, cpgName, sizeMiB, optional=None):
+        """See :meth:`HPE3ParClient.createVolume`."""
+        info = {'name': name, 'cpg': cpgName, 'sizeMiB': sizeMiB}
+        if not optional and self.primera_supported:
+            optional = {'tpvv': True}
+        if optional:
+            if self.primera_supported:
+                optional = HPE3ParClient._convert_primera_volume_options(
+                    optional)
+            info.update(optional)
+        logger.debug("Parameters passed for create volume %s" % info)
+
+        try:
+            response, body = await self.http.post('/volumes', body=info)
+            return body
+        except exceptions.HTTPBadRequest as ex:
+            if self.primera_supported:
+                HPE3ParClient._check_primera_volume_error(ex)
+            raise ex
+
+    async def deleteVolume(self, name):
+        """See :meth:`HPE3ParClient.deleteVolume`."""
+        response, body = await self.http.delete('/volumes/%s' % name)
+        return body
+
+    async def modifyVolume(self, name, volumeMods, appType=None):
+        """See :meth:`HPE3ParClient.modifyVolume`."""
+        response = await self.http.put('/volumes/%s' % name,
+                                       body=volumeMods)
+
+        if appType is not None:
+            if 'newName' in volumeMods and volumeMods['newName']:
+                name = volumeMods['newName']
+
+            try:
+                await self.setVolumeMetaData(name, 'hpe_ecosystem_product',
+                                             appType)
+            except Exception:
+                pass
+
+        return response
+
+    async def growVolume(self, name, amount):
+        """See :meth:`HPE3ParClient.growVolume`."""
+        info = {'action': HPE3ParClient.GROW_VOLUME,
+                'sizeMiB': int(amount)}
+
+        response, body = await self.http.put('/volumes/%s' % name, body=info)
+        return body
+
+    async def copyVolume(self, src_name, dest_name, dest_cpg, optional=None):
+        """See :meth:`HPE3ParClient.copyVolume`."""
+        parameters = {'destVolume': dest_name,
+                      'destCPG': dest_cpg}
+        if optional:
+            if self.primera_supported:
+                optional = HPE3ParClient._convert_primera_volume_options(
+                    optional)
+            parameters.update(optional)
+        if 'online' not in parameters or not parameters['online']:
+            # 3Par won't allow destCPG to be set if it's not an online copy.
+            parameters.pop('destCPG', None)
+
+        info = {'action': 'createPhysicalCopy',
+                'parameters': parameters}
+        logger.debug("Parameters passed for copy volume %s" % info)
+        try:
+            response, body = await self.http.post('/volumes/%s' % src_name,
+                                                  body=info)
+            return body
+        except exceptions.HTTPBadRequest as ex:
+            if self.primera_supported:
+                HPE3ParClient._check_primera_volume_error(ex, '.')
+            raise ex
+
+    async def createSnapshot(self, name, copyOfName, optional=None):
+        """See :meth:`HPE3ParClient.createSnapshot`."""
+        parameters = {'name': name}
+        if optional:
+            parameters.update(optional)
+
+        info = {'action': 'createSnapshot',
+                'parameters': parameters}
+
+        response, body = await self.http.post('/volumes/%s' % copyOfName,
+                                              body=info)
+        return body
+
+    async def setVolumeMetaData(self, name, key, value):
+        """See :meth:`HPE3ParClient.setVolumeMetaData`."""
+        info = {
+            'key': key,
+            'value': value
+        }
+
+        try:
+            response, body = await self.http.post(
+                '/volumes/%s/objectKeyValues' % name, body=info)
+        except exceptions.HTTPConflict:
+            info = {
+                'value': value
+            }
+            response, body = await self.http.put(
+                '/volumes/%(name)s/objectKeyValues/%(key)s' %
+                {'name': name, 'key': key}, body=info)
+
+        return response
+
+    # Task methods
+    async def getAllTasks(self):
+        """See :meth:`HPE3ParClient.getAllTasks`."""
+        response, body = await self.http.get('/tasks')
+        return body
+
+    async def getTask(self, taskId):
+        """See :meth:`HPE3ParClient.getTask`."""
+        try:
+            task = int(taskId)
+        except ValueError:
+            raise exceptions.HTTPBadRequest("Task ID is not an integer")
+
+        response, body = await self.http.get('/tasks/%s' % task)
+        return body
+
+    # Host methods
+    async def getHosts(self):
+        """See :meth:`HPE3ParClient.getHosts`."""
+        response, body = await self.http.get('/hosts')
+        return body
+
+    async def getHost(self, name):
+        """See :meth:`HPE3ParClient.getHost`."""
+        response, body = await self.http.get('/hosts/%s' % name)
+        return body
+
+    async def createHost(self, name, iscsiNames=None, FCWwns=None, nqn=None,
+                         optional=None):
+        """See :meth:`HPE3ParClient.createHost`."""
+        info = {'name': name}
+
+        if iscsiNames:
+            info['iSCSINames'] = iscsiNames
+
+        if FCWwns:
+            info['FCWWNs'] = FCWwns
+
+        if nqn:
+            info['NQN'] = nqn
+
+        if optional:
+            info.update(optional)
+
+        try:
+            response, body = await self.http.post('/hosts', body=info)
+        except Exception as ex:
+            logger.error("Failed to create host: %s", str(ex))
+            raise
+        hostObj = None
+        if response is not None and 'location' in response:
+            logger.debug("Created host at: %s", response['location'])
+            hostObj = await self.getHost(name)
+            if hostObj is None:
+                msg = "Host %s was created but not found." % name
+                raise exceptions.HTTPNotFound(error={'desc': msg})
+        return hostObj
+
+    async def modifyHost(self, name, mod_request):
+        """See :meth:`HPE3ParClient.modifyHost`."""
+        response = await self.http.put('/hosts/%s' % name, body=mod_request)
+        return response
+
+    async def deleteHost(self, name):
+        """See :meth:`HPE3ParClient.deleteHost`."""
+        await self.http.delete('/hosts/%s' % name)
+
+    async def queryHost(self, iqns=None, wwns=None):
+        """See :meth:`HPE3ParClient.queryHost`."""
+        wwnsQuery = ''
+        if wwns:
+            wwnsQuery = ('FCPaths[%s]' %
+                         ' OR '.join('wwn==%s' % wwn for wwn in wwns))
+
+        iqnsQuery = ''
+        if iqns:
+            iqnsQuery = ('iSCSIPaths[%s]' %
+                         ' OR '.join('name==%s' % iqn for iqn in iqns))
+
+        if wwnsQuery and iqnsQuery:
+            query = '%s OR %s' % (wwnsQuery, iqnsQuery)
+        else:
+            query = wwnsQuery or iqnsQuery
+
+        query = '"%s"' % query
+
+        response, body = await self.http.get('/hosts?query=%s' %
+                                             quote(query.encode("utf8")))
+        return body
+
+    async def getHostVLUNs(self, hostName):
+        """See :meth:`HPE3ParClient.getHostVLUNs`."""
+        # calling getHost to see if the host exists and raise not found
+        # exception if it's not found.
+        await self.getHost(hostName)
+
+        vluns = []
+        if self.vlun_query_supported:
+            query = '"hostname EQ %s"' % hostName
+            response, body = await self.http.get(
+                '/vluns?query=%s' % quote(query.encode("utf8")))
+            vluns = list(body.get('members', []))
+        else:
+            allVLUNs = await self.getVLUNs()
+            if allVLUNs:
+                vluns = [vlun for vlun in allVLUNs['members']
+                         if vlun.get('hostname') == hostName]
+
+        if len(vluns) < 1:
+            raise exceptions.HTTPNotFound(
+                {'code': 'NON_EXISTENT_VLUNS',
+                 'desc': "No VLUNs for host '%s' found" % hostName})
+        return vluns
+
+    # VLUN methods
+    async def getVLUNs(self):
+        """See :meth:`HPE3ParClient.getVLUNs`."""
+        response, body = await self.http.get('/vluns')
+        return body
+
+    async def getVLUN(self, volumeName, allVluns=False):
+        """See :meth:`HPE3ParClient.getVLUN`."""
+        if self.vlun_query_supported:
+            query = '"volumeName EQ %s"' % volumeName
+            response, body = await self.http.get(
+                '/vluns?query=%s' % quote(query.encode("utf8")))
+
+            vluns = body.get('members', [])
+            if allVluns:
+                # Return all the VLUNs found for the volume.
+                return vluns
+            if vluns:
+                # Return the first VLUN found for the volume.
+                return vluns[0]
+        else:
+            vluns = await self.getVLUNs()
+            if vluns:
+                for vlun in vluns['members']:
+                    if vlun['volumeName'] == volumeName:
+                        return vlun
+
+        raise exceptions.HTTPNotFound({'code': 'NON_EXISTENT_VLUN',
+                                       'desc': "VLUN '%s' was not found" %
+                                               volumeName})
+
+    async def createVLUN(self, volumeName, lun=None, hostname=None,
+                         portPos=None, noVcn=None, overrideLowerPriority=None,
+                         auto=False):
+        """See :meth:`HPE3ParClient.createVLUN`."""
+        info = {'volumeName': volumeName}
+
+        if lun is not None:
+            info['lun'] = lun
+
+        if hostname:
+            info['hostname'] = hostname
+
+        if portPos:
+            info['portPos'] = portPos
+
+        if noVcn:
+            info['noVcn'] = noVcn
+
+        if overrideLowerPriority:
+            info['overrideLowerPriority'] = overrideLowerPriority
+
+        if auto:
+            info['autoLun'] = True
+            info['maxAutoLun'] = 0
+            info['lun'] = 0
+
+        headers, body = await self.http.post('/vluns', body=info)
+        if headers:
+            return headers['location'].replace('/api/v1/vluns/', '')
+        return None
+
+    async def deleteVLUN(self, volumeName, lunID, hostname=None, port=None):
+        """See :meth:`HPE3ParClient.deleteVLUN`."""
+        vlun = "%s,%s" % (volumeName, lunID)
+
+        if hostname:
+            vlun += ",%s" % hostname
+        elif port:
+            vlun += ","
+
+        if port:
+            vlun += ",%s:%s:%s" % (port['node'],
+                                   port['slot'],
+                                   port['cardPort'])
+
+        await self.http.delete('/vluns/%s' % vlun)
+
+    # Volume Set methods
+    async def getVolumeSets(self):
+        """See :meth:`HPE3ParClient.getVolumeSets`."""
+        response, body = await self.http.get('/volumesets')
+        return body
+
+    async def getVolumeSet(self, name):
+        """See :meth:`HPE3ParClient.getVolumeSet`."""
+        response, body = await self.http.get('/volumesets/%s' % name)
+        return body
+
+    async def createVolumeSet(self, name, domain=None, comment=None,
+                              setmembers=None):
+        """See :meth:`HPE3ParClient.createVolumeSet`."""
+        info = {'name': name}
+
+        if domain:
+            info['domain'] = domain
+
+        if comment:
+            info['comment'] = comment
+
+        if setmembers:
+            info['setmembers'] = setmembers
+
+        await self.http.post('/volumesets', body=info)
+
+    async def deleteVolumeSet(self, name):
+        """See :meth:`HPE3ParClient.deleteVolumeSet`."""
+        await self.http.delete('/volumesets/%s' % name)
+
+    async def modifyVolumeSet(self, name, action=None, newName=None,
+                              comment=None, flashCachePolicy=None,
+                              setmembers=None):
+        """See :meth:`HPE3ParClient.modifyVolumeSet`."""
+        info = {}
+
+        if action:
+            info['action'] = action
+
+        if newName:
+            info['newName'] = newName
+
+        if comment:
+            info['comment'] = comment
+
+        if flashCachePolicy:
+            info['flashCachePolicy'] = flashCachePolicy
+
+        if setmembers:
+            info['setmembers'] = setmembers
+
+        response = await self.http.put('/volumesets/%s' % name, body=info)
+        return response
+
+    async def addVolumeToVolumeSet(self, set_name, name):
+        """See :meth:`HPE3ParClient.addVolumeToVolumeSet`."""
+        return await self.modifyVolumeSet(
+            set_name, action=HPE3ParClient.SET_MEM_ADD, setmembers=[name])
+
+    async def removeVolumeFromVolumeSet(self, set_name, name):
+        """See :meth:`HPE3ParClient.removeVolumeFromVolumeSet`."""
+        return await self.modifyVolumeSet(
+            set_name, action=HPE3ParClient.SET_MEM_REMOVE, setmembers=[name])
+
+    # CPG methods
+    async def getCPGs(self):
+        """See :meth:`HPE3ParClient.getCPGs`."""
+        response, body = await self.http.get('/cpgs')
+        return body
+
+    async def getCPG(self, name):
+        """See :meth:`HPE3ParClient.getCPG`."""
+        response, body = await self.http.get('/cpgs/%s' % name)
+        return body
+
+    async def getCPGAvailableSpace(self, name):
+        """See :meth:`HPE3ParClient.getCPGAvailableSpace`."""
+        info = {'cpg': name}
+
+        response, body = await self.http.post('/spacereporter', body=info)
+        return body
+
+    async def createCPG(self, name, optional=None):
+        """See :meth:`HPE3ParClient.createCPG`."""
+        info = {'name': name}
+        if optional:
+            if self.primera_supported:
+                ldlayout = optional.get('LDLayout')
+                if ldlayout:
+                    ldlayout.pop('setSize', None)
+                    if ldlayout.get('RAIDType') == 1:
+                        ldlayout.pop('RAIDType')
+            info.update(optional)
+
+        response, body = await self.http.post('/cpgs', body=info)
+        return body
+
+    async def deleteCPG(self, name):
+        """See :meth:`HPE3ParClient.deleteCPG`."""
+        await self.http.delete('/cpgs/%s' % name)
+
+    # QoS methods
+    async def queryQoSRules(self):
+        """See :meth:`HPE3ParClient.queryQoSRules`."""
+        response, body = await self.http.get('/qos')
+        return body
+
+    async def queryQoSRule(self, targetName, targetType='vvset'):
+        """See :meth:`HPE3ParClient.queryQoSRule`."""
+        response, body = await self.http.get(
+            '/qos/%(targetType)s:%(targetName)s' %
+            {'targetType': targetType, 'targetName': targetName})
+        return body
+
+    async def createQoSRules(self, targetName, qosRules,
+                             target_type=HPE3ParClient.TARGET_TYPE_VVSET):
+        """See :meth:`HPE3ParClient.createQoSRules`."""
+        info = {'name': targetName,
+                'type': target_type}
+        info.update(qosRules)
+
+        response, body = await self.http.post('/qos', body=info)
+        return body
+
+    async def modifyQoSRules(self, targetName, qosRules, targetType='vvset'):
+        """See :meth:`HPE3ParClient.modifyQoSRules`."""
+        response = await self.http.put(
+            '/qos/%(targetType)s:%(targetName)s' %
+            {'targetType': targetType, 'targetName': targetName},
+            body=qosRules)
+        return response
+
+    async def deleteQoSRules(self, targetName, targetType='vvset'):
+        """See :meth:`HPE3ParClient.deleteQoSRules`."""
+        response, body = await self.http.delete(
+            '/qos/%(targetType)s:%(targetName)s' %
+            {'targetType': targetType, 'targetName': targetName})
+        return body
+
+    # CLI methods
+    async def getPatches(self, history=True):
+        """See :meth:`HPE3ParClient.getPatches`."""
+        cmd = ['showpatch']
+        if history:
+            cmd.append('-hist')
+        return HPE3ParClient.convert_cli_output_to_wsapi_format(
+            await self._run(cmd))
+
+    async def getPatch(self, patch_id):
+        """See :meth:`HPE3ParClient.getPatch`."""
+        return await self._run(['showpatch', '-d', patch_id])
+
+    async def setQOSRule(self, set_name, max_io=None, max_bw=None):
+        """See :meth:`HPE3ParClient.setQOSRule`."""
+        cmd = ['setqos']
+        if max_io is not None:
+            cmd.extend(['-io', '%s' % max_io])
+        if max_bw is not None:
+            cmd.extend(['-bw', '%sM' % max_bw])
+        cmd.append('vvset:' + set_name)
+        result = await self._run(cmd)
+
+        if result:
+            msg = result[0]
+        else:
+            msg = None
+
+        if msg:
+            if 'no matching QoS target found' in msg:
+                raise exceptions.HTTPNotFound(error={'desc': msg})
+            else:
+                raise exceptions.SetQOSRuleException(message=msg)
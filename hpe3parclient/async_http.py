@@ -0,0 +1,322 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" AsyncHTTPJSONRESTClient.
+
+.. module: async_http
+
+:Description: This is the asyncio version of the HTTP Client.  It sends the
+ same requests as :class:`~hpe3parclient.http.HTTPJSONRESTClient` and maps
+ the responses to the same exceptions, but all calls are coroutines running
+ on top of an aiohttp connection pool.
+
+ This module needs Python 3.5 or later and the aiohttp package.
+
+"""
+
+import asyncio
+import logging
+
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from hpe3parclient import codec
+from hpe3parclient import exceptions
+from hpe3parclient import retry
+
+
+class AsyncHTTPJSONRESTClient(object):
+    """
+    An asyncio HTTP REST Client that sends and recieves JSON data as the body
+    of the HTTP request.
+
+    :param api_url: The url to the WSAPI service on 3PAR
+                    ie. http://<3par server>:8080
+    :type api_url: str
+    :param secure: Validate SSL cert? Default will not validate
+    :type secure: bool
+    :param timeout: Total timeout in seconds of a single request attempt
+    :type timeout: float
+    :param pool_maxsize: The maximum number of connections kept open to a
+                         single host. Default is 10.
+    :type pool_maxsize: int
+    :param pool_idle_timeout: Seconds a pooled connection may sit unused
+                              before it is closed. Default is 15.
+    :type pool_idle_timeout: float
+    :param retry_policy: Decides which failed requests are retried.
+    :type retry_policy: :class:`~hpe3parclient.retry.RetryPolicy`
+    :param json_codec: The codec used for request and response bodies, by
+                       name or instance. Default is the fastest installed.
+    :type json_codec: str or :class:`~hpe3parclient.codec.JSONCodec`
+
+    """
+
+    USER_AGENT = 'python-3parclient'
+    SESSION_COOKIE_NAME = 'X-Hp3Par-Wsapi-Sessionkey'
+    _logger = logging.getLogger(__name__)
+
+    def __init__(self, api_url, secure=False, timeout=None, pool_maxsize=10,
+                 pool_idle_timeout=15, retry_policy=None, json_codec=None):
+        if aiohttp is None:
+            raise ImportError(
+                "The aiohttp package is required for the asyncio client")
+
+        self.session_key = None
+        self.set_url(api_url)
+        self.secure = secure
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self.session = None
+        self.codec = codec.get_codec(json_codec)
+
+        if retry_policy is None:
+            retry_policy = retry.RetryPolicy(
+                retry_exceptions=(exceptions.HTTPServiceUnavailable,
+                                  aiohttp.ClientConnectionError),
+                non_idempotent_retry_exceptions=(
+                    exceptions.HTTPServiceUnavailable,
+                    aiohttp.ClientConnectorError))
+        self.retry_policy = retry_policy
+        self._reauth_lock = None
+
+    def set_url(self, api_url):
+        # should be http://<Server:Port>/api/v1
+        self.api_url = api_url.rstrip('/')
+
+    def _get_session(self):
+        # aiohttp sessions belong to the running event loop, so the session
+        # is created on first use rather than in __init__.
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=0, limit_per_host=self.pool_maxsize,
+                keepalive_timeout=self.pool_idle_timeout,
+                ssl=None if self.secure else False)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self.session
+
+    async def close(self):
+        """
+        This closes all pooled connections to the 3PAR server.
+
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def authenticate(self, user, password, optional=None):
+        """
+        This tries to create an authenticated session with the 3PAR server
+
+        :param user: The username
+        :type user: str
+        :param password: Password
+        :type password: str
+
+        """
+        info = {'user': user, 'password': password}
+        self._auth_optional = None
+
+        if optional:
+            self._auth_optional = optional
+            info.update(optional)
+
+        # The other coroutines keep using the old key until the new one
+        # arrives. Only this request must not log in again when it fails.
+        resp, body = await self._cs_request('/credentials', 'POST',
+                                            reauth=False, session_key=None,
+                                            body=info)
+        if body and 'key' in body:
+            self.session_key = body['key']
+        self.user = user
+        self.password = password
+
+    async def unauthenticate(self):
+        """
+        This clears the authenticated session with the 3PAR server.
+
+        """
+        await self.delete('/credentials/%s' % self.session_key)
+        self.session_key = None
+
+    async def request(self, *args, **kwargs):
+        """
+        This makes an HTTP Request to the 3Par server.
+        You should use get, post, delete instead.
+
+        """
+        session_key = kwargs.pop('session_key', self.session_key)
+        if session_key:
+            kwargs.setdefault('headers', {})[self.SESSION_COOKIE_NAME] = \
+                session_key
+
+        kwargs.setdefault('headers', kwargs.get('headers', {}))
+        kwargs['headers']['User-Agent'] = self.USER_AGENT
+        kwargs['headers']['Accept'] = 'application/json'
+        if 'body' in kwargs:
+            kwargs['headers']['Content-Type'] = 'application/json'
+            payload = self.codec.dumps(kwargs['body'])
+        else:
+            payload = None
+
+        # args[0] contains the URL, args[1] contains the HTTP verb/method
+        http_url = args[0]
+        http_method = args[1]
+
+        retry_state = self.retry_policy.new_state(http_method)
+        while True:
+            try:
+                if retry_state.delay:
+                    await asyncio.sleep(retry_state.delay)
+
+                session = self._get_session()
+                async with session.request(http_method, http_url,
+                                           data=payload,
+                                           headers=kwargs['headers']) as r:
+                    body = await r.read()
+                    resp = CaseInsensitiveDict(r.headers)
+                    resp['status'] = str(r.status)
+                    resp.status = r.status
+                    if 'location' not in resp:
+                        resp['content-location'] = str(r.url)
+
+                if body:
+                    try:
+                        body = self.codec.loads(body)
+                    except ValueError:
+                        body = body.decode(r.get_encoding(), 'replace')
+                else:
+                    body = None
+
+                if resp.status >= 400:
+                    if body and 'message' in body:
+                        body['desc'] = body['message']
+
+                    raise exceptions.from_response(resp, body)
+
+                return resp, body
+            except aiohttp.ClientSSLError as err:
+                self._logger.error(
+                    "SSL certificate verification failed: (%s). You must have "
+                    "a valid SSL certificate or disable SSL "
+                    "verification.", err)
+                raise exceptions.SSLCertFailed("SSL Certificate Verification "
+                                               "Failed.")
+            except self.retry_policy.catch_exceptions as ex:
+                if not self.retry_policy.matches(ex):
+                    raise
+
+                # Raise exception, we have exhausted all retries.
+                if not retry_state.retry(ex):
+                    raise
+            except asyncio.TimeoutError as err:
+                raise exceptions.Timeout("Timeout: %s" % err)
+            except aiohttp.TooManyRedirects as err:
+                raise exceptions.TooManyRedirects(
+                    "Too Many Redirects: %s" % err)
+            except aiohttp.InvalidURL as err:
+                raise exceptions.URLRequired("URL Required: %s" % err)
+            except aiohttp.ClientResponseError as err:
+                raise exceptions.HTTPError("HTTP Error: %s" % err)
+            except aiohttp.ClientError as err:
+                raise exceptions.RequestException(
+                    "Request Exception: %s" % err)
+
+    async def _reauth(self, failed_key):
+        # Only one coroutine logs in again, the others wait for it and then
+        # use the new session key.
+        if self._reauth_lock is None:
+            self._reauth_lock = asyncio.Lock()
+        async with self._reauth_lock:
+            if self.session_key == failed_key:
+                await self.authenticate(self.user, self.password,
+                                        self._auth_optional)
+
+    async def _cs_request(self, url, method, reauth=True, **kwargs):
+        # Perform the request once. If we get a 401 back then it
+        # might be because the auth token expired, so try to
+        # re-authenticate and try again. If it still fails, bail.
+        if url.startswith('/'):
+            url = self.api_url + url
+        session_key = kwargs.pop('session_key', self.session_key)
+        try:
+            return await self.request(url, method, session_key=session_key,
+                                      **kwargs)
+        except (exceptions.HTTPUnauthorized,
+                exceptions.HTTPForbidden) as ex:
+            if not reauth:
+                raise
+            try:
+                await self._reauth(session_key)
+                return await self.request(url, method, **kwargs)
+            except exceptions.HTTPUnauthorized:
+                raise ex
+
+    async def get(self, url, **kwargs):
+        """
+        Make an HTTP GET request to the server.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+
+        :returns: headers - dict of HTTP Response headers
+        :returns: body - the body of the response.  If the body was JSON, it
+                         will be an object
+        """
+        return await self._cs_request(url, 'GET', **kwargs)
+
+    async def post(self, url, **kwargs):
+        """
+        Make an HTTP POST request to the server.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+
+        :returns: headers - dict of HTTP Response headers
+        :returns: body - the body of the response.  If the body was JSON, it
+                         will be an object
+        """
+        return await self._cs_request(url, 'POST', **kwargs)
+
+    async def put(self, url, **kwargs):
+        """
+        Make an HTTP PUT request to the server.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+
+        :returns: headers - dict of HTTP Response headers
+        :returns: body - the body of the response.  If the body was JSON, it
+                         will be an object
+        """
+        return await self._cs_request(url, 'PUT', **kwargs)
+
+    async def delete(self, url, **kwargs):
+        """
+        Make an HTTP DELETE request to the server.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+
+        :returns: headers - dict of HTTP Response headers
+        :returns: body - the body of the response.  If the body was JSON, it
+                         will be an object
+        """
+        return await self._cs_request(url, 'DELETE', **kwargs)
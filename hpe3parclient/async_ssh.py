@@ -0,0 +1,271 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" HPE 3PAR asyncio SSH Client.
+
+.. module: async_ssh
+
+:Description: This is the asyncio version of the SSH Client.  It runs the
+ same CLI commands as :class:`~hpe3parclient.ssh.HPE3PARSSHClient`, with the
+ same injection check and output stripping, but all calls are coroutines,
+ so CLI commands on many arrays can run at once on a single event loop.
+
+ This module needs Python 3.5 or later and the asyncssh package.
+
+.. code-block:: python
+
+    async with AsyncHPE3PARSSHClient(ip, login, password) as ssh:
+        await ssh.open()
+        lines = await ssh.run(['showport'])
+
+"""
+
+import asyncio
+import logging
+import os
+from random import randint
+
+try:
+    import asyncssh
+except ImportError:
+    asyncssh = None
+
+from hpe3parclient import exceptions
+from hpe3parclient import ssh
+from hpe3parclient import tracing
+
+
+class AsyncHPE3PARSSHClient(object):
+    """The asyncio client to execute SSH commands on a 3PAR.
+
+    :param ip: The IP address of the array
+    :type ip: str
+    :param login: The user name
+    :type login: str
+    :param password: The password, or None to log in with the private key
+    :type password: str
+    :param port: The SSH port
+    :type port: int
+    :param conn_timeout: Seconds to wait for the connection
+    :type conn_timeout: float
+    :param privatekey: The path to the private key file
+    :type privatekey: str
+    :param trace_hooks: Called when every command run starts and ends
+    :type trace_hooks: list of :class:`~hpe3parclient.tracing.TraceHook`
+    :param known_hosts_file: The file of the known host keys. Default is
+                             ``~/.ssh/known_hosts``.
+    :type known_hosts_file: str
+    :param missing_key_policy: ``RejectPolicy`` only connects to the hosts
+                               of the known hosts file. Default, like
+                               ``AutoAddPolicy`` and ``WarningPolicy``,
+                               also accepts the key of a host missing from
+                               the file, without saving it. The key of a
+                               host in the file must always match.
+    :type missing_key_policy: str
+
+    """
+
+    _logger = logging.getLogger(__name__)
+
+    def __init__(self, ip, login, password, port=22, conn_timeout=None,
+                 privatekey=None, trace_hooks=None, known_hosts_file=None,
+                 missing_key_policy=None):
+        if asyncssh is None:
+            raise ImportError(
+                "The asyncssh package is required for the asyncio SSH "
+                "client")
+        if missing_key_policy not in (None, 'AutoAddPolicy', 'RejectPolicy',
+                                      'WarningPolicy'):
+            raise exceptions.SSHException(
+                "Invalid missing_key_policy: %s" % missing_key_policy)
+
+        self.san_ip = ip
+        self.san_ssh_port = port
+        self.ssh_conn_timeout = conn_timeout
+        self.san_login = login
+        self.san_password = password
+        self.san_privatekey = privatekey
+        if trace_hooks is None:
+            trace_hooks = []
+        self.trace_hooks = trace_hooks
+        self.known_hosts_file = known_hosts_file
+        self.missing_key_policy = missing_key_policy
+        self.conn = None
+        self._open_lock = None
+
+    # The checks and the output parsing do not depend on the transport.
+    check_ssh_injection = ssh.HPE3PARSSHClient.check_ssh_injection
+    strip_input_from_output = staticmethod(
+        ssh.HPE3PARSSHClient.strip_input_from_output)
+    sanitize_cert = staticmethod(ssh.HPE3PARSSHClient.sanitize_cert)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _connect_options(self):
+        options = {'port': self.san_ssh_port,
+                   'username': self.san_login}
+        if self.san_password:
+            options['password'] = self.san_password
+            options['client_keys'] = None
+        elif self.san_privatekey:
+            options['client_keys'] = [
+                os.path.expanduser(self.san_privatekey)]
+        else:
+            msg = "Specify a password or private_key"
+            raise exceptions.SSHException(msg)
+
+        options['known_hosts'] = self._known_hosts()
+        return options
+
+    def _known_hosts(self):
+        path = os.path.expanduser(self.known_hosts_file or
+                                  '~/.ssh/known_hosts')
+        exists = os.path.isfile(path)
+        if self.missing_key_policy == 'RejectPolicy':
+            # Without the file no host is known.
+            return path if exists else ()
+        if exists:
+            host_keys = asyncssh.match_known_hosts(
+                path, self.san_ip, '', self.san_ssh_port)[0]
+            if host_keys:
+                # A known host must still have the same key.
+                return path
+        if self.missing_key_policy == 'WarningPolicy':
+            self._logger.warning("Unknown ssh host key for %s",
+                                 self.san_ip)
+        return None
+
+    async def open(self):
+        """Opens a new SSH connection if there is none.
+
+        This can be called if an SSH connection is open already.
+
+        """
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+        async with self._open_lock:
+            if self.conn is not None:
+                return
+            options = self._connect_options()
+            try:
+                self.conn = await asyncio.wait_for(
+                    asyncssh.connect(self.san_ip, **options),
+                    self.ssh_conn_timeout)
+            except Exception as e:
+                msg = "Error connecting via ssh: %s" % e
+                self._logger.error(msg)
+                raise exceptions.SSHException(msg)
+
+    async def close(self):
+        if self.conn is not None:
+            conn, self.conn = self.conn, None
+            conn.close()
+            await conn.wait_closed()
+
+    async def run(self, cmd, multi_line_stripper=False):
+        """Runs a CLI command over SSH, without doing any result parsing.
+
+        See :meth:`~hpe3parclient.ssh.HPE3PARSSHClient.run`.
+
+        """
+        self._logger.debug("SSH CMD = %s " % cmd)
+
+        event = None
+        if self.trace_hooks:
+            # Only the command name, the arguments may be secrets.
+            event = tracing.start(self.trace_hooks, tracing.SSH, 'SSH',
+                                  cmd[0] if cmd else '')
+        try:
+            (stdout, stderr) = await self._run_ssh(cmd, False)
+        except Exception as ex:
+            if event is not None:
+                tracing.end(self.trace_hooks, event, error=ex)
+            raise
+        if event is not None:
+            event.bytes = len(stdout)
+            tracing.end(self.trace_hooks, event)
+        # we have to strip out the input and exit lines
+        tmp = stdout.decode().split("\r\n")
+
+        # default is old stripper -- to avoid breaking things, for now
+        if multi_line_stripper:
+            out = self.strip_input_from_output(cmd, tmp)
+            self._logger.debug("OUT = %s" % self.sanitize_cert(out))
+        else:
+            out = tmp[5:len(tmp) - 2]
+            self._logger.debug("OUT = %s" % out)
+        return out
+
+    async def _ssh_execute(self, cmd, check_exit_code=True):
+        """Runs the command in a CLI shell with CSV output.
+
+        See :meth:`~hpe3parclient.ssh.HPE3PARSSHClient._ssh_execute`.
+
+        """
+        cmd = ssh.HPE3PARSSHClient._tpd_command(cmd)
+        self._logger.debug('Running cmd (SSH): %s', cmd)
+
+        # Without a command and with a terminal, the array starts its CLI
+        # shell, like paramiko's invoke_shell.
+        result = await self.conn.run(
+            input='setclienv csvtable 1\n%s\nexit\n' % cmd,
+            term_type='vt100', encoding=None, check=False)
+        stdout = result.stdout or b''
+        stderr = result.stderr or b''
+
+        exit_status = result.exit_status
+        # exit_status is None or -1 if no exit code was returned
+        if exit_status is not None and exit_status != -1:
+            self._logger.debug('Result was %s' % exit_status)
+            if check_exit_code and exit_status != 0:
+                msg = "command %s failed" % cmd
+                self._logger.error(msg)
+                raise exceptions.ProcessExecutionError(exit_code=exit_status,
+                                                       stdout=stdout,
+                                                       stderr=stderr,
+                                                       cmd=cmd)
+        return (stdout, stderr)
+
+    async def _run_ssh(self, cmd_list, check_exit=True, attempts=2):
+        self.check_ssh_injection(cmd_list)
+        command = ' '.join(cmd_list)
+
+        try:
+            total_attempts = attempts
+            while attempts > 0:
+                attempts -= 1
+                try:
+                    await self.open()
+                    return await self._ssh_execute(
+                        command, check_exit_code=check_exit)
+                except Exception as e:
+                    self._logger.error(e)
+                    if not isinstance(e, exceptions.ProcessExecutionError):
+                        # Connect again for the next attempt.
+                        await self.close()
+                    if attempts > 0:
+                        await asyncio.sleep(randint(20, 500) / 100.0)
+
+            msg = ("SSH Command failed after '%(total_attempts)r' "
+                   "attempts : '%(command)s'" %
+                   {'total_attempts': total_attempts, 'command': command})
+            self._logger.error(msg)
+            raise exceptions.SSHException(message=msg)
+        except Exception:
+            self._logger.error("Error running ssh command: %s" % command)
+            raise
@@ -0,0 +1,238 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI circuit breakers
+
+.. module: breaker
+
+:Description: Stops sending requests to a WSAPI endpoint that keeps
+ failing, so callers fail at once instead of waiting for timeouts and
+ retries, and lets a few requests through now and then to find out when it
+ is back.
+
+"""
+
+import logging
+import threading
+
+from hpe3parclient import exceptions
+from hpe3parclient import timings
+
+LOG = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker(object):
+    """
+    The circuit breaker of one endpoint.
+
+    * ``closed`` - requests are sent. After ``failure_threshold`` failures
+      in a row the breaker opens.
+    * ``open`` - requests fail at once with
+      :class:`~hpe3parclient.exceptions.CircuitOpen`. After
+      ``recovery_timeout`` seconds the breaker is half open.
+    * ``half-open`` - up to ``half_open_max_calls`` requests are sent at a
+      time to probe the endpoint, the others fail at once. After
+      ``success_threshold`` successes the breaker closes, after a failure
+      it opens again.
+
+    A failure is a request that could not be sent or got no response, or
+    a 5xx response.
+
+    :param name: The endpoint, used in errors and logs
+    :type name: str
+    :param failure_threshold: Failures in a row that open the breaker
+    :type failure_threshold: int
+    :param recovery_timeout: Seconds the breaker stays open
+    :type recovery_timeout: float
+    :param half_open_max_calls: Probe requests allowed at the same time
+    :type half_open_max_calls: int
+    :param success_threshold: Probe successes that close the breaker
+    :type success_threshold: int
+    :param listener: Called with the name, the old and the new state on
+                     every state change
+    :type listener: callable
+
+    """
+
+    def __init__(self, name, failure_threshold=5, recovery_timeout=30,
+                 half_open_max_calls=1, success_threshold=1, listener=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.success_threshold = success_threshold
+        self.listener = listener
+        self._state = CLOSED
+        self.failures = 0
+        self.successes = 0
+        self.probes = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state):
+        # Called with the lock held.
+        old, self._state = self._state, state
+        self.failures = 0
+        self.successes = 0
+        self.probes = 0
+        if state == OPEN:
+            self.opened_at = timings.monotonic()
+            self.times_opened += 1
+            LOG.warning("Circuit breaker of %s is open, requests fail for "
+                        "%s seconds", self.name, self.recovery_timeout)
+        else:
+            LOG.info("Circuit breaker of %s is %s", self.name, state)
+        return old
+
+    def _notify(self, old, new):
+        if self.listener is not None and old not in (None, new):
+            self.listener(self.name, old, new)
+
+    def _refresh(self):
+        # Called with the lock held. An open breaker becomes half open
+        # once the recovery timeout is over.
+        if (self._state == OPEN and
+                timings.monotonic() - self.opened_at >=
+                self.recovery_timeout):
+            return self._set_state(HALF_OPEN), HALF_OPEN
+        return None, None
+
+    @property
+    def state(self):
+        """``closed``, ``open`` or ``half-open``."""
+        with self._lock:
+            old, new = self._refresh()
+            state = self._state
+        self._notify(old, new)
+        return state
+
+    def before_call(self):
+        """Let a request through or refuse it.
+
+        Every request let through must be followed by
+        :meth:`record_success` or :meth:`record_failure`.
+
+        :raises: :class:`~hpe3parclient.exceptions.CircuitOpen` when the
+                 request must not be sent
+        """
+        with self._lock:
+            old, new = self._refresh()
+            refused = None
+            if self._state == OPEN:
+                refused = self.recovery_timeout - (timings.monotonic() -
+                                                   self.opened_at)
+            elif self._state == HALF_OPEN:
+                if self.probes >= self.half_open_max_calls:
+                    refused = 0
+                else:
+                    self.probes += 1
+            if refused is not None:
+                self.rejected += 1
+        self._notify(old, new)
+        if refused is not None:
+            raise exceptions.CircuitOpen(
+                "The circuit breaker of %s is open, retry in %.1f seconds" %
+                (self.name, max(0, refused)))
+
+    def record_success(self):
+        """Report a request that succeeded."""
+        old = None
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self.probes -= 1
+                self.successes += 1
+                if self.successes >= self.success_threshold:
+                    old = self._set_state(CLOSED)
+            else:
+                self.failures = 0
+        self._notify(old, CLOSED)
+
+    def record_failure(self):
+        """Report a request that failed."""
+        old = None
+        with self._lock:
+            if self._state == HALF_OPEN:
+                old = self._set_state(OPEN)
+            elif self._state == CLOSED:
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    old = self._set_state(OPEN)
+        self._notify(old, OPEN)
+
+    def stats(self):
+        """Get the state of the breaker.
+
+        :returns: dict with the state, the failures in a row, the number of
+                  times the breaker opened and the requests it refused
+        """
+        state = self.state
+        with self._lock:
+            return {'state': state,
+                    'failures': self.failures,
+                    'times_opened': self.times_opened,
+                    'rejected': self.rejected}
+
+
+class CircuitBreakerRegistry(object):
+    """
+    Creates and keeps one :class:`CircuitBreaker` per endpoint.
+
+    The arguments are those of :class:`CircuitBreaker`, used for every
+    breaker created.
+
+    .. code-block:: python
+
+        breakers = breaker.CircuitBreakerRegistry(failure_threshold=3,
+                                                  recovery_timeout=10)
+        cl = client.HPE3ParClient(api_url, circuit_breaker=breakers)
+
+    """
+
+    def __init__(self, **settings):
+        self.settings = settings
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        """Get the breaker of an endpoint.
+
+        :param name: The endpoint, ie. '10.0.0.1:8080'
+        :type name: str
+
+        :returns: :class:`CircuitBreaker`
+        """
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.get(name)
+                if breaker is None:
+                    breaker = self.breakers[name] = CircuitBreaker(
+                        name, **self.settings)
+        return breaker
+
+    def stats(self):
+        """Get the state of every breaker.
+
+        :returns: dict of :meth:`CircuitBreaker.stats` by endpoint
+        """
+        with self._lock:
+            breakers = list(self.breakers.values())
+        return dict((breaker.name, breaker.stats()) for breaker in breakers)
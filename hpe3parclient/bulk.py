@@ -0,0 +1,239 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR bulk operations
+
+.. module: bulk
+
+:Description: Runs many client calls at once on a bounded number of
+ threads, keeping the calls that depend on each other in order.
+
+.. code-block:: python
+
+    create = bulk.Operation('createVolume', ('vol1', 'OpenStackCPG', 1024))
+    export = bulk.Operation('createVLUN', ('vol1',),
+                            {'hostname': 'compute1', 'auto': True},
+                            depends_on=[create])
+    results = cl.bulk([create, export], concurrency=8, rate_limit=20)
+    for result in results:
+        if not result.ok:
+            print(result.error)
+
+"""
+
+import collections
+import threading
+
+from hpe3parclient import exceptions
+from hpe3parclient import ratelimit
+
+
+class Operation(object):
+    """
+    One client call of a bulk run.
+
+    :param method: The name of the client method, or any callable
+    :type method: str or callable
+    :param args: The positional arguments of the call
+    :type args: tuple
+    :param kwargs: The keyword arguments of the call
+    :type kwargs: dict
+    :param depends_on: The operations that must succeed before this one
+                       starts, as :class:`Operation` objects or indexes in
+                       the list of operations. They must come before this
+                       one in the list.
+    :type depends_on: list
+
+    """
+
+    def __init__(self, method, args=(), kwargs=None, depends_on=()):
+        self.method = method
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.depends_on = list(depends_on)
+
+    def __repr__(self):
+        name = getattr(self.method, '__name__', self.method)
+        return "Operation(%s%r)" % (name, self.args)
+
+
+class OperationResult(object):
+    """
+    The outcome of an :class:`Operation`.
+
+    :ivar operation: The operation
+    :ivar value: What the call returned, None if it failed
+    :ivar error: The exception the call raised, None if it succeeded. It
+                 is :class:`~hpe3parclient.exceptions.DependencyFailed`
+                 when the operation did not run because one it depends on
+                 failed.
+
+    """
+
+    def __init__(self, operation, value=None, error=None):
+        self.operation = operation
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self):
+        """True if the call succeeded."""
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return "OperationResult(%r, value=%r)" % (self.operation,
+                                                      self.value)
+        return "OperationResult(%r, error=%r)" % (self.operation, self.error)
+
+
+class BulkExecutor(object):
+    """
+    Runs operations on a pool of threads.
+
+    At most ``concurrency`` operations run at the same time. An operation
+    starts once all the operations it depends on succeeded; if one of them
+    failed it does not run at all. A failed operation does not stop the
+    others.
+
+    :param client: The client whose methods are called
+    :type client: :class:`~hpe3parclient.client.HPE3ParClient`
+    :param concurrency: The most operations running at the same time
+    :type concurrency: int
+    :param rate_limit: Operations started per second, or a shared
+                       :class:`~hpe3parclient.ratelimit.TokenBucket` to
+                       limit several runs against the same array together.
+                       Default does not limit the rate.
+    :type rate_limit: float or
+        :class:`~hpe3parclient.ratelimit.TokenBucket`
+
+    """
+
+    def __init__(self, client, concurrency=8, rate_limit=None):
+        if concurrency < 1:
+            raise ValueError("The concurrency must be at least 1")
+        if (rate_limit is not None and
+                not isinstance(rate_limit, ratelimit.TokenBucket)):
+            rate_limit = ratelimit.TokenBucket(rate_limit)
+        self.client = client
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+
+    @staticmethod
+    def _dependencies(operations):
+        indexes = dict((id(operation), i)
+                       for i, operation in enumerate(operations))
+        dependencies = []
+        for i, operation in enumerate(operations):
+            needed = set()
+            for dependency in operation.depends_on:
+                if isinstance(dependency, Operation):
+                    j = indexes.get(id(dependency))
+                    if j is None:
+                        raise ValueError("%r depends on %r, which is not "
+                                         "in the bulk run" %
+                                         (operation, dependency))
+                else:
+                    j = dependency
+                if not 0 <= j < i:
+                    raise ValueError("%r must come after the operations it "
+                                     "depends on" % operation)
+                needed.add(j)
+            dependencies.append(needed)
+        return dependencies
+
+    def _call(self, operation):
+        if self.rate_limit is not None:
+            self.rate_limit.acquire()
+        method = operation.method
+        try:
+            if not callable(method):
+                method = getattr(self.client, method)
+            value = method(*operation.args, **operation.kwargs)
+        except Exception as ex:
+            return OperationResult(operation, error=ex)
+        return OperationResult(operation, value=value)
+
+    def run(self, operations):
+        """Run operations and wait for all of them.
+
+        :param operations: The operations
+        :type operations: list of :class:`Operation`
+
+        :returns: list of :class:`OperationResult`, in the order of the
+                  operations
+        :raises: ValueError if an operation depends on one that is not
+                 before it in the list
+        """
+        operations = list(operations)
+        dependencies = self._dependencies(operations)
+        results = [None] * len(operations)
+        waiting = [len(needed) for needed in dependencies]
+        dependents = [[] for operation in operations]
+        for i, needed in enumerate(dependencies):
+            for j in needed:
+                dependents[j].append(i)
+
+        ready = collections.deque(i for i, count in enumerate(waiting)
+                                  if not count)
+        condition = threading.Condition()
+        pending = [len(operations)]
+
+        def finish(i, result):
+            # Called with the condition held.
+            done = [(i, result)]
+            while done:
+                i, result = done.pop()
+                results[i] = result
+                pending[0] -= 1
+                for j in dependents[i]:
+                    if results[j] is not None:
+                        continue
+                    if not result.ok:
+                        error = exceptions.DependencyFailed(
+                            "%r failed: %s" % (result.operation,
+                                               result.error))
+                        done.append((j, OperationResult(operations[j],
+                                                        error=error)))
+                        # Keep it from running once its other dependencies
+                        # are done.
+                        results[j] = done[-1][1]
+                        continue
+                    waiting[j] -= 1
+                    if not waiting[j]:
+                        ready.append(j)
+            condition.notify_all()
+
+        def worker():
+            while True:
+                with condition:
+                    while not ready and pending[0]:
+                        condition.wait()
+                    if not ready:
+                        return
+                    i = ready.popleft()
+                result = self._call(operations[i])
+                with condition:
+                    finish(i, result)
+
+        threads = [threading.Thread(target=worker,
+                                    name='hpe3parclient-bulk-%d' % n)
+                   for n in range(min(self.concurrency, len(operations)))]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
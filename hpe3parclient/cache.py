@@ -0,0 +1,149 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI response cache
+
+.. module: cache
+
+:Description: A size bounded LRU cache with a time to live per resource,
+ used by :class:`~hpe3parclient.client.HPE3ParClient` for WSAPI data that
+ rarely changes.
+
+"""
+
+import collections
+import copy
+import threading
+
+from hpe3parclient import timings
+
+
+class ResponseCache(object):
+    """
+    Caches WSAPI responses for a limited time.
+
+    Entries are keyed by a resource name and the arguments of the call, ie.
+    ``('cpg', 'OpenStackCPG')``. Every resource has its own time to live in
+    seconds, a resource without one is never cached. Once ``maxsize``
+    entries are stored the least recently used one is evicted.
+
+    Values are copied when they are stored and when they are returned, so
+    callers can change what they get back without changing the cache.
+
+    :param maxsize: The maximum number of entries
+    :type maxsize: int
+    :param ttls: Time to live per resource, merged with :attr:`DEFAULT_TTLS`
+    :type ttls: dict
+
+    """
+
+    DEFAULT_TTLS = {
+        'system': 300,
+        'wsapi_version': 3600,
+        'wsapi_configuration': 300,
+        'ports': 60,
+        'cpgs': 30,
+        'cpg': 30,
+    }
+
+    def __init__(self, maxsize=256, ttls=None):
+        self.maxsize = maxsize
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, resource, *args):
+        """Get a cached value.
+
+        :param resource: The resource name
+        :type resource: str
+
+        :returns: A copy of the value, or None when it is not cached
+        """
+        key = (resource,) + args
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= timings.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Move the entry to the most recently used end.
+            del self._entries[key]
+            self._entries[key] = entry
+            value = entry[1]
+        return copy.deepcopy(value)
+
+    def put(self, resource, value, *args):
+        """Store a value.
+
+        :param resource: The resource name
+        :type resource: str
+        :param value: The value to cache
+
+        :returns: The value that was passed in
+        """
+        ttl = self.ttls.get(resource)
+        if not ttl or value is None:
+            return value
+        entry = (timings.monotonic() + ttl, copy.deepcopy(value))
+        key = (resource,) + args
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, resource, *args):
+        """Evict entries of a resource.
+
+        :param resource: The resource name
+        :type resource: str
+        :param args: The arguments of the entry to evict. When there are
+                     none every entry of the resource is evicted.
+
+        """
+        key = (resource,) + args
+        with self._lock:
+            if args:
+                self._entries.pop(key, None)
+            else:
+                for cached in [k for k in self._entries if k[0] == resource]:
+                    del self._entries[cached]
+
+    def clear(self):
+        """Evict all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Get the cache counters.
+
+        :returns: dict with hits, misses, evictions and size
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'size': len(self._entries)}
@@ -27,10 +27,13 @@ This client requires and works with 3PAR InForm 3.1.3 MU1 firmware
 
 """
 import copy
+import functools
 import re
+import threading
 import time
 import uuid
 import logging
+import weakref
 
 try:
     # For Python 3.0 and later
@@ -39,8 +42,8 @@ except ImportError:
     # Fall back to Python 2's urllib2
     from urllib2 import quote
 
-from hpe3parclient import exceptions, http, ssh
-from hpe3parclient import showport_parser
+from hpe3parclient import bulk, cache, exceptions, http, ssh
+from hpe3parclient import ratelimit, showport_parser
 
 logger = logging.getLogger(__name__)
 
@@ -48,9 +51,92 @@ logger = logging.getLogger(__name__)
 class HPE3ParClient(object):
     """ The 3PAR REST API Client.
 
+    One client can be shared by many threads. The WSAPI calls run in
+    parallel over the pooled connections: no call changes the url or the
+    session other calls are using, and an expired session is renewed once
+    for all the threads. With ``coalesce_gets``, identical GETs in flight
+    are sent once. Setting the client up, ie. :meth:`setSSHOptions` or
+    :meth:`debug_rest`, is not meant to run along with calls. The SSH calls
+    share one connection, unless :meth:`setSSHOptions` is given a
+    ``pool_size``: then they run in parallel over pooled connections.
+
     :param api_url: The url to the WSAPI service on 3PAR
-                    ie. http://<3par server>:8080/api/v1
-    :type api_url: str
+                    ie. http://<3par server>:8080/api/v1, or a list of the
+                    urls of several controllers of the array. The requests
+                    are spread over them, and moved off one that fails.
+    :type api_url: str or list
+    :param pool_connections: The number of per-host connection pools to keep
+    :type pool_connections: int
+    :param pool_maxsize: The maximum number of connections kept open to the
+                         WSAPI server
+    :type pool_maxsize: int
+    :param pool_block: Wait for a free pooled connection instead of opening
+                       an extra one when all of them are busy
+    :type pool_block: bool
+    :param pool_idle_timeout: Seconds an unused pooled connection is kept
+                              before it gets reopened
+    :type pool_idle_timeout: float
+    :param retry_policy: Decides which failed WSAPI requests are retried
+    :type retry_policy: :class:`~hpe3parclient.retry.RetryPolicy`
+    :param json_codec: The codec used for WSAPI request and response bodies,
+                       by name or instance. Default is the fastest installed.
+    :type json_codec: str or :class:`~hpe3parclient.codec.JSONCodec`
+    :param response_cache: Cache the data that rarely changes, like the
+                           system info, ports and CPGs. Pass True for the
+                           default time to live of every resource, or a
+                           :class:`~hpe3parclient.cache.ResponseCache`.
+                           Default does not cache.
+    :type response_cache: bool or :class:`~hpe3parclient.cache.ResponseCache`
+    :param session_idle_timeout: Seconds after which the array expires an
+                                 unused WSAPI session. When set, the client
+                                 logs in again shortly before that happens.
+    :type session_idle_timeout: float
+    :param session_broker: Shares WSAPI sessions with the other processes
+                           of the host.
+    :type session_broker:
+        :class:`~hpe3parclient.session_broker.FileSessionBroker`
+    :param rate_limit: WSAPI requests sent per second, or a
+                       :class:`~hpe3parclient.ratelimit.TokenBucket` shared
+                       by every client of the array.
+    :type rate_limit: float or :class:`~hpe3parclient.ratelimit.TokenBucket`
+    :param concurrency_limiter: Limits the WSAPI requests in flight with a
+                                window that adapts to the load of the
+                                array. True uses the default limiter.
+    :type concurrency_limiter: bool or
+        :class:`~hpe3parclient.ratelimit.AdaptiveConcurrencyLimiter`
+    :param priority_lanes: Schedules the WSAPI requests in flight by
+                           priority lane, keeping slots for interactive
+                           calls. True uses the default limiter.
+    :type priority_lanes: bool or
+        :class:`~hpe3parclient.ratelimit.PriorityLimiter`
+    :param method_lanes: The priority lane of client methods, by method
+                         name, merged with :attr:`DEFAULT_METHOD_LANES`.
+                         Only used with ``priority_lanes``.
+    :type method_lanes: dict
+    :param circuit_breaker: Fails the requests to a WSAPI endpoint at once
+                            with :class:`~hpe3parclient.exceptions.CircuitOpen`
+                            while it keeps failing. True uses the default
+                            settings.
+    :type circuit_breaker: bool or
+        :class:`~hpe3parclient.breaker.CircuitBreakerRegistry`
+    :param hedge_gets: Sends a second copy of a slow GET and uses the first
+                       response. True uses the default policy.
+    :type hedge_gets: bool or :class:`~hpe3parclient.hedge.HedgePolicy`
+    :param adaptive_timeouts: Gives every kind of WSAPI request a timeout
+                              derived from its observed latency, no longer
+                              than ``timeout``. True uses the default
+                              settings.
+    :type adaptive_timeouts: bool or
+        :class:`~hpe3parclient.timeouts.AdaptiveTimeouts`
+    :param trace_hooks: Called when every WSAPI request and SSH command
+                        starts and ends. The list is kept as
+                        :attr:`trace_hooks`, hooks can be added to it later.
+    :type trace_hooks: list of :class:`~hpe3parclient.tracing.TraceHook`
+    :param coalesce_gets: While a GET is in flight, identical GETs from
+                          other threads wait for it and get a copy of its
+                          response. Off by default, as a GET sent right
+                          after a change may get a response sent before it.
+    :type coalesce_gets: bool
 
     """
 
@@ -146,6 +232,9 @@ class HPE3ParClient(object):
 
     WSAPI_MIN_VERSION_COMPRESSION_SUPPORT = '1.6.0'
 
+    #: The WSAPI version of every array, by host url, shared by all clients
+    WSAPI_VERSIONS = cache.ResponseCache()
+
     VLUN_TYPE_EMPTY = 1
     VLUN_TYPE_PORT = 2
     VLUN_TYPE_HOST = 3
@@ -205,20 +294,133 @@ class HPE3ParClient(object):
     DEFAULT_NVME_PORT = 4420
     DEFAULT_PORT_NQN = 'nqn.2014-08.org.nvmexpress.discovery'
 
+    #: Attach and detach calls go first, polling goes last
+    DEFAULT_METHOD_LANES = {
+        'createVLUN': ratelimit.INTERACTIVE,
+        'deleteVLUN': ratelimit.INTERACTIVE,
+        'getHostVLUNs': ratelimit.INTERACTIVE,
+        'getCPGStatData': ratelimit.BACKGROUND,
+        'getOverallSystemCapacity': ratelimit.BACKGROUND,
+        'getRemoteCopyGroup': ratelimit.BACKGROUND,
+    }
+
     def __init__(self, api_url, debug=False, secure=False, timeout=None,
-                 suppress_ssl_warnings=False):
-        self.api_url = api_url
+                 suppress_ssl_warnings=False, pool_connections=10,
+                 pool_maxsize=10, pool_block=False, pool_idle_timeout=None,
+                 retry_policy=None, json_codec=None, response_cache=None,
+                 session_idle_timeout=None, session_broker=None,
+                 rate_limit=None, concurrency_limiter=None,
+                 priority_lanes=None, method_lanes=None,
+                 circuit_breaker=None, hedge_gets=None,
+                 adaptive_timeouts=None, trace_hooks=None,
+                 coalesce_gets=False):
+        if isinstance(api_url, (list, tuple)):
+            self.api_url = api_url[0]
+        else:
+            self.api_url = api_url
         self.http = http.HTTPJSONRESTClient(
-            self.api_url, secure=secure,
-            timeout=timeout, suppress_ssl_warnings=suppress_ssl_warnings)
+            api_url, secure=secure,
+            timeout=timeout, suppress_ssl_warnings=suppress_ssl_warnings,
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block, pool_idle_timeout=pool_idle_timeout,
+            retry_policy=retry_policy, json_codec=json_codec,
+            session_idle_timeout=session_idle_timeout,
+            session_broker=session_broker, rate_limit=rate_limit,
+            concurrency_limiter=concurrency_limiter,
+            priority_lanes=priority_lanes, circuit_breaker=circuit_breaker,
+            hedge_gets=hedge_gets, adaptive_timeouts=adaptive_timeouts,
+            trace_hooks=trace_hooks, coalesce_gets=coalesce_gets)
+        self.trace_hooks = self.http.trace_hooks
         api_version = None
         self.ssh = None
         self.vlun_query_supported = True
         self.primera_supported = False
         self.compression_supported = True
+        self.api_version = None
+        self.system_info = None
+
+        if response_cache is True:
+            response_cache = cache.ResponseCache()
+        self.cache = response_cache or None
+
+        self.method_lanes = {}
+        lanes = dict(self.DEFAULT_METHOD_LANES)
+        lanes.update(method_lanes or {})
+        for method_name, lane in lanes.items():
+            self.setMethodLane(method_name, lane)
 
         self.debug_rest(debug)
 
+    def setMethodLane(self, method_name, lane):
+        """Send the WSAPI requests of a client method in a priority lane.
+
+        The lane of a call made inside :meth:`priorityLane`, or by another
+        method that has a lane, is kept. Lanes only matter with
+        ``priority_lanes``, without it the methods are left as they are.
+
+        :param method_name: The name of the client method, ie. 'getVolume'
+        :type method_name: str
+        :param lane: ``interactive``, ``normal`` or ``background``, or None
+                     to stop choosing a lane for the method
+        :type lane: str
+
+        :raises: ValueError if there is no such lane, AttributeError if
+                 there is no such method
+        """
+        method = getattr(type(self), method_name)
+        if lane is None:
+            self.__dict__.pop(method_name, None)
+            self.method_lanes.pop(method_name, None)
+            return
+        ratelimit.check_lane(lane)
+        self.method_lanes[method_name] = lane
+        if self.http.priority_limiter is None:
+            return
+
+        # The method is looked up at call time, so patching the class or
+        # overriding the method in a subclass still works. A weak reference
+        # keeps the client from referencing itself.
+        client_ref = weakref.ref(self)
+
+        @functools.wraps(method)
+        def in_lane(*args, **kwargs):
+            client = client_ref()
+            call = getattr(type(client), method_name)
+            with client.http.lane(lane, override=False):
+                return call(client, *args, **kwargs)
+        setattr(self, method_name, in_lane)
+
+    def priorityLane(self, lane):
+        """Send the calls made in a with block in a priority lane.
+
+        .. code-block:: python
+
+            with cl.priorityLane('interactive'):
+                cl.getVolume(volume_name)
+
+        :param lane: ``interactive``, ``normal`` or ``background``
+        :type lane: str
+
+        :returns: A context manager
+        :raises: ValueError if there is no such lane
+        """
+        return self.http.lane(lane)
+
+    def callTimeout(self, timeout):
+        """Use one timeout for the calls made in a with block.
+
+        .. code-block:: python
+
+            with cl.callTimeout(3600):
+                cl.copyVolume(src_name, dest_name, cpg)
+
+        :param timeout: The timeout of every WSAPI request, in seconds
+        :type timeout: float
+
+        :returns: A context manager
+        """
+        return self.http.call_timeout(timeout)
+
     def is_primera_array(self):
         return self.primera_supported
 
@@ -228,13 +430,17 @@ class HPE3ParClient(object):
         """Set SSH Options for ssh calls.
 
         This is used to set the SSH credentials for calls
-        that use SSH instead of REST HTTP.
+        that use SSH instead of REST HTTP. The keyword arguments are
+        passed on to :class:`~hpe3parclient.ssh.HPE3PARSSHClient`, ie.
+        ``pool_size=4`` to run up to 4 CLI commands at once.
 
         """
         try:
             self.ssh = ssh.HPE3PARSSHClient(ip, login, password, port,
                                             conn_timeout, privatekey,
                                             **kwargs)
+            # The SSH commands are traced by the same hooks.
+            self.ssh.trace_hooks = self.trace_hooks
         except Exception as ex:
             # The exception details are already logged in ssh.py
             pass
@@ -247,28 +453,115 @@ class HPE3ParClient(object):
             self.ssh.open()
             return self.ssh.run(cmd)
 
+    def _run_stream(self, cmd):
+        if self.ssh is None:
+            raise exceptions.SSHException('SSH is not initialized. Initialize'
+                                          ' it by calling "setSSHOptions".')
+        self.ssh.open()
+        return self.ssh.run_stream(cmd)
+
     def getWsApiVersion(self):
         """Get the 3PAR WS API version.
 
+        The version is cached per array in :attr:`WSAPI_VERSIONS`, and
+        shared by all the clients of the array.
+
         :returns: Version dict
 
         """
-        try:
-            # remove everything down to host:port
-            host_url = self.api_url.split('/api')
-            self.http.set_url(host_url[0])
-            # get the api version
-            response, body = self.http.get('/api')
+        body = self._cache_get('wsapi_version')
+        if body is None:
+            host_url = self._get_host_url()
+            body = self.WSAPI_VERSIONS.get('wsapi_version', host_url)
+            if body is None:
+                # The version lives at host:port/api, outside of the
+                # api_url, and is fetched from its absolute url.
+                response, body = self.http.get(host_url + '/api')
+                self.WSAPI_VERSIONS.put('wsapi_version', body, host_url)
+            self._cache_put('wsapi_version', body)
 
-            api_version = body
-            if (api_version['build'] >=
-                    self.HPE3PAR_WS_PRIMERA_MIN_BUILD_VERSION):
-                self.primera_supported = True
+        if body['build'] >= self.HPE3PAR_WS_PRIMERA_MIN_BUILD_VERSION:
+            self.primera_supported = True
+        return body
 
-            return body
-        finally:
-            # reset the url
-            self.http.set_url(self.api_url)
+    def _get_host_url(self):
+        # remove everything down to host:port
+        return self.api_url.split('/api')[0]
+
+    def _cache_get(self, resource, *args):
+        if self.cache is None:
+            return None
+        return self.cache.get(resource, *args)
+
+    def _cache_put(self, resource, value, *args):
+        if self.cache is None:
+            return value
+        return self.cache.put(resource, value, *args)
+
+    def _cache_invalidate(self, resource, *args):
+        if self.cache is not None:
+            self.cache.invalidate(resource, *args)
+
+    def _invalidate_cpg_usage(self):
+        # Allocating or freeing volume space changes the usage of the CPGs.
+        self._cache_invalidate('cpgs')
+        self._cache_invalidate('cpg')
+
+    def getCacheStats(self):
+        """Get the hit and miss counters of the response cache.
+
+        :returns: dict with hits, misses, evictions and size, or None when
+                  the client was created without a response cache
+
+        """
+        if self.cache is None:
+            return None
+        return self.cache.stats()
+
+    def clearCache(self):
+        """Drop everything from the response cache."""
+        if self.cache is not None:
+            self.cache.clear()
+
+    def bulk(self, operations, concurrency=8, rate_limit=None):
+        """Run many client calls at once.
+
+        The operations run on up to ``concurrency`` threads. An operation
+        that depends on others starts once they all succeeded, and does not
+        run if one of them failed.
+
+        .. code-block:: python
+
+            create = bulk.Operation('createVolume',
+                                    ('vol1', 'OpenStackCPG', 1024))
+            export = bulk.Operation('createVLUN', ('vol1',),
+                                    {'hostname': 'compute1', 'auto': True},
+                                    depends_on=[create])
+            tag = bulk.Operation('setVolumeMetaData',
+                                 ('vol1', 'owner', 'cinder'),
+                                 depends_on=[create])
+            results = cl.bulk([create, export, tag])
+
+        :param operations: The calls to make
+        :type operations: list of :class:`~hpe3parclient.bulk.Operation`
+        :param concurrency: The most calls running at the same time
+        :type concurrency: int
+        :param rate_limit: Calls started per second, or a
+                           :class:`~hpe3parclient.ratelimit.TokenBucket`
+                           shared by all bulk runs against this array.
+                           Default does not limit the rate.
+        :type rate_limit: float or
+            :class:`~hpe3parclient.ratelimit.TokenBucket`
+
+        :returns: list of :class:`~hpe3parclient.bulk.OperationResult`, in
+                  the order of the operations, holding the value returned
+                  or the exception raised by each call
+        :raises: ValueError if an operation depends on one that is not
+                 before it in the list
+
+        """
+        executor = bulk.BulkExecutor(self, concurrency, rate_limit)
+        return executor.run(operations)
 
     def debug_rest(self, flag):
         """This is useful for debugging requests to 3PAR.
@@ -295,6 +588,92 @@ class HPE3ParClient(object):
         """
         self.http.authenticate(username, password, optional)
 
+    def connect(self, username, password, optional=None, connections=2,
+                system_info=True):
+        """Log in and get ready for the first calls.
+
+        The login, the WSAPI version probe and the extra connections run at
+        the same time rather than one after the other, each on a pooled
+        connection that stays open for the calls that follow. The version
+        sets :attr:`primera_supported`, :attr:`vlun_query_supported` and
+        :attr:`compression_supported`, and is kept in :attr:`api_version`.
+        The storage system info is fetched as soon as the login is done and
+        kept in :attr:`system_info`.
+
+        .. code-block:: python
+
+            cl = client.HPE3ParClient(api_url, pool_maxsize=4)
+            cl.connect(username, password, connections=4)
+
+        :param username: The username
+        :type username: str
+        :param password: The Password
+        :type password: str
+        :param connections: The pooled connections to open, the login and
+                            the version probe included. More than
+                            ``pool_maxsize`` are not kept.
+        :type connections: int
+        :param system_info: Fetch the storage system info
+        :type system_info: bool
+
+        :returns: dict with the 'api_version' and the 'system' info
+        :raises: The error of the login, else of the version probe
+        """
+        results = {}
+        errors = {}
+
+        def login():
+            self.login(username, password, optional)
+            if system_info:
+                results['system'] = self.getStorageSystemInfo()
+
+        def run(name, task):
+            try:
+                result = task()
+                if name == 'api_version':
+                    results[name] = result
+            except Exception as ex:
+                errors.setdefault(name, ex)
+
+        tasks = [('login', login), ('api_version', self._probe_wsapi_version)]
+        tasks += [('warm_up', self._probe_wsapi_version)] * max(
+            0, connections - len(tasks))
+        threads = [threading.Thread(target=run, args=task) for task in tasks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # A warm up connection that failed does not matter.
+        for name in ('login', 'api_version'):
+            if name in errors:
+                raise errors[name]
+
+        self.api_version = self._cache_put('wsapi_version',
+                                           results['api_version'])
+        self.WSAPI_VERSIONS.put('wsapi_version', self.api_version,
+                                self._get_host_url())
+        self._detect_capabilities(self.api_version)
+        self.system_info = results.get('system')
+        return {'api_version': self.api_version, 'system': self.system_info}
+
+    def _probe_wsapi_version(self):
+        # Sent without coalescing, so that every probe opens a connection.
+        response, body = self.http.request(self._get_host_url() + '/api',
+                                           'GET')
+        return body
+
+    def _detect_capabilities(self, api_version):
+        build = api_version['build']
+        self.primera_supported = (
+            build >= self.HPE3PAR_WS_PRIMERA_MIN_BUILD_VERSION)
+        self.vlun_query_supported = (
+            build >= self.HPE3PAR_WS_MIN_BUILD_VERSION_VLUN_QUERY)
+        version = tuple(api_version.get(part, 0)
+                        for part in ('major', 'minor', 'revision'))
+        minimum = tuple(int(part) for part in
+                        self.WSAPI_MIN_VERSION_COMPRESSION_SUPPORT.split('.'))
+        self.compression_supported = version >= minimum
+
     def logout(self):
         """This destroys the session and logs out from the 3PAR server.
            The SSH connection to the 3PAR server is also closed.
@@ -312,7 +691,10 @@ class HPE3ParClient(object):
         :returns: Dictionary of Storage System Info
 
         """
-        response, body = self.http.get('/system')
+        body = self._cache_get('system')
+        if body is None:
+            response, body = self.http.get('/system')
+            self._cache_put('system', body)
         return body
 
     def getWSAPIConfigurationInfo(self):
@@ -321,7 +703,10 @@ class HPE3ParClient(object):
         :returns: Dictionary of WSAPI configurations
 
         """
-        response, body = self.http.get('/wsapiconfiguration')
+        body = self._cache_get('wsapi_configuration')
+        if body is None:
+            response, body = self.http.get('/wsapiconfiguration')
+            self._cache_put('wsapi_configuration', body)
         return body
 
     def getOverallSystemCapacity(self):
@@ -423,6 +808,26 @@ class HPE3ParClient(object):
         response, body = self.http.get('/volumes')
         return body
 
+    def iterVolumes(self, fields=None):
+        """Iterate over the Volumes
+
+        Unlike :meth:`getVolumes` the response is parsed while it is
+        received and the volumes are yielded one at a time, so memory use
+        does not grow with the number of volumes on the array.
+
+        .. code-block:: python
+
+            for volume in cl.iterVolumes(fields=['name', 'sizeMiB']):
+                print(volume['name'])
+
+        :param fields: The keys to keep in every volume, or None for all
+        :type fields: list of str
+
+        :returns: generator of Volumes
+
+        """
+        return self.http.iter_members('/volumes', fields=fields)
+
     def getVolume(self, name):
         """Get information about a volume.
 
@@ -506,65 +911,98 @@ class HPE3ParClient(object):
             optional = {'tpvv': True}
         if optional:
             if self.primera_supported:
-                for key in ['tpvv', 'compression', 'tdvv']:
-                    option = optional.get(key)
-                    if option and option not in [True, False]:
-                        # raising exception for junk compression input
-                        ex_desc = "39 - invalid input: wrong type for key "\
-                            "[%s]. Valid values are [True, False]" % key
-                        raise exceptions.HTTPBadRequest(ex_desc)
-
-                if optional.get('compression') is True:
-                    combination = ['tdvv', 'compression']
-                    len_diff = len(set(combination) - set(optional.keys()))
-                    msg = "invalid input: For compressed and deduplicated "\
-                          "volumes both 'compression' and " \
-                          "'tdvv' must be specified as true"
-                    if len_diff == 1:
-                        raise exceptions.HTTPBadRequest(msg)
-                    if optional.get('tdvv') is True \
-                            and optional.get('compression') is True:
-                        optional['reduce'] = True
-
-                    if optional.get('tdvv') is False \
-                            and optional.get('compression') is True:
-                        raise exceptions.HTTPBadRequest(msg)
-                else:
-                    msg = "invalid input: For compressed and deduplicated "\
-                          "volumes both 'compression' and "\
-                          "'tdvv' must be specified as true"
-                    if optional.get('tdvv') is False \
-                            and optional.get('compression') is False:
-                        optional['reduce'] = False
-                    if optional.get('tdvv') is True \
-                            and optional.get('compression') is False:
-                        raise exceptions.HTTPBadRequest(msg)
-
-                if 'compression' in optional:
-                    optional.pop('compression')
-                if 'tdvv' in optional:
-                    optional.pop('tdvv')
+                optional = self._convert_primera_volume_options(optional)
             info = self._mergeDict(info, optional)
         logger.debug("Parameters passed for create volume %s" % info)
 
         try:
             response, body = self.http.post('/volumes', body=info)
+            self._invalidate_cpg_usage()
             return body
         except exceptions.HTTPBadRequest as ex:
             if self.primera_supported:
-                ex_desc = 'invalid input: one of the parameters is required'
-                ex_code = ex.get_code()
-                # INV_INPUT_ONE_REQUIRED => 78
-                if ex_code == 78 and \
-                   ex.get_description() == ex_desc and \
-                   ex.get_ref() == 'tpvv,reduce':
-                    new_ex_desc = "invalid input: Either tpvv must be true "\
-                                  "OR for compressed and deduplicated "\
-                                  "volumes both 'compression' and 'tdvv' "\
-                                  "must be specified as true"
-                    raise exceptions.HTTPBadRequest(new_ex_desc)
+                self._check_primera_volume_error(ex)
             raise ex
 
+    @staticmethod
+    def _convert_primera_volume_options(optional):
+        """Convert the tpvv/tdvv/compression options for a Primera array.
+
+        Primera has no 'tdvv' and 'compression' keys, a compressed and
+        deduplicated volume is requested with 'reduce' instead.
+
+        :param optional: dict of optional volume settings
+        :type optional: dict
+
+        :returns: The converted optional dict
+        :raises: :class:`~hpe3parclient.exceptions.HTTPBadRequest`
+            - When the option combination is not valid on Primera
+        """
+        for key in ['tpvv', 'compression', 'tdvv']:
+            option = optional.get(key)
+            if option and option not in [True, False]:
+                # raising exception for junk compression input
+                ex_desc = "39 - invalid input: wrong type for key "\
+                    "[%s]. Valid values are [True, False]" % key
+                raise exceptions.HTTPBadRequest(ex_desc)
+
+        if optional.get('compression') is True:
+            combination = ['tdvv', 'compression']
+            len_diff = len(set(combination) - set(optional.keys()))
+            msg = "invalid input: For compressed and deduplicated "\
+                  "volumes both 'compression' and " \
+                  "'tdvv' must be specified as true"
+            if len_diff == 1:
+                raise exceptions.HTTPBadRequest(msg)
+            if optional.get('tdvv') is True \
+                    and optional.get('compression') is True:
+                optional['reduce'] = True
+
+            if optional.get('tdvv') is False \
+                    and optional.get('compression') is True:
+                raise exceptions.HTTPBadRequest(msg)
+        else:
+            msg = "invalid input: For compressed and deduplicated "\
+                  "volumes both 'compression' and "\
+                  "'tdvv' must be specified as true"
+            if optional.get('tdvv') is False \
+                    and optional.get('compression') is False:
+                optional['reduce'] = False
+            if optional.get('tdvv') is True \
+                    and optional.get('compression') is False:
+                raise exceptions.HTTPBadRequest(msg)
+
+        if 'compression' in optional:
+            optional.pop('compression')
+        if 'tdvv' in optional:
+            optional.pop('tdvv')
+        return optional
+
+    @staticmethod
+    def _check_primera_volume_error(ex, suffix=''):
+        """Reword the error Primera gives when neither tpvv nor reduce is set.
+
+        :param ex: The HTTPBadRequest raised by the array
+        :type ex: :class:`~hpe3parclient.exceptions.HTTPBadRequest`
+        :param suffix: Text appended to the reworded error description
+        :type suffix: str
+
+        :raises: :class:`~hpe3parclient.exceptions.HTTPBadRequest`
+            - INV_INPUT_ONE_REQUIRED - With an explanation of the
+            tpvv, tdvv and compression options
+        """
+        ex_desc = 'invalid input: one of the parameters is required'
+        ex_code = ex.get_code()
+        # INV_INPUT_ONE_REQUIRED => 78
+        if ex_code == 78 and \
+           ex.get_description() == ex_desc and \
+           ex.get_ref() == 'tpvv,reduce':
+            new_ex_desc = "invalid input: Either tpvv must be true "\
+                          "OR for compressed and deduplicated "\
+                          "volumes both 'compression' and 'tdvv' "\
+                          "must be specified as true" + suffix
+            raise exceptions.HTTPBadRequest(new_ex_desc)
+
     def deleteVolume(self, name):
         """Delete a volume.
 
@@ -586,6 +1024,7 @@ class HPE3ParClient(object):
 
         """
         response, body = self.http.delete('/volumes/%s' % name)
+        self._invalidate_cpg_usage()
         return body
 
     def modifyVolume(self, name, volumeMods, appType=None):
@@ -700,6 +1139,8 @@ class HPE3ParClient(object):
 
         """
         response = self.http.put('/volumes/%s' % name, body=volumeMods)
+        # The volume may have moved to other CPGs, changing their usage.
+        self._invalidate_cpg_usage()
 
         if appType is not None:
             if 'newName' in volumeMods and volumeMods['newName']:
@@ -787,6 +1228,7 @@ class HPE3ParClient(object):
                 'sizeMiB': int(amount)}
 
         response, body = self.http.put('/volumes/%s' % name, body=info)
+        self._invalidate_cpg_usage()
         return body
 
     def promoteVirtualCopy(self, snapshot, optional=None):
@@ -861,6 +1303,7 @@ class HPE3ParClient(object):
             info = self._mergeDict(info, optional)
 
         response, body = self.http.put('/volumes/%s' % snapshot, body=info)
+        self._invalidate_cpg_usage()
         return body
 
     def copyVolume(self, src_name, dest_name, dest_cpg, optional=None):
@@ -984,43 +1427,7 @@ class HPE3ParClient(object):
         # has to be taken care by caller side
         if optional:
             if self.primera_supported:
-                for key in ['tpvv', 'compression', 'tdvv']:
-                    option = optional.get(key)
-                    if option and option not in [True, False]:
-                        # raising exception for junk compression input
-                        ex_desc = "39 - invalid input: wrong type for key " \
-                            "[%s]. Valid values are [True, False]" % key
-                        raise exceptions.HTTPBadRequest(ex_desc)
-                if optional.get('compression') is True:
-                    combination = ['tdvv', 'compression']
-                    len_diff = len(set(combination) - set(optional.keys()))
-                    msg = "invalid input: For compressed and deduplicated "\
-                          "volumes both 'compression' and " \
-                          "'tdvv' must be specified as true"
-                    if len_diff == 1:
-                        raise exceptions.HTTPBadRequest(msg)
-                    if optional.get('tdvv') is True \
-                            and optional.get('compression') is True:
-                        optional['reduce'] = True
-
-                    if optional.get('tdvv') is False \
-                            and optional.get('compression') is True:
-                        raise exceptions.HTTPBadRequest(msg)
-                else:
-                    msg = "invalid input: For compressed and deduplicated "\
-                          "volumes both 'compression' and "\
-                          "'tdvv' must be specified as true"
-                    if optional.get('tdvv') is False \
-                            and optional.get('compression') is False:
-                        optional['reduce'] = False
-                    if optional.get('tdvv') is True \
-                            and optional.get('compression') is False:
-                        raise exceptions.HTTPBadRequest(msg)
-
-                if 'compression' in optional:
-                    optional.pop('compression')
-                if 'tdvv' in optional:
-                    optional.pop('tdvv')
+                optional = self._convert_primera_volume_options(optional)
             parameters = self._mergeDict(parameters, optional)
         if 'online' not in parameters or not parameters['online']:
             # 3Par won't allow destCPG to be set if it's not an online copy.
@@ -1032,20 +1439,11 @@ class HPE3ParClient(object):
         try:
             response, body = self.http.post('/volumes/%s' % src_name,
                                             body=info)
+            self._invalidate_cpg_usage()
             return body
         except exceptions.HTTPBadRequest as ex:
             if self.primera_supported:
-                ex_desc = 'invalid input: one of the parameters is required'
-                ex_code = ex.get_code()
-                # INV_INPUT_ONE_REQUIRED => 78
-                if ex_code == 78 and \
-                   ex.get_description() == ex_desc and \
-                   ex.get_ref() == 'tpvv,reduce':
-                    new_ex_desc = "invalid input: Either tpvv must be true "\
-                                  "OR for compressed and deduplicated "\
-                                  "volumes both 'compression' and 'tdvv' "\
-                                  "must be specified as true."
-                    raise exceptions.HTTPBadRequest(new_ex_desc)
+                self._check_primera_volume_error(ex, '.')
             raise ex
 
     def isOnlinePhysicalCopy(self, name):
@@ -1207,8 +1605,9 @@ class HPE3ParClient(object):
         cmd = ['showpatch']
         if history:
             cmd.append('-hist')
+        # The history can be long, it is converted as it comes.
         return self._convert_cli_output_to_collection_like_wsapi(
-            self._run(cmd))
+            self._run_stream(cmd))
 
     def getPatch(self, patch_id):
         """Get details on a specified patch ID if it has been applied to the
@@ -1349,6 +1748,7 @@ class HPE3ParClient(object):
                 'parameters': parameters}
 
         response, body = self.http.post('/volumes/%s' % copyOfName, body=info)
+        self._invalidate_cpg_usage()
         return body
 
     # Host Set methods
@@ -1599,6 +1999,19 @@ class HPE3ParClient(object):
         response, body = self.http.get('/hosts')
         return body
 
+    def iterHosts(self, fields=None):
+        """Iterate over every Host on the 3Par array.
+
+        The hosts are yielded one at a time while the response is received,
+        see :meth:`iterVolumes`.
+
+        :param fields: The keys to keep in every host, or None for all
+        :type fields: list of str
+
+        :returns: generator of Hosts
+        """
+        return self.http.iter_members('/hosts', fields=fields)
+
     def getHost(self, name):
         """Get information about a Host.
 
@@ -2007,6 +2420,10 @@ class HPE3ParClient(object):
         :returns: list of Ports
 
         """
+        body = self._cache_get('ports')
+        if body is not None:
+            return body
+
         response, body = self.http.get('/ports')
 
         # if any of the ports are iSCSI ports and
@@ -2026,7 +2443,7 @@ class HPE3ParClient(object):
                 if vlan_body:
                     port['iSCSIVlans'] = vlan_body['iSCSIVlans']
 
-        return body
+        return self._cache_put('ports', body)
 
     def _getProtocolPorts(self, protocol, state=None):
         return_ports = []
@@ -2096,7 +2513,10 @@ class HPE3ParClient(object):
         :returns: list of cpgs
 
         """
-        response, body = self.http.get('/cpgs')
+        body = self._cache_get('cpgs')
+        if body is None:
+            response, body = self.http.get('/cpgs')
+            self._cache_put('cpgs', body)
         return body
 
     def getCPG(self, name):
@@ -2110,7 +2530,10 @@ class HPE3ParClient(object):
             -  NON_EXISTENT_CPG - CPG doesn't exist
 
         """
-        response, body = self.http.get('/cpgs/%s' % name)
+        body = self._cache_get('cpg', name)
+        if body is None:
+            response, body = self.http.get('/cpgs/%s' % name)
+            self._cache_put('cpg', body, name)
         return body
 
     def getCPGAvailableSpace(self, name):
@@ -2199,6 +2622,8 @@ class HPE3ParClient(object):
             info = self._mergeDict(info, optional)
 
         response, body = self.http.post('/cpgs', body=info)
+        self._cache_invalidate('cpgs')
+        self._cache_invalidate('cpg', name)
         return body
 
     def deleteCPG(self, name):
@@ -2216,6 +2641,8 @@ class HPE3ParClient(object):
 
         """
         response, body = self.http.delete('/cpgs/%s' % name)
+        self._cache_invalidate('cpgs')
+        self._cache_invalidate('cpg', name)
 
     # VLUN methods
     #
@@ -2235,6 +2662,20 @@ class HPE3ParClient(object):
         response, body = self.http.get('/vluns')
         return body
 
+    def iterVLUNs(self, fields=None):
+        """Iterate over the VLUNs.
+
+        The VLUNs are yielded one at a time while the response is received,
+        see :meth:`iterVolumes`.
+
+        :param fields: The keys to keep in every VLUN, or None for all
+        :type fields: list of str
+
+        :returns: generator of VLUNs
+
+        """
+        return self.http.iter_members('/vluns', fields=fields)
+
     def getVLUN(self, volumeName, allVluns=False):
         """Get information about a VLUN.
 
@@ -2755,6 +3196,7 @@ class HPE3ParClient(object):
 
         response, body = self.http.post('/volumesets/%s' % copyOfName,
                                         body=info)
+        self._invalidate_cpg_usage()
         return body
 
     # QoS Priority Optimization methods
@@ -4872,9 +5314,11 @@ class HPE3ParClient(object):
         If you need more validity checking, you might want to do it before this
         generic routine.  It does minimal checking.
 
-        :param cli_output: The result from the CLI (i.e. from ssh.run(cmd)).
-                           The first row is headers. Following rows are data.
-        :type cli_output: list
+        :param cli_output: The result from the CLI (i.e. from ssh.run(cmd),
+                           or the lines of ssh.run_stream(cmd) as they
+                           come). The first row is headers. Following rows
+                           are data.
+        :type cli_output: list or iterator
 
         .. code-block:: python
 
@@ -4941,7 +5385,7 @@ class HPE3ParClient(object):
         """
 
         members = []
-        if cli_output and len(cli_output) >= 2:
+        if cli_output:
             for index, line in enumerate(cli_output):
                 if index == 0:
                     headers = line.split(',')
@@ -5111,6 +5555,7 @@ class HPE3ParClient(object):
             info = self._mergeDict(info, optional)
         response, body = self.http.put(
             '/volumes/%s' % volName, body=info)
+        self._invalidate_cpg_usage()
         return body
 
     def _cancelTask(self, taskId):
@@ -0,0 +1,163 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI JSON codecs
+
+.. module: codec
+
+:Description: Encodes request bodies to and decodes response bodies from
+ JSON bytes.  The fastest installed backend is used unless a codec is asked
+ for by name.
+
+ * ``orjson`` - used when the orjson package is installed
+ * ``json`` - the standard library, always available
+
+.. code-block:: python
+
+    cl = client.HPE3ParClient(api_url, json_codec='json')
+
+"""
+
+import sys
+
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONCodec(object):
+    """
+    The interface of a JSON codec.
+
+    :meth:`loads` must raise ValueError, or a subclass of it, when the data
+    is not JSON.
+
+    """
+
+    name = None
+
+    def dumps(self, obj):
+        """Encode an object.
+
+        :param obj: The request body
+        :type obj: dict
+
+        :returns: bytes
+        """
+        raise NotImplementedError()
+
+    def loads(self, data):
+        """Decode UTF-8 JSON data.
+
+        :param data: The response body
+        :type data: bytes
+
+        :returns: The decoded object
+        """
+        raise NotImplementedError()
+
+
+class StdlibJSONCodec(JSONCodec):
+    """The codec of the json module of the standard library."""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        return json.dumps(obj).encode('utf-8')
+
+    if sys.version_info >= (3, 6):
+        def loads(self, data):
+            # json.loads detects the encoding of bytes on its own.
+            return json.loads(data)
+    else:
+        def loads(self, data):
+            if isinstance(data, bytes):
+                data = data.decode('utf-8')
+            return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """The codec of the orjson package."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("The orjson package is not installed")
+        self._fallback = StdlibJSONCodec()
+
+    def dumps(self, obj):
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson is stricter than json, ie. it refuses non str keys.
+            return self._fallback.dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+_codecs = {
+    StdlibJSONCodec.name: StdlibJSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def register_codec(codec_class):
+    """Make a codec available by its name.
+
+    :param codec_class: The codec class, with a unique name attribute
+    :type codec_class: class
+
+    """
+    _codecs[codec_class.name] = codec_class
+
+
+def available_codecs():
+    """The names of the codecs that can be used here.
+
+    :returns: list of str
+    """
+    return sorted(name for name in _codecs
+                  if name != OrjsonCodec.name or orjson is not None)
+
+
+def get_codec(codec=None):
+    """Get a codec.
+
+    :param codec: A codec name, a codec instance, or None for the fastest
+                  installed codec
+    :type codec: str or :class:`JSONCodec`
+
+    :returns: :class:`JSONCodec`
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        if orjson is not None:
+            codec = OrjsonCodec.name
+        else:
+            codec = StdlibJSONCodec.name
+    try:
+        codec_class = _codecs[codec]
+    except KeyError:
+        raise ValueError("Unknown JSON codec '%s'" % codec)
+    return codec_class()
@@ -0,0 +1,239 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI endpoints
+
+.. module: endpoints
+
+:Description: Spreads the requests to an array over several WSAPI
+ endpoints, ie. the addresses of its controllers, and stops using the ones
+ that fail until they had time to recover.
+
+.. code-block:: python
+
+    cl = client.HPE3ParClient(['https://10.0.0.1:8080/api/v1',
+                               'https://10.0.0.2:8080/api/v1'])
+
+"""
+
+import random
+import threading
+
+import requests
+
+from hpe3parclient import timings
+
+try:
+    # For Python 3.0 and later
+    from urllib.parse import urlparse, urlunparse
+except ImportError:
+    # Fall back to Python 2's urllib2
+    from urlparse import urlparse, urlunparse
+
+#: Errors after which an endpoint is taken out of use right away
+DOWN_EXCEPTIONS = (requests.exceptions.ConnectionError,
+                   requests.exceptions.Timeout)
+
+
+class Endpoint(object):
+    """
+    One WSAPI endpoint and its health.
+
+    The latency and the error rate are moving averages, recent requests
+    count the most. The lower the :meth:`score` the healthier.
+
+    :param url: The WSAPI url, ie. https://10.0.0.1:8080/api/v1
+    :type url: str
+
+    """
+
+    #: Weight of the last request in the moving averages
+    DECAY = 0.2
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        parsed = urlparse(self.url)
+        self.scheme = parsed.scheme
+        self.netloc = parsed.netloc
+        self.latency = None
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.failures = 0
+        self.down_until = None
+
+    def rebase(self, url):
+        """Point a url of the array to this endpoint.
+
+        :param url: An absolute url to any endpoint of the array
+        :type url: str
+
+        :returns: str
+        """
+        parsed = urlparse(url)
+        return urlunparse((self.scheme, self.netloc) + tuple(parsed[2:]))
+
+    def is_down(self, now):
+        return self.down_until is not None and now < self.down_until
+
+    def score(self):
+        """How loaded and unhealthy the endpoint looks.
+
+        :returns: float
+        """
+        # An endpoint without samples yet is tried as a fast one.
+        latency = self.latency or 0.0
+        return ((latency + 0.001) * (1 + self.in_flight) *
+                (1 + 10 * self.error_rate))
+
+    def to_dict(self, now):
+        return {'url': self.url,
+                'up': not self.is_down(now),
+                'latency': self.latency,
+                'error_rate': self.error_rate,
+                'in_flight': self.in_flight,
+                'requests': self.requests,
+                'errors': self.errors,
+                'score': self.score()}
+
+
+class EndpointPool(object):
+    """
+    Chooses the endpoint of every request.
+
+    A request goes to the better scored of two endpoints picked at random
+    among the ones that are up, which spreads the load while favouring the
+    fast and healthy ones. An endpoint that refuses connections, times out
+    or answers 503 is down for ``down_time`` seconds, as is one that fails
+    ``max_failures`` requests in a row. When every endpoint is down the one
+    that comes back first is used.
+
+    :param urls: The WSAPI urls of the same array
+    :type urls: list of str
+    :param down_time: Seconds an endpoint is left alone after failing
+    :type down_time: float
+    :param max_failures: Failed requests in a row that take an endpoint
+                         down
+    :type max_failures: int
+
+    """
+
+    def __init__(self, urls, down_time=30, max_failures=3):
+        if not urls:
+            raise ValueError("At least one WSAPI url is needed")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.down_time = down_time
+        self.max_failures = max_failures
+        self.failovers = 0
+        self._lock = threading.Lock()
+
+    def _up(self, now, exclude=()):
+        return [endpoint for endpoint in self.endpoints
+                if not endpoint.is_down(now) and endpoint not in exclude]
+
+    def choose(self, exclude=()):
+        """Pick the endpoint of a request and count it as in flight.
+
+        :param exclude: Endpoints not to pick, there must be others
+        :type exclude: list of :class:`Endpoint`
+
+        :returns: :class:`Endpoint`, to pass to :meth:`record`
+        """
+        now = timings.monotonic()
+        with self._lock:
+            candidates = self._up(now, exclude)
+            if not candidates:
+                endpoint = min((endpoint for endpoint in self.endpoints
+                                if endpoint not in exclude),
+                               key=lambda endpoint: endpoint.down_until)
+            elif len(candidates) == 1:
+                endpoint = candidates[0]
+            else:
+                endpoint = min(random.sample(candidates, 2),
+                               key=Endpoint.score)
+            endpoint.in_flight += 1
+            return endpoint
+
+    def record(self, endpoint, latency, error=None, status=None):
+        """Update the health of an endpoint after a request.
+
+        :param endpoint: What :meth:`choose` returned
+        :type endpoint: :class:`Endpoint`
+        :param latency: The request time in seconds
+        :type latency: float
+        :param error: The exception the request raised, if any
+        :type error: Exception
+        :param status: The HTTP status of the response, if any
+        :type status: int
+
+        """
+        down = (isinstance(error, DOWN_EXCEPTIONS) or status == 503)
+        failed = down or error is not None or (status or 0) >= 500
+        now = timings.monotonic()
+        with self._lock:
+            endpoint.in_flight -= 1
+            endpoint.requests += 1
+            decay = Endpoint.DECAY
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += decay * (latency - endpoint.latency)
+            endpoint.error_rate += decay * (failed - endpoint.error_rate)
+            if not failed:
+                endpoint.failures = 0
+                endpoint.down_until = None
+                return
+            endpoint.errors += 1
+            endpoint.failures += 1
+            if down or endpoint.failures >= self.max_failures:
+                if not endpoint.is_down(now):
+                    self.failovers += 1
+                endpoint.down_until = now + self.down_time
+
+    def release(self, endpoint):
+        """Give back an endpoint no request was sent to.
+
+        :param endpoint: What :meth:`choose` returned
+        :type endpoint: :class:`Endpoint`
+
+        """
+        with self._lock:
+            endpoint.in_flight -= 1
+
+    def has_alternative(self, endpoint):
+        """Is another endpoint up to send a request to?
+
+        :param endpoint: The endpoint that just failed
+        :type endpoint: :class:`Endpoint`
+
+        :returns: bool
+        """
+        now = timings.monotonic()
+        with self._lock:
+            return any(other is not endpoint
+                       for other in self._up(now))
+
+    def stats(self):
+        """Get the health of every endpoint.
+
+        :returns: dict with the number of failovers and the list of
+                  endpoints
+        """
+        now = timings.monotonic()
+        with self._lock:
+            return {'failovers': self.failovers,
+                    'endpoints': [endpoint.to_dict(now)
+                                  for endpoint in self.endpoints]}
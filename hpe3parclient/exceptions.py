@@ -130,6 +130,29 @@ class SSLCertFailed(ClientException):
     message = "SSL Certificate Verification Failed"
 
 
+# Bulk operation errors
+
+
+class DependencyFailed(ClientException):
+    """
+    A bulk operation did not run because an operation it depends on failed
+    """
+    http_status = ""
+    message = "Dependency Failed"
+
+
+# Circuit breaker errors
+
+
+class CircuitOpen(ClientException):
+    """
+    The request was not sent because the circuit breaker of the endpoint is
+    open
+    """
+    http_status = ""
+    message = "Circuit Open"
+
+
 #  Python Requests Errors
 
 
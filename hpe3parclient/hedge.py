@@ -0,0 +1,280 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI hedged requests
+
+.. module: hedge
+
+:Description: Sends a second copy of a slow GET and uses whichever
+ response comes first, which cuts the latency tail caused by a stuck
+ connection or a busy controller.
+
+"""
+
+import threading
+
+try:
+    # For Python 3.0 and later
+    import queue
+except ImportError:
+    # Fall back to Python 2's Queue
+    import Queue as queue
+
+
+class HedgePolicy(object):
+    """
+    When and how often to hedge requests.
+
+    A GET that got no response after the ``percentile`` latency of its
+    endpoint, ie. ``GET /vluns``, is sent a second time, on another pooled
+    connection or another WSAPI endpoint, and the first response wins.
+    Endpoints with fewer than ``min_samples`` requests timed are not
+    hedged. At most ``max_ratio`` of the requests are sent twice, so a
+    slow array is not loaded further by hedges.
+
+    The copies run in a pool of at most ``max_threads`` threads, kept for
+    the next requests. A request is not hedged when no thread is free.
+
+    :param percentile: The latency percentile after which to hedge
+    :type percentile: float
+    :param min_delay: The shortest wait before hedging, in seconds
+    :type min_delay: float
+    :param max_delay: The longest wait before hedging, in seconds. Default
+                      is no limit.
+    :type max_delay: float
+    :param min_samples: Requests to an endpoint timed before it is hedged
+    :type min_samples: int
+    :param max_ratio: The most hedges per request sent
+    :type max_ratio: float
+    :param max_threads: The most copies running at once, of all requests
+    :type max_threads: int
+
+    """
+
+    #: The methods that are safe to send twice
+    METHODS = ('GET',)
+
+    def __init__(self, percentile=95, min_delay=0.01, max_delay=None,
+                 min_samples=20, max_ratio=0.05, max_threads=16):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._workers = _Workers(max_threads)
+
+    def delay(self, request_timings, method, url):
+        """How long to wait for a response before hedging a request.
+
+        :param request_timings: The timings of the client
+        :type request_timings: :class:`~hpe3parclient.timings.RequestTimings`
+        :param method: The HTTP method of the request
+        :type method: str
+        :param url: The url of the request
+        :type url: str
+
+        :returns: The delay in seconds, or None when the request is not
+                  hedged
+        """
+        if method.upper() not in self.METHODS:
+            return None
+        delay = request_timings.percentile(method, url, self.percentile,
+                                           self.min_samples)
+        if delay is None:
+            return None
+        delay = max(self.min_delay, delay)
+        if self.max_delay is not None:
+            delay = min(self.max_delay, delay)
+        return delay
+
+    def _skip(self):
+        with self._lock:
+            self.skipped += 1
+
+    def _fire(self, race, send, try_hedge):
+        with self._lock:
+            if self.fired >= self.max_ratio * self.requests:
+                self.skipped += 1
+                return
+            if not self._workers.reserve():
+                self.skipped += 1
+                return
+            self.fired += 1
+        if try_hedge is not None:
+            send = try_hedge()
+            if send is None:
+                self._workers.cancel()
+                with self._lock:
+                    self.fired -= 1
+                    self.skipped += 1
+                return
+        race.run(send)
+
+    def send(self, send, delay, discard=None, try_hedge=None):
+        """Send a request, and a hedge once ``delay`` is over.
+
+        ``send`` runs in a thread of the pool, or in the calling thread
+        without a hedge when none is free. The first result wins, an error
+        only when every copy failed. The result of the copy that lost is
+        handed to ``discard`` when it comes.
+
+        :param send: Sends the request and returns its result
+        :type send: callable
+        :param delay: Seconds to wait before hedging
+        :type delay: float
+        :param discard: Frees a result that is not used
+        :type discard: callable
+        :param try_hedge: Takes what the hedge needs without waiting, ie.
+                          the permits of the rate limiters, and returns
+                          the callable sending it, or None when the hedge
+                          must not be sent. Default sends the hedge with
+                          ``send``.
+        :type try_hedge: callable
+
+        :returns: What ``send`` returned
+        """
+        with self._lock:
+            self.requests += 1
+        race = _Race(discard, self._workers)
+        if not self._workers.reserve():
+            self._skip()
+            return send()
+        race.run(send)
+        try:
+            result = race.results.get(timeout=delay)
+        except queue.Empty:
+            result = None
+            self._fire(race, send, try_hedge)
+        pending = race.started
+        error = None
+        while True:
+            if result is None:
+                result = race.results.get()
+            pending -= 1
+            index, value, ex = result
+            if ex is None:
+                break
+            if error is None:
+                error = ex
+            if not pending:
+                race.finish()
+                raise error
+            result = None
+        race.finish()
+        if index:
+            with self._lock:
+                self.won += 1
+        return value
+
+    def stats(self):
+        """Get the hedging counters.
+
+        :returns: dict with the requests that could be hedged, the hedges
+                  fired, the hedges that answered first, and the hedges not
+                  fired because of ``max_ratio``, of a busy thread pool or
+                  of the limiters
+        """
+        with self._lock:
+            return {'requests': self.requests,
+                    'fired': self.fired,
+                    'won': self.won,
+                    'skipped': self.skipped}
+
+
+class _Workers(object):
+    # A bounded pool of daemon threads, kept waiting for the next task.
+
+    def __init__(self, size):
+        self._slots = threading.Semaphore(size)
+        self._tasks = queue.Queue()
+        self._idle = 0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        # Takes a thread for a task to run, without waiting.
+        return self._slots.acquire(False)
+
+    def cancel(self):
+        self._slots.release()
+
+    def run(self, task):
+        # Runs a task in the thread reserved for it.
+        with self._lock:
+            idle = self._idle > 0
+            if idle:
+                self._idle -= 1
+        if idle:
+            self._tasks.put(task)
+            return
+        thread = threading.Thread(target=self._work, args=(task,))
+        thread.daemon = True
+        thread.start()
+
+    def _work(self, task):
+        # The tasks catch their errors.
+        while True:
+            task()
+            with self._lock:
+                self._idle += 1
+            self._slots.release()
+            task = self._tasks.get()
+
+
+class _Race(object):
+    # The copies of one hedged request.
+
+    def __init__(self, discard, workers):
+        self.discard = discard
+        self.workers = workers
+        self.results = queue.Queue()
+        self.started = 0
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def run(self, send):
+        # Runs a copy in a thread reserved in the pool.
+        index = self.started
+        self.started += 1
+        self.workers.run(lambda: self._run(index, send))
+
+    def _run(self, index, send):
+        try:
+            result = (index, send(), None)
+        except Exception as ex:
+            result = (index, None, ex)
+        with self._lock:
+            if not self.finished:
+                self.results.put(result)
+                return
+        self._discard(result)
+
+    def _discard(self, result):
+        if result[2] is None and self.discard is not None:
+            self.discard(result[1])
+
+    def finish(self):
+        # Results that come after this are discarded by their thread.
+        with self._lock:
+            self.finished = True
+        while True:
+            try:
+                self._discard(self.results.get_nowait())
+            except queue.Empty:
+                return
@@ -24,17 +24,32 @@
 
 """
 
+import contextlib
+import copy
 import logging
 import requests
+import threading
 import time
 import ast
 
+from hpe3parclient import breaker
+from hpe3parclient import codec
+from hpe3parclient import endpoints
+from hpe3parclient import exceptions
+from hpe3parclient import hedge
+from hpe3parclient import jsonstream
+from hpe3parclient import ratelimit
+from hpe3parclient import retry
+from hpe3parclient import timeouts
+from hpe3parclient import timings
+from hpe3parclient import tracing
+
 try:
-    import json
+    # For Python 3.0 and later
+    from urllib.parse import urlparse
 except ImportError:
-    import simplejson as json
-
-from hpe3parclient import exceptions
+    # Fall back to Python 2's urllib2
+    from urlparse import urlparse
 
 
 class HTTPJSONRESTClient(object):
@@ -43,8 +58,10 @@ class HTTPJSONRESTClient(object):
     HTTP request.
 
     :param api_url: The url to the WSAPI service on 3PAR
-                    ie. http://<3par server>:8080
-    :type api_url: str
+                    ie. http://<3par server>:8080, or a list of urls of
+                    the same array to spread the requests over. The first
+                    one is :attr:`api_url`.
+    :type api_url: str or list
     :param secure: Validate SSL cert? Default will not validate
     :type secure: bool
     :param http_log_debug: Turns on http log debugging. Default will not log
@@ -52,6 +69,99 @@ class HTTPJSONRESTClient(object):
     :param suppress_ssl_warnings: Suppresses log warning messages if True.
                                   Default will not suppress warnings.
     :type suppress_ssl_warnings: bool
+    :param pool_connections: The number of per-host connection pools to
+                             keep. Default is 10.
+    :type pool_connections: int
+    :param pool_maxsize: The maximum number of connections kept open to a
+                         single host. Default is 10.
+    :type pool_maxsize: int
+    :param pool_block: Block when all connections to a host are in use
+                       instead of opening an extra, unpooled connection.
+                       Default will not block.
+    :type pool_block: bool
+    :param pool_idle_timeout: Seconds a pooled connection may sit unused
+                              before it is dropped and reopened on the next
+                              request. Default keeps connections until the
+                              server closes them.
+    :type pool_idle_timeout: float
+    :param retry_policy: Decides which failed requests are retried and how
+                         long to back off. Every request starts with the
+                         full retry budget of the policy.
+                         Default is :class:`~hpe3parclient.retry.RetryPolicy`
+    :type retry_policy: :class:`~hpe3parclient.retry.RetryPolicy`
+    :param timings_maxlen: The number of recent requests kept by
+                           :meth:`get_timings`. Default is 1000.
+    :type timings_maxlen: int
+    :param json_codec: The codec used for request and response bodies, by
+                       name or instance. Default is the fastest installed.
+    :type json_codec: str or :class:`~hpe3parclient.codec.JSONCodec`
+    :param coalesce_gets: While a GET is in flight, identical GETs from
+                          other threads wait for it and get a copy of its
+                          response instead of being sent too. A GET sent
+                          right after a change may then get a response that
+                          was already in flight before it. Default is
+                          False.
+    :type coalesce_gets: bool
+    :param session_idle_timeout: Seconds of inactivity after which the
+                                 array expires a WSAPI session. When set,
+                                 the session is renewed before it expires
+                                 instead of after a request fails with 401.
+                                 Default waits for the 401.
+    :type session_idle_timeout: float
+    :param session_renew_margin: Renew the session this many seconds before
+                                 it would expire. Default is 60.
+    :type session_renew_margin: float
+    :param session_broker: Shares sessions with the other processes of the
+                           host instead of creating one per client.
+                           Default creates one per client.
+    :type session_broker:
+        :class:`~hpe3parclient.session_broker.FileSessionBroker`
+    :param rate_limit: Requests sent per second, or a
+                       :class:`~hpe3parclient.ratelimit.TokenBucket` shared
+                       by every client of the same array. Retries count as
+                       requests. Default does not limit the rate.
+    :type rate_limit: float or :class:`~hpe3parclient.ratelimit.TokenBucket`
+    :param concurrency_limiter: Limits the requests in flight with a window
+                                that grows while the array keeps up and
+                                shrinks on 503s and timeouts. True uses
+                                the default limiter. Default does not
+                                limit.
+    :type concurrency_limiter: bool or
+        :class:`~hpe3parclient.ratelimit.AdaptiveConcurrencyLimiter`
+    :param priority_lanes: Schedules the requests in flight by the lane
+                           chosen with :meth:`lane`, keeping slots for the
+                           interactive lane. True uses the default limiter,
+                           sharing the window of the concurrency limiter
+                           if there is one. Default does not schedule.
+    :type priority_lanes: bool or
+        :class:`~hpe3parclient.ratelimit.PriorityLimiter`
+    :param endpoint_down_time: Seconds an endpoint that failed is not used
+                               when there are several. Default is 30.
+    :type endpoint_down_time: float
+    :param circuit_breaker: Fails requests to an endpoint at once with
+                            :class:`~hpe3parclient.exceptions.CircuitOpen`
+                            after it failed several times in a row, until
+                            a probe request succeeds. With several
+                            endpoints the others are used instead. True
+                            uses the default settings. Default does not
+                            break.
+    :type circuit_breaker: bool or
+        :class:`~hpe3parclient.breaker.CircuitBreakerRegistry`
+    :param hedge_gets: Sends a second copy of a GET that got no response
+                       after the 95th percentile latency of its endpoint,
+                       and uses the first response. True uses the default
+                       policy. Default does not hedge.
+    :type hedge_gets: bool or :class:`~hpe3parclient.hedge.HedgePolicy`
+    :param adaptive_timeouts: Gives every method, url template and body
+                              action a timeout derived from the observed
+                              time of single attempts, no longer than
+                              ``timeout``. True uses the default settings.
+    :type adaptive_timeouts: bool or
+        :class:`~hpe3parclient.timeouts.AdaptiveTimeouts`
+    :param trace_hooks: Called when every request starts and ends. The list
+                        is kept as :attr:`trace_hooks`, hooks can be added
+                        to it later.
+    :type trace_hooks: list of :class:`~hpe3parclient.tracing.TraceHook`
 
     """
 
@@ -60,28 +170,120 @@ class HTTPJSONRESTClient(object):
     http_log_debug = False
     _logger = logging.getLogger(__name__)
 
-    # Retry constants
-    retry_exceptions = (exceptions.HTTPServiceUnavailable,
-                        requests.exceptions.ConnectionError)
-    tries = 5
-    delay = 0
-    backoff = 2
-
     def __init__(self, api_url, secure=False, http_log_debug=False,
-                 suppress_ssl_warnings=False, timeout=None):
+                 suppress_ssl_warnings=False, timeout=None,
+                 pool_connections=10, pool_maxsize=10, pool_block=False,
+                 pool_idle_timeout=None, retry_policy=None,
+                 timings_maxlen=1000, json_codec=None, coalesce_gets=False,
+                 session_idle_timeout=None, session_renew_margin=60,
+                 session_broker=None, rate_limit=None,
+                 concurrency_limiter=None, priority_lanes=None,
+                 endpoint_down_time=30, circuit_breaker=None,
+                 hedge_gets=None, adaptive_timeouts=None,
+                 trace_hooks=None):
         if suppress_ssl_warnings:
             requests.packages.urllib3.disable_warnings()
 
         self.session_key = None
+        # No re-auth attempt before a login succeeded.
+        self.auth_try = 1
+        self.session_idle_timeout = session_idle_timeout
+        self.session_renew_margin = session_renew_margin
+        self._session_used = None
+        self._reauth_lock = threading.Lock()
+        self._local = threading.local()
+        self.session_broker = session_broker
+
+        # A single long-lived session keeps TCP/TLS connections alive
+        # between WSAPI calls instead of handshaking on every request.
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.pool_idle_timeout = pool_idle_timeout
+        self._last_used = None
+        self.session = self._create_session()
+
+        self.endpoints = None
+        if isinstance(api_url, (list, tuple)):
+            if len(api_url) > 1:
+                self.endpoints = endpoints.EndpointPool(
+                    api_url, down_time=endpoint_down_time)
+            api_url = api_url[0]
 
         # should be http://<Server:Port>/api/v1
         self.set_url(api_url)
         self.set_debug_flag(http_log_debug)
 
-        self.times = []  # [("item", starttime, endtime), ...]
+        self.timings = timings.RequestTimings(timings_maxlen)
+        self.codec = codec.get_codec(json_codec)
+
+        self.coalesce_gets = coalesce_gets
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._coalescing_stats = {'sent': 0, 'coalesced': 0}
         self.secure = secure
         self.timeout = timeout
 
+        if retry_policy is None:
+            retry_policy = retry.RetryPolicy()
+        self.retry_policy = retry_policy
+
+        if (rate_limit is not None and
+                not isinstance(rate_limit, ratelimit.TokenBucket)):
+            rate_limit = ratelimit.TokenBucket(rate_limit)
+        self.rate_limiter = rate_limit
+        if concurrency_limiter is True:
+            concurrency_limiter = ratelimit.AdaptiveConcurrencyLimiter()
+        self.concurrency_limiter = concurrency_limiter or None
+        if priority_lanes is True:
+            priority_lanes = ratelimit.PriorityLimiter(
+                window=self.concurrency_limiter)
+        self.priority_limiter = priority_lanes or None
+        if circuit_breaker is True:
+            circuit_breaker = breaker.CircuitBreakerRegistry()
+        self.breakers = circuit_breaker or None
+        if hedge_gets is True:
+            hedge_gets = hedge.HedgePolicy()
+        self.hedge_policy = hedge_gets or None
+        if adaptive_timeouts is True:
+            adaptive_timeouts = timeouts.AdaptiveTimeouts()
+        self.adaptive_timeouts = adaptive_timeouts or None
+        if trace_hooks is None:
+            trace_hooks = []
+        self.trace_hooks = trace_hooks
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _get_session(self):
+        # The WSAPI server drops idle keep-alive connections on its own.
+        # Rather than finding that out through a failed request, drop our
+        # pooled connections once they have been idle for too long.
+        now = time.time()
+        if (self.pool_idle_timeout is not None and
+                self._last_used is not None and
+                now - self._last_used > self.pool_idle_timeout):
+            self.session.close()
+        self._last_used = now
+        return self.session
+
+    def close(self):
+        """
+        This closes all pooled connections to the 3PAR server.
+
+        The client can still be used afterwards, new connections are opened
+        as they are needed.
+
+        """
+        self.session.close()
+
     def set_url(self, api_url):
         # should be http://<Server:Port>/api/v1
         self.api_url = api_url.rstrip('/')
@@ -110,9 +312,11 @@ class HTTPJSONRESTClient(object):
         :type password: str
 
         """
+        self._authenticate(user, password, optional)
+
+    def _authenticate(self, user, password, optional=None, failed_key=None):
         # this prevens re-auth attempt if auth fails
         self.auth_try = 1
-        self.session_key = None
 
         info = {'user': user, 'password': password}
         self._auth_optional = None
@@ -121,36 +325,187 @@ class HTTPJSONRESTClient(object):
             self._auth_optional = optional
             info.update(optional)
 
-        resp, body = self.post('/credentials', body=info)
-        if body and 'key' in body:
-            self.session_key = body['key']
+        try:
+            if self.session_broker is not None:
+                key = self.session_broker.borrow(
+                    self.api_url, info, lambda: self._login(info),
+                    failed_key)
+            else:
+                key = self._login(info)
+        except Exception:
+            self.session_key = None
+            raise
+        if key:
+            self.session_key = key
+            self._session_used = timings.monotonic()
         self.auth_try = 0
         self.user = user
         self.password = password
 
-    def _reauth(self):
-        self.authenticate(self.user, self.password, self._auth_optional)
+    def _login(self, info):
+        # Other threads keep using the current session key until the new
+        # one is known.
+        self._local.authenticating = True
+        try:
+            resp, body = self.post('/credentials', body=info)
+        finally:
+            self._local.authenticating = False
+        if body and 'key' in body:
+            return body['key']
+        return None
+
+    def _reauth(self, failed_key=None):
+        # Only one thread logs in again. The other threads that failed with
+        # the same session key wait for it and then use the new key.
+        with self._reauth_lock:
+            if self.session_key != failed_key:
+                return True
+            if self.auth_try == 1:
+                # The last login failed, don't keep trying.
+                return False
+            self._authenticate(self.user, self.password,
+                               self._auth_optional, failed_key)
+            return True
+
+    def _session_expiring(self):
+        if (self.session_idle_timeout is None or not self.session_key or
+                self._session_used is None or
+                getattr(self._local, 'authenticating', False)):
+            return False
+        idle = timings.monotonic() - self._session_used
+        return idle > self.session_idle_timeout - self.session_renew_margin
 
     def unauthenticate(self):
         """
         This clears the authenticated session with the 3PAR server.
 
+        A session borrowed from the session broker is still used by other
+        clients, it is only forgotten and left to expire on the 3PAR.
+
         """
         # delete the session on the 3Par
-        self.delete('/credentials/%s' % self.session_key)
+        if self.session_broker is None:
+            self.delete('/credentials/%s' % self.session_key)
         self.session_key = None
 
     def get_timings(self):
         """
-        Ths gives an array of the request timings since last reset_timings call
+        This gives the most recent request timings, oldest first
+
+        Only the last timings_maxlen requests are kept. The times come from
+        a monotonic clock.
+
+        :returns: list of ("METHOD url", starttime, endtime) tuples
+        """
+        return self.timings.get_recent()
+
+    def get_timing_stats(self, reset=False):
+        """
+        This gives the latency summary of every WSAPI endpoint
+
+        .. code-block:: python
+
+            {'GET /volumes/<id>': {'count': 12, 'errors': 1,
+                                   'mean': 0.031, 'min': 0.012,
+                                   'max': 0.201, 'p50': 0.022,
+                                   'p95': 0.19, 'p99': 0.201}}
+
+        :param reset: Start counting from scratch once the summary is taken
+        :type reset: bool
+
+        :returns: dict
         """
-        return self.times
+        return self.timings.snapshot(reset)
+
+    def get_coalescing_stats(self):
+        """
+        This gives the number of GETs that were sent and the number of GETs
+        that shared the response of an identical GET already in flight
+
+        :returns: dict with sent and coalesced counters
+        """
+        with self._flights_lock:
+            return dict(self._coalescing_stats)
+
+    def get_limiter_stats(self):
+        """
+        Get the state of the rate, concurrency and priority limiters.
+
+        .. code-block:: python
+
+            {'rate': {'rate': 50.0, 'burst': 50.0, 'tokens': 12.5,
+                      'waits': 3, 'waited': 0.08},
+             'concurrency': {'window': 11.4, 'limit': 11, 'in_flight': 11,
+                             'queued': 6, 'max_queued': 20,
+                             'increases': 140, 'decreases': 2},
+             'lanes': {'limit': 11, 'reserved': 2,
+                       'lanes': {'interactive': {'in_flight': 1, 'queued': 0,
+                                                 'max_queued': 2,
+                                                 'sent': 31}, ...}}}
+
+        :returns: dict, with None for a limiter that is not used
+        """
+        return {
+            'rate': (self.rate_limiter.stats()
+                     if self.rate_limiter is not None else None),
+            'concurrency': (self.concurrency_limiter.stats()
+                            if self.concurrency_limiter is not None
+                            else None),
+            'lanes': (self.priority_limiter.stats()
+                      if self.priority_limiter is not None else None),
+        }
+
+    def get_breaker_stats(self):
+        """
+        Get the state of the circuit breaker of every endpoint.
+
+        .. code-block:: python
+
+            {'10.0.0.1:8080': {'state': 'open', 'failures': 0,
+                               'times_opened': 2, 'rejected': 117}}
+
+        :returns: dict, or None when the client has no circuit breaker
+        """
+        if self.breakers is None:
+            return None
+        return self.breakers.stats()
+
+    def get_hedge_stats(self):
+        """
+        Get the counters of the hedged GETs.
+
+        :returns: dict, see :meth:`~hpe3parclient.hedge.HedgePolicy.stats`,
+                  or None when the client does not hedge
+        """
+        if self.hedge_policy is None:
+            return None
+        return self.hedge_policy.stats()
+
+    def get_endpoint_stats(self):
+        """
+        Get the health of the WSAPI endpoints.
+
+        .. code-block:: python
+
+            {'failovers': 1,
+             'endpoints': [{'url': 'https://10.0.0.1:8080/api/v1',
+                            'up': False, 'latency': 2.1,
+                            'error_rate': 0.36, 'in_flight': 0,
+                            'requests': 120, 'errors': 3, 'score': 3.4},
+                           {'url': 'https://10.0.0.2:8080/api/v1',
+                            'up': True, ...}]}
+
+        :returns: dict, or None when the client has a single endpoint
+        """
+        if self.endpoints is None:
+            return None
+        return self.endpoints.stats()
 
     def reset_timings(self):
         """
-        This resets the request/response timings array
+        This resets the request/response timings
         """
-        self.times = []
+        self.timings.reset()
 
     def _http_log_req(self, args, kwargs):
         if not self.http_log_debug:
@@ -169,11 +524,13 @@ class HTTPJSONRESTClient(object):
 
         HTTPJSONRESTClient._logger.debug("\nREQ: %s\n" % "".join(string_parts))
         if 'body' in kwargs:
-            if 'password' in kwargs['body']:
-                body_dict = ast.literal_eval(kwargs['body'])
+            body = kwargs['body']
+            if isinstance(body, bytes):
+                body = body.decode('utf-8')
+            if 'password' in body:
+                body_dict = ast.literal_eval(body)
                 body_dict['password'] = "********"
-            HTTPJSONRESTClient._logger.debug("REQ BODY: %s\n" %
-                                             (kwargs['body']))
+            HTTPJSONRESTClient._logger.debug("REQ BODY: %s\n" % body)
 
     def _http_log_resp(self, resp, body):
         if not self.http_log_debug:
@@ -182,6 +539,8 @@ class HTTPJSONRESTClient(object):
         # making it easier to read
         HTTPJSONRESTClient._logger.debug("RESP:%s\n",
                                          str(resp).replace("',", "'\n"))
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
         HTTPJSONRESTClient._logger.debug("RESP BODY:%s\n", body)
 
     def request(self, *args, **kwargs):
@@ -189,17 +548,45 @@ class HTTPJSONRESTClient(object):
         This makes an HTTP Request to the 3Par server.
         You should use get, post, delete instead.
 
+        With stream=True the body of a successful response is not read, the
+        requests Response is returned in its place and has to be closed by
+        the caller.
+
+        timeout=<seconds> overrides the timeout of this request, as does
+        :meth:`call_timeout`.
+
         """
-        if self.session_key and self.auth_try != 1:
+        if not self.trace_hooks:
+            return self._request(None, *args, **kwargs)
+        event = tracing.start(self.trace_hooks, tracing.HTTP, args[1],
+                              timings.url_template(args[0]), args[0])
+        try:
+            resp, body = self._request(event, *args, **kwargs)
+        except Exception as ex:
+            tracing.end(self.trace_hooks, event, error=ex)
+            raise
+        tracing.end(self.trace_hooks, event)
+        return resp, body
+
+    def _request(self, event, *args, **kwargs):
+        stream = kwargs.pop('stream', False)
+        timeout = kwargs.pop('timeout', None)
+        # Remember the key the request was sent with, a 401 means that
+        # this key expired.
+        session_key = self._local.session_key = self.session_key
+        if session_key and not getattr(self._local, 'authenticating', False):
             kwargs.setdefault('headers', {})[self.SESSION_COOKIE_NAME] = \
-                self.session_key
+                session_key
 
         kwargs.setdefault('headers', kwargs.get('headers', {}))
         kwargs['headers']['User-Agent'] = self.USER_AGENT
         kwargs['headers']['Accept'] = 'application/json'
+        action = None
         if 'body' in kwargs:
+            if isinstance(kwargs['body'], dict):
+                action = kwargs['body'].get('action')
             kwargs['headers']['Content-Type'] = 'application/json'
-            kwargs['body'] = json.dumps(kwargs['body'])
+            kwargs['body'] = self.codec.dumps(kwargs['body'])
             payload = kwargs['body']
         else:
             payload = None
@@ -209,30 +596,23 @@ class HTTPJSONRESTClient(object):
         http_method = args[1]
 
         self._http_log_req(args, kwargs)
+        if timeout is None:
+            timeout = self._get_timeout(http_method, http_url, action)
         r = None
         resp = None
         body = None
-        while r is None and self.tries > 0:
+        retry_state = self.retry_policy.new_state(http_method)
+        while r is None:
             try:
                 # Check to see if the request is being retried. If it is, we
                 # want to delay.
-                if self.delay:
-                    time.sleep(self.delay)
-
-                if self.timeout:
-                    r = requests.request(http_method, http_url, data=payload,
-                                         headers=kwargs['headers'],
-                                         verify=self.secure,
-                                         timeout=self.timeout)
-                else:
-                    r = requests.request(http_method, http_url, data=payload,
-                                         headers=kwargs['headers'],
-                                         verify=self.secure)
+                if retry_state.delay:
+                    time.sleep(retry_state.delay)
+
+                r = self._send_timed(http_method, http_url, action, payload,
+                                     kwargs['headers'], stream, timeout)
 
                 resp = r.headers
-                body = r.text
-                if isinstance(body, bytes):
-                    body = body.decode('utf-8')
 
                 # resp['status'], status['content-location'], and resp.status
                 # need to be manually set as Python Requests doesn't provide
@@ -242,16 +622,27 @@ class HTTPJSONRESTClient(object):
                 if 'location' not in resp:
                     resp['content-location'] = r.url
 
+                if event is not None:
+                    event.status = r.status_code
+                if stream and r.status_code < 400:
+                    self._http_log_resp(resp, None)
+                    return resp, r
+
+                body = r.content
+                if event is not None:
+                    event.bytes = len(body)
+
                 r.close()
                 self._http_log_resp(resp, body)
 
                 # Try and convert the body response to an object
-                # This assumes the body of the reply is JSON
+                # This assumes the body of the reply is JSON, it is decoded
+                # straight from the bytes without building a str first.
                 if body:
                     try:
-                        body = json.loads(body)
+                        body = self.codec.loads(body)
                     except ValueError:
-                        pass
+                        body = r.text
                 else:
                     body = None
 
@@ -267,16 +658,23 @@ class HTTPJSONRESTClient(object):
                     "verification.", err)
                 raise exceptions.SSLCertFailed("SSL Certificate Verification "
                                                "Failed.")
-            except self.retry_exceptions as ex:
-                # If we catch an exception where we want to retry, we need to
-                # decrement the retry count prepare to try again.
+            except self.retry_policy.catch_exceptions as ex:
+                # If we catch an exception where we want to retry, the
+                # request's own retry budget decides if we try again.
                 r = None
-                self.tries -= 1
-                self.delay = self.delay * self.backoff + 1
+                if not self.retry_policy.matches(ex):
+                    raise
 
                 # Raise exception, we have exhausted all retries.
-                if self.tries is 0:
-                    raise ex
+                if not retry_state.retry(ex):
+                    raise
+                if event is not None:
+                    event.retries = retry_state.retries
+                # Fail over to another endpoint without backing off.
+                if (self.endpoints is not None and
+                        self.endpoints.has_alternative(
+                            getattr(self._local, 'endpoint', None))):
+                    retry_state.delay = 0
             except requests.exceptions.HTTPError as err:
                 raise exceptions.HTTPError("HTTP Error: %s" % err)
             except requests.exceptions.URLRequired as err:
@@ -292,33 +690,340 @@ class HTTPJSONRESTClient(object):
 
         return resp, body
 
+    def _get_timeout(self, http_method, http_url, action=None):
+        timeout = getattr(self._local, 'timeout', None)
+        if timeout is not None:
+            return timeout
+        if self.adaptive_timeouts is not None:
+            # The static timeout stays the longest one.
+            return self.adaptive_timeouts.get(http_method, http_url, action,
+                                              ceiling=self.timeout)
+        return self.timeout
+
+    def _send_timed(self, http_method, http_url, action, payload, headers,
+                    stream, timeout=None):
+        # The adaptive timeouts learn from single attempts, without the
+        # back off between retries.
+        if self.adaptive_timeouts is None:
+            return self._send(http_method, http_url, payload, headers,
+                              stream, timeout)
+        start_time = timings.monotonic()
+        try:
+            r = self._send(http_method, http_url, payload, headers, stream,
+                           timeout)
+        except Exception:
+            self.adaptive_timeouts.record(
+                http_method, http_url, timings.monotonic() - start_time,
+                action, error=True)
+            raise
+        self.adaptive_timeouts.record(http_method, http_url,
+                                      timings.monotonic() - start_time,
+                                      action, error=r.status_code >= 500)
+        return r
+
+    @contextlib.contextmanager
+    def call_timeout(self, timeout):
+        """
+        Use one timeout for the requests made by this thread.
+
+        .. code-block:: python
+
+            with cl.http.call_timeout(3600):
+                cl.copyVolume('vol1', 'vol2', 'OpenStackCPG')
+
+        :param timeout: The timeout in seconds
+        :type timeout: float
+
+        """
+        previous = getattr(self._local, 'timeout', None)
+        self._local.timeout = timeout
+        try:
+            yield
+        finally:
+            self._local.timeout = previous
+
+    def get_timeouts(self):
+        """
+        Get the adaptive timeout of every kind of request timed so far.
+
+        :returns: dict of timeouts in seconds by "METHOD /template [action]",
+                  or None without adaptive timeouts
+        """
+        if self.adaptive_timeouts is None:
+            return None
+        return self.adaptive_timeouts.snapshot(ceiling=self.timeout)
+
+    @contextlib.contextmanager
+    def lane(self, lane, override=True):
+        """
+        Send the requests made by this thread in a priority lane.
+
+        .. code-block:: python
+
+            with cl.http.lane('background'):
+                cl.getCPGStatData('OpenStackCPG')
+
+        :param lane: ``interactive``, ``normal`` or ``background``
+        :type lane: str
+        :param override: Replace the lane of an enclosing :meth:`lane`
+                         block? When False the outer lane is kept.
+        :type override: bool
+
+        :raises: ValueError if there is no such lane
+        """
+        ratelimit.check_lane(lane)
+        previous = getattr(self._local, 'lane', None)
+        if previous is None or override:
+            self._local.lane = lane
+        try:
+            yield
+        finally:
+            self._local.lane = previous
+
+    def _send(self, http_method, http_url, payload, headers, stream,
+              timeout=None):
+        # Every attempt, retries included, goes through the limiters.
+        lane = None
+        if self.priority_limiter is not None:
+            lane = getattr(self._local, 'lane', None) or ratelimit.NORMAL
+            self.priority_limiter.acquire(lane)
+        try:
+            return self._send_limited(http_method, http_url, payload,
+                                      headers, stream, timeout)
+        finally:
+            if lane is not None:
+                self.priority_limiter.release(lane)
+
+    def _send_limited(self, http_method, http_url, payload, headers,
+                      stream, timeout=None):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        started = None
+        if self.concurrency_limiter is not None:
+            started = self.concurrency_limiter.acquire()
+        overloaded = False
+        try:
+            r = self._send_hedged(http_method, http_url, payload, headers,
+                                  stream, timeout)
+            overloaded = r.status_code == 503
+            return r
+        except requests.exceptions.Timeout:
+            overloaded = True
+            raise
+        finally:
+            if started is not None:
+                self.concurrency_limiter.release(started, overloaded)
+
+    def _send_hedged(self, http_method, http_url, payload, headers, stream,
+                     timeout=None):
+        delay = None
+        if self.hedge_policy is not None and not stream:
+            delay = self.hedge_policy.delay(self.timings, http_method,
+                                            http_url)
+        if delay is None:
+            return self._send_to_endpoint(http_method, http_url, payload,
+                                          headers, stream, timeout)
+
+        def send():
+            r = self._send_to_endpoint(http_method, http_url, payload,
+                                       headers, stream, timeout)
+            return r, getattr(self._local, 'endpoint', None)
+
+        lane = None
+        if self.priority_limiter is not None:
+            lane = getattr(self._local, 'lane', None) or ratelimit.NORMAL
+
+        def try_hedge():
+            return self._try_hedge(send, lane)
+
+        # The copies run in threads of the pool, the endpoint that
+        # answered is handed back for the failover in request().
+        r, self._local.endpoint = self.hedge_policy.send(
+            send, delay, discard=lambda result: result[0].close(),
+            try_hedge=try_hedge)
+        return r
+
+    def _try_hedge(self, send, lane):
+        # A hedge goes through the limiters like any request, but it is
+        # not sent rather than waiting for them.
+        if lane is not None and not self.priority_limiter.try_acquire(lane):
+            return None
+        started = None
+        if self.concurrency_limiter is not None:
+            started = self.concurrency_limiter.try_acquire()
+        if ((self.concurrency_limiter is not None and started is None) or
+                (self.rate_limiter is not None and
+                 not self.rate_limiter.try_acquire())):
+            if started is not None:
+                self.concurrency_limiter.release(started)
+            if lane is not None:
+                self.priority_limiter.release(lane)
+            return None
+
+        def hedge():
+            overloaded = False
+            try:
+                result = send()
+                overloaded = result[0].status_code == 503
+                return result
+            except requests.exceptions.Timeout:
+                overloaded = True
+                raise
+            finally:
+                if started is not None:
+                    self.concurrency_limiter.release(started, overloaded)
+                if lane is not None:
+                    self.priority_limiter.release(lane)
+        return hedge
+
+    def _choose_endpoint(self, http_url):
+        # An endpoint whose circuit breaker is open is skipped, the request
+        # only fails when the breaker of every endpoint is open.
+        endpoint = None
+        refused = []
+        while True:
+            if self.endpoints is not None:
+                endpoint = self._local.endpoint = self.endpoints.choose(
+                    exclude=refused)
+                http_url = endpoint.rebase(http_url)
+            if self.breakers is None:
+                return endpoint, http_url, None
+            circuit = self.breakers.get(urlparse(http_url).netloc)
+            try:
+                circuit.before_call()
+                return endpoint, http_url, circuit
+            except exceptions.CircuitOpen:
+                if endpoint is None:
+                    raise
+                self.endpoints.release(endpoint)
+                refused.append(endpoint)
+                if len(refused) == len(self.endpoints.endpoints):
+                    raise
+
+    def _send_to_endpoint(self, http_method, http_url, payload, headers,
+                          stream, timeout=None):
+        endpoint, http_url, circuit = self._choose_endpoint(http_url)
+        if endpoint is not None:
+            start_time = timings.monotonic()
+        try:
+            session = self._get_session()
+            if timeout:
+                r = session.request(http_method, http_url, data=payload,
+                                    headers=headers,
+                                    verify=self.secure,
+                                    timeout=timeout,
+                                    stream=stream)
+            else:
+                r = session.request(http_method, http_url, data=payload,
+                                    headers=headers,
+                                    verify=self.secure,
+                                    stream=stream)
+        except Exception as ex:
+            if circuit is not None:
+                circuit.record_failure()
+            if endpoint is not None:
+                self.endpoints.record(
+                    endpoint, timings.monotonic() - start_time, error=ex)
+            raise
+        if circuit is not None:
+            if r.status_code >= 500:
+                circuit.record_failure()
+            else:
+                circuit.record_success()
+        if endpoint is not None:
+            self.endpoints.record(endpoint, timings.monotonic() - start_time,
+                                  status=r.status_code)
+        return r
+
     def _time_request(self, url, method, **kwargs):
-        start_time = time.time()
-        resp, body = self.request(url, method, **kwargs)
-        self.times.append(("%s %s" % (method, url),
-                           start_time, time.time()))
+        start_time = timings.monotonic()
+        try:
+            resp, body = self.request(url, method, **kwargs)
+        except Exception:
+            self.timings.record(method, url, start_time, timings.monotonic(),
+                                error=True)
+            raise
+        self.timings.record(method, url, start_time, timings.monotonic())
         return resp, body
 
     def _do_reauth(self, url, method, ex, **kwargs):
         # print("_do_reauth called")
+        if getattr(self._local, 'authenticating', False):
+            # The login itself was refused.
+            raise ex
         try:
-            if self.auth_try != 1:
-                self._reauth()
-                resp, body = self._time_request(self.api_url + url, method,
-                                                **kwargs)
+            if self._reauth(getattr(self._local, 'session_key', None)):
+                resp, body = self._time_request(self._absolute_url(url),
+                                                method, **kwargs)
                 return resp, body
             else:
                 raise ex
         except exceptions.HTTPUnauthorized:
             raise ex
 
+    def _absolute_url(self, url):
+        # Absolute urls, ie. the version at host:port/api, are used as is
+        # rather than changing the api_url other threads are using.
+        if url.startswith('/'):
+            return self.api_url + url
+        return url
+
     def _cs_request(self, url, method, **kwargs):
+        if method == 'GET' and not kwargs and self.coalesce_gets:
+            return self._coalesced_request(url, method)
+        return self._send_cs_request(url, method, **kwargs)
+
+    def _coalesced_request(self, url, method):
+        # The first thread to ask for a url sends the GET, the threads
+        # asking for the same url while it is in flight wait for its result.
+        key = self._absolute_url(url)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._coalescing_stats['sent'] += 1
+            else:
+                flight.waiters += 1
+                self._coalescing_stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            result = self._send_cs_request(url, method)
+        except BaseException as ex:
+            flight.error = ex
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+            raise
+
+        # No waiter can join once the flight is removed, so copy the result
+        # for them before the caller gets a chance to change it.
+        with self._flights_lock:
+            del self._flights[key]
+            waiters = flight.waiters
+        if waiters:
+            flight.result = copy.deepcopy(result)
+        flight.done.set()
+        return result
+
+    def _send_cs_request(self, url, method, **kwargs):
+        # Renew a session that is about to expire before using it.
+        if self._session_expiring():
+            self._reauth(self.session_key)
+
         # Perform the request once. If we get a 401 back then it
         # might be because the auth token expired, so try to
         # re-authenticate and try again. If it still fails, bail.
         try:
-            resp, body = self._time_request(self.api_url + url, method,
+            resp, body = self._time_request(self._absolute_url(url), method,
                                             **kwargs)
+            self._session_used = timings.monotonic()
             return resp, body
         except exceptions.HTTPUnauthorized as ex:
             # print("_CS_REQUEST HTTPUnauthorized")
@@ -329,6 +1034,39 @@ class HTTPJSONRESTClient(object):
             resp, body = self._do_reauth(url, method, ex, **kwargs)
             return resp, body
 
+    def iter_members(self, url, fields=None, chunk_size=65536):
+        """
+        Make an HTTP GET request of a collection and yield its members.
+
+        The response is parsed while it is received, so only one member is
+        kept in memory at a time.
+
+        .. code-block:: python
+
+            for volume in http.iter_members('/volumes', fields=['name']):
+                print(volume['name'])
+
+        :param url: The relative url from the 3PAR api_url, or an absolute
+                    url
+        :type url: str
+        :param fields: The keys to keep in every member, or None for all
+        :type fields: list of str
+        :param chunk_size: The number of bytes read from the socket at once
+        :type chunk_size: int
+
+        :returns: generator of member dicts
+        """
+        resp, r = self._cs_request(url, 'GET', stream=True)
+        try:
+            for member in jsonstream.iter_members(
+                    r.iter_content(chunk_size), fields):
+                yield member
+        except requests.exceptions.RequestException as err:
+            raise exceptions.RequestException(
+                "Request Exception: %s" % err)
+        finally:
+            r.close()
+
     def get(self, url, **kwargs):
         """
         Make an HTTP GET request to the server.
@@ -342,7 +1080,8 @@ class HTTPJSONRESTClient(object):
                 print "Not logged in"
             }
 
-        :param url: The relative url from the 3PAR api_url
+        :param url: The relative url from the 3PAR api_url, or an absolute
+                    url
         :type url: str
 
         :returns: headers - dict of HTTP Response headers
@@ -366,7 +1105,8 @@ class HTTPJSONRESTClient(object):
                 print "Not logged in"
             }
 
-        :param url: The relative url from the 3PAR api_url
+        :param url: The relative url from the 3PAR api_url, or an absolute
+                    url
         :type url: str
 
         :returns: headers - dict of HTTP Response headers
@@ -389,7 +1129,8 @@ class HTTPJSONRESTClient(object):
                 print "Not logged in"
             }
 
-        :param url: The relative url from the 3PAR api_url
+        :param url: The relative url from the 3PAR api_url, or an absolute
+                    url
         :type url: str
 
         :returns: headers - dict of HTTP Response headers
@@ -411,7 +1152,8 @@ class HTTPJSONRESTClient(object):
                 print "Not logged in"
             }
 
-        :param url: The relative url from the 3PAR api_url
+        :param url: The relative url from the 3PAR api_url, or an absolute
+                    url
         :type url: str
 
         :returns: headers - dict of HTTP Response headers
@@ -419,3 +1161,13 @@ class HTTPJSONRESTClient(object):
                          will be an object
         """
         return self._cs_request(url, 'DELETE', **kwargs)
+
+
+class _Flight(object):
+    """A GET in flight, shared by the threads waiting for its result."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error = None
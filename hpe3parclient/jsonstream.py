@@ -0,0 +1,158 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI streaming JSON parser
+
+.. module: jsonstream
+
+:Description: Parses the ``members`` of a WSAPI collection response while
+ it is being received, so only one member is held in memory at a time
+ instead of the whole document.
+
+"""
+
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _Reader(object):
+    """Reads JSON values out of a stream of UTF-8 byte chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.decoder = json.JSONDecoder()
+        self.buf = u''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        # Drop what was parsed already so the buffer never holds more than
+        # the value being parsed and one chunk.
+        while not self.eof:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                self.eof = True
+                text = self.utf8.decode(b'', True)
+            else:
+                text = self.utf8.decode(chunk)
+            if text:
+                self.buf = self.buf[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def _skip_whitespace(self):
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return
+
+    def peek(self):
+        self._skip_whitespace()
+        if self.pos >= len(self.buf):
+            raise ValueError("Unexpected end of JSON data")
+        return self.buf[self.pos]
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError("Expecting one of '%s' at char %d, got '%s'" %
+                             (chars, self.pos, char))
+        self.pos += 1
+        return char
+
+    def value(self):
+        self._skip_whitespace()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                # Most likely the value goes on in the next chunk.
+                if self._fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may be cut short.
+            if end >= len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def project(member, fields):
+    """Keep only some of the keys of a member.
+
+    :param member: The member
+    :type member: dict
+    :param fields: The keys to keep, or None to keep them all
+    :type fields: list of str
+
+    :returns: dict
+    """
+    if fields is None:
+        return member
+    return dict((field, member[field]) for field in fields
+                if field in member)
+
+
+def iter_members(chunks, fields=None, key='members'):
+    """Yield the members of a JSON collection document one at a time.
+
+    Other top level keys, like ``total``, are skipped.
+
+    .. code-block:: python
+
+        for volume in iter_members(response.iter_content(65536),
+                                   fields=['name', 'sizeMiB']):
+            print(volume['name'])
+
+    :param chunks: The document as an iterable of UTF-8 encoded bytes
+    :type chunks: iterable
+    :param fields: The keys to keep in every member, or None for all keys.
+                   The other keys are dropped as soon as a member is parsed.
+    :type fields: list of str
+    :param key: The top level key of the members array
+    :type key: str
+
+    :raises: ValueError if the document is not valid JSON
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        if name == key:
+            break
+        reader.value()
+        if reader.expect(',}') == '}':
+            return
+
+    if reader.peek() != '[':
+        # ie. "members": null
+        reader.value()
+        return
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+    while True:
+        yield project(reader.value(), fields)
+        if reader.expect(',]') == ']':
+            return
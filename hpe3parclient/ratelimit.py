@@ -0,0 +1,405 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI rate limiting
+
+.. module: ratelimit
+
+:Description: Limits how fast and how many requests at a time are sent to
+ an array.
+
+ * :class:`TokenBucket` - caps the request rate
+ * :class:`AdaptiveConcurrencyLimiter` - caps the requests in flight, with
+   a limit that follows what the array sustains
+ * :class:`PriorityLimiter` - shares the requests in flight between
+   priority lanes
+
+"""
+
+import threading
+import time
+
+from hpe3parclient import timings
+
+INTERACTIVE = 'interactive'
+NORMAL = 'normal'
+BACKGROUND = 'background'
+#: The priority lanes, highest priority first
+LANES = (INTERACTIVE, NORMAL, BACKGROUND)
+
+
+def check_lane(lane):
+    """Make sure a priority lane exists.
+
+    :param lane: The lane name
+    :type lane: str
+
+    :raises: ValueError if there is no such lane
+    """
+    if lane not in LANES:
+        raise ValueError("Unknown priority lane '%s', expecting one of %s" %
+                         (lane, ', '.join(LANES)))
+
+
+class TokenBucket(object):
+    """
+    A thread safe token bucket.
+
+    The bucket fills up at ``rate`` tokens per second, up to ``burst``
+    tokens. Every request takes a token, and waits for one when the bucket
+    is empty. Share one bucket between everything that talks to the same
+    array to limit the rate of all of it.
+
+    :param rate: Tokens added per second
+    :type rate: float
+    :param burst: The most tokens the bucket holds. Default is ``rate``,
+                  and at least 1.
+    :type burst: float
+
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("The rate must be greater than 0")
+        if burst is None:
+            burst = max(1, rate)
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = self.burst
+        self._updated = timings.monotonic()
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.waited = 0.0
+
+    def _refill(self):
+        now = timings.monotonic()
+        self.tokens = min(self.burst,
+                          self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if the bucket has enough.
+
+        :param tokens: The number of tokens
+        :type tokens: float
+
+        :returns: True if the tokens were taken
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """Take tokens, waiting until the bucket has enough.
+
+        :param tokens: The number of tokens
+        :type tokens: float
+
+        :returns: The number of seconds waited
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    if waited:
+                        self.waits += 1
+                        self.waited += waited
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def stats(self):
+        """Get the state of the bucket.
+
+        :returns: dict with the rate, the burst, the tokens left, and how
+                  many acquires had to wait and for how long in total
+        """
+        with self._lock:
+            self._refill()
+            return {'rate': self.rate,
+                    'burst': self.burst,
+                    'tokens': self.tokens,
+                    'waits': self.waits,
+                    'waited': self.waited}
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Limits the requests in flight with an AIMD window.
+
+    A request waits in :meth:`acquire` while the window is full, and
+    reports its outcome to :meth:`release`. The window grows by about
+    ``increase`` every round trip while requests fill at least half of it
+    and succeed in less than ``latency_threshold``. It is multiplied by
+    ``decrease`` when a request is refused because the array is overloaded,
+    ie. HTTP 503, or times out. Only one decrease is made for all the
+    requests that were in flight at the same time, so a burst of 503s
+    halves the window once instead of collapsing it.
+
+    :param initial: The window to start with
+    :type initial: int
+    :param minimum: The smallest window
+    :type minimum: int
+    :param maximum: The largest window
+    :type maximum: int
+    :param increase: Requests added to the window per round trip
+    :type increase: float
+    :param decrease: Factor applied to the window on overload
+    :type decrease: float
+    :param latency_threshold: Seconds above which a request is too slow to
+                              grow the window. Default grows on any
+                              success.
+    :type latency_threshold: float
+
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=64, increase=1.0,
+                 decrease=0.5, latency_threshold=None):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Expecting 1 <= minimum <= initial <= maximum")
+        self.window = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_threshold = latency_threshold
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.increases = 0
+        self.decreases = 0
+        self._last_decrease = None
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """The number of requests allowed in flight."""
+        return int(self.window)
+
+    def acquire(self):
+        """Wait for room in the window.
+
+        :returns: The monotonic time the request was let through, to pass
+                  to :meth:`release`
+        """
+        with self._condition:
+            if self.in_flight >= self.limit:
+                self.queued += 1
+                self.max_queued = max(self.max_queued, self.queued)
+                try:
+                    while self.in_flight >= self.limit:
+                        self._condition.wait()
+                finally:
+                    self.queued -= 1
+            self.in_flight += 1
+            return timings.monotonic()
+
+    def try_acquire(self):
+        """Take room in the window if there is some, without waiting.
+
+        :returns: What :meth:`acquire` returns, or None when the window is
+                  full
+        """
+        with self._condition:
+            if self.queued or self.in_flight >= self.limit:
+                return None
+            self.in_flight += 1
+            return timings.monotonic()
+
+    def release(self, started, overloaded=False):
+        """Report the outcome of a request.
+
+        :param started: What :meth:`acquire` returned
+        :type started: float
+        :param overloaded: Was the request refused because the array is
+                           overloaded or did it time out?
+        :type overloaded: bool
+
+        """
+        now = timings.monotonic()
+        with self._condition:
+            # Only a window in use is known to be sustained by the array.
+            busy = self.queued > 0 or self.in_flight * 2 >= self.limit
+            self.in_flight -= 1
+            if overloaded:
+                if (self._last_decrease is None or
+                        started >= self._last_decrease):
+                    self.window = max(self.minimum,
+                                      self.window * self.decrease)
+                    self._last_decrease = now
+                    self.decreases += 1
+            elif busy and (self.latency_threshold is None or
+                           now - started <= self.latency_threshold):
+                if self.window < self.maximum:
+                    self.window = min(self.maximum,
+                                      self.window +
+                                      self.increase / self.window)
+                    self.increases += 1
+            self._condition.notify_all()
+
+    def stats(self):
+        """Get the state of the limiter.
+
+        :returns: dict with the window, the requests in flight and queued,
+                  the most requests ever queued, and the number of times
+                  the window grew and shrank
+        """
+        with self._condition:
+            return {'window': self.window,
+                    'limit': self.limit,
+                    'in_flight': self.in_flight,
+                    'queued': self.queued,
+                    'max_queued': self.max_queued,
+                    'increases': self.increases,
+                    'decreases': self.decreases}
+
+
+class PriorityLimiter(object):
+    """
+    Shares the requests in flight between priority lanes.
+
+    There are three lanes, ``interactive``, ``normal`` and ``background``.
+    Up to ``limit`` requests are in flight, but ``reserved`` of those slots
+    are kept for interactive requests, so a burst of polling never leaves
+    an attach waiting for a slot. When slots free up, waiting requests of a
+    higher lane always go first. ``background_limit`` further caps the
+    background requests in flight.
+
+    :param limit: The most requests in flight
+    :type limit: int
+    :param reserved: The slots only interactive requests can use. The other
+                     lanes always get at least one slot.
+    :type reserved: int
+    :param background_limit: The most background requests in flight.
+                             Default is no more than the normal lane.
+    :type background_limit: int
+    :param window: Takes the limit from the window of this limiter instead
+                   of ``limit``, so the lanes share whatever the array
+                   sustains
+    :type window: :class:`AdaptiveConcurrencyLimiter`
+
+    """
+
+    def __init__(self, limit=8, reserved=2, background_limit=None,
+                 window=None):
+        self.limit = limit
+        self.reserved = reserved
+        self.background_limit = background_limit
+        self.window = window
+        self.in_flight = dict((lane, 0) for lane in LANES)
+        self.queued = dict((lane, 0) for lane in LANES)
+        self.max_queued = dict((lane, 0) for lane in LANES)
+        self.sent = dict((lane, 0) for lane in LANES)
+        self._condition = threading.Condition()
+
+    def _capacity(self, lane):
+        if self.window is not None:
+            capacity = self.window.limit
+        else:
+            capacity = self.limit
+        if lane != INTERACTIVE:
+            capacity = max(1, capacity - self.reserved)
+        return capacity
+
+    def _other_lanes_in_flight(self):
+        return self.in_flight[NORMAL] + self.in_flight[BACKGROUND]
+
+    def _can_run(self, lane):
+        for higher in LANES[:LANES.index(lane)]:
+            if self.queued[higher]:
+                return False
+        if (lane == BACKGROUND and self.background_limit is not None and
+                self.in_flight[BACKGROUND] >= self.background_limit):
+            return False
+        if sum(self.in_flight.values()) >= self._capacity(INTERACTIVE):
+            return False
+        return (lane == INTERACTIVE or
+                self._other_lanes_in_flight() < self._capacity(lane))
+
+    def acquire(self, lane=NORMAL):
+        """Wait for a slot in a lane.
+
+        :param lane: The lane of the request
+        :type lane: str
+
+        :raises: ValueError if there is no such lane
+        """
+        check_lane(lane)
+        with self._condition:
+            if not self._can_run(lane):
+                self.queued[lane] += 1
+                self.max_queued[lane] = max(self.max_queued[lane],
+                                            self.queued[lane])
+                try:
+                    while not self._can_run(lane):
+                        self._condition.wait()
+                finally:
+                    self.queued[lane] -= 1
+                    # Lower lanes may have been waiting behind this one.
+                    self._condition.notify_all()
+            self.in_flight[lane] += 1
+            self.sent[lane] += 1
+
+    def try_acquire(self, lane=NORMAL):
+        """Take a slot in a lane if one is free, without waiting.
+
+        :param lane: The lane of the request
+        :type lane: str
+
+        :returns: True if the slot was taken
+        :raises: ValueError if there is no such lane
+        """
+        check_lane(lane)
+        with self._condition:
+            if self.queued[lane] or not self._can_run(lane):
+                return False
+            self.in_flight[lane] += 1
+            self.sent[lane] += 1
+            return True
+
+    def release(self, lane=NORMAL):
+        """Give back the slot of a finished request.
+
+        :param lane: The lane of the request
+        :type lane: str
+
+        """
+        with self._condition:
+            self.in_flight[lane] -= 1
+            self._condition.notify_all()
+
+    def stats(self):
+        """Get the state of every lane.
+
+        :returns: dict with the limit, the reserved slots, and per lane the
+                  requests in flight and queued, the most requests ever
+                  queued and the number of requests sent
+        """
+        with self._condition:
+            return {
+                'limit': self._capacity(INTERACTIVE),
+                'reserved': self.reserved,
+                'lanes': dict((lane, {'in_flight': self.in_flight[lane],
+                                      'queued': self.queued[lane],
+                                      'max_queued': self.max_queued[lane],
+                                      'sent': self.sent[lane]})
+                              for lane in LANES),
+            }
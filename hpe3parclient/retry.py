@@ -0,0 +1,180 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI retry policy
+
+.. module: retry
+
+:Description: This decides whether a failed WSAPI request is sent again and
+ how long to wait before doing so.
+
+"""
+
+import random
+import time
+
+import requests
+
+from hpe3parclient import exceptions
+
+
+class RetryPolicy(object):
+    """
+    Describes when and how a failed request is retried.
+
+    The policy itself holds no per request state, so a single instance can
+    be shared by every request and thread of a client.  Each request calls
+    :meth:`new_state` and gets its own retry budget.
+
+    :param tries: Maximum number of attempts for one request, including
+                  the first one
+    :type tries: int
+    :param backoff_base: Upper bound in seconds of the first backoff delay.
+                         The bound doubles after each attempt.
+    :type backoff_base: float
+    :param backoff_max: Upper bound in seconds of any single backoff delay
+    :type backoff_max: float
+    :param max_elapsed: Give up once retrying would take a request past
+                        this many seconds. Default has no limit.
+    :type max_elapsed: float
+    :param retry_exceptions: Exception classes that are retried
+    :type retry_exceptions: tuple
+    :param retry_error_codes: WSAPI error codes that are retried, whatever
+                              the HTTP status is
+    :type retry_error_codes: tuple
+    :param idempotent_methods: HTTP methods that are safe to send again
+                               after any retryable error
+    :type idempotent_methods: tuple
+    :param non_idempotent_retry_exceptions: Exception classes that prove
+                                            the array never acted on the
+                                            request, so even non idempotent
+                                            methods are retried
+    :type non_idempotent_retry_exceptions: tuple
+
+    """
+
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+    def __init__(self, tries=5, backoff_base=1, backoff_max=30,
+                 max_elapsed=None,
+                 retry_exceptions=(exceptions.HTTPServiceUnavailable,
+                                   requests.exceptions.ConnectionError),
+                 retry_error_codes=(),
+                 idempotent_methods=IDEMPOTENT_METHODS,
+                 non_idempotent_retry_exceptions=(
+                     exceptions.HTTPServiceUnavailable,
+                     requests.exceptions.ConnectTimeout)):
+        self.tries = tries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_elapsed = max_elapsed
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.retry_error_codes = tuple(retry_error_codes)
+        self.idempotent_methods = tuple(m.upper() for m in idempotent_methods)
+        self.non_idempotent_retry_exceptions = tuple(
+            non_idempotent_retry_exceptions)
+
+    @property
+    def catch_exceptions(self):
+        """The exception classes :meth:`matches` needs to look at."""
+        if self.retry_error_codes:
+            return self.retry_exceptions + (exceptions.ClientException,)
+        return self.retry_exceptions
+
+    def matches(self, ex):
+        """Is this error one that the policy knows how to retry?
+
+        :param ex: The exception raised by the request
+        :type ex: Exception
+
+        :returns: bool
+        """
+        if isinstance(ex, self.retry_exceptions):
+            return True
+        if (self.retry_error_codes and
+                isinstance(ex, exceptions.ClientException)):
+            return ex.get_code() in self.retry_error_codes
+        return False
+
+    def allows(self, method, ex):
+        """Is it safe to send this request again after the error?
+
+        :param method: The HTTP method of the request
+        :type method: str
+        :param ex: The exception raised by the request
+        :type ex: Exception
+
+        :returns: bool
+        """
+        if method.upper() in self.idempotent_methods:
+            return True
+        return isinstance(ex, self.non_idempotent_retry_exceptions)
+
+    def get_delay(self, attempt):
+        """Exponential backoff with full jitter.
+
+        :param attempt: The number of retries done so far
+        :type attempt: int
+
+        :returns: The number of seconds to sleep before the next attempt
+        """
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def new_state(self, method):
+        """Start a fresh retry budget for one request.
+
+        :param method: The HTTP method of the request
+        :type method: str
+
+        :returns: :class:`RetryState`
+        """
+        return RetryState(self, method)
+
+
+class RetryState(object):
+    """The retry budget of a single request."""
+
+    def __init__(self, policy, method):
+        self.policy = policy
+        self.method = method
+        self.tries = policy.tries
+        self.retries = 0
+        self.delay = 0
+        self.start_time = time.time()
+
+    def retry(self, ex):
+        """Record a failed attempt and decide whether to try again.
+
+        On success :attr:`delay` holds the time to sleep before the next
+        attempt.
+
+        :param ex: The exception raised by the failed attempt
+        :type ex: Exception
+
+        :returns: True if the request should be sent again
+        """
+        self.tries -= 1
+        if self.tries <= 0 or not self.policy.allows(self.method, ex):
+            return False
+
+        self.delay = self.policy.get_delay(self.retries)
+        if self.policy.max_elapsed is not None:
+            elapsed = time.time() - self.start_time
+            if elapsed + self.delay > self.policy.max_elapsed:
+                return False
+
+        self.retries += 1
+        return True
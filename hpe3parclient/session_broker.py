@@ -0,0 +1,232 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI session broker
+
+.. module: session_broker
+
+:Description: Shares WSAPI sessions between the processes of a host, so
+ that many workers talking to the same array use a few sessions instead of
+ one each.
+
+.. code-block:: python
+
+    broker = session_broker.FileSessionBroker('/var/lib/cinder/3par.json')
+    cl = client.HPE3ParClient(api_url, session_broker=broker)
+    cl.login(username, password)
+
+"""
+
+import binascii
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import stat
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows.
+    fcntl = None
+
+
+class FileSessionBroker(object):
+    """
+    Keeps WSAPI session keys in a file shared by all processes of a host.
+
+    Sessions are kept per array and credentials, at most ``max_sessions``
+    of each. They are handed out in turn; a new session is only created
+    while there are fewer than ``max_sessions``. The file is locked with
+    ``flock`` while it is read and written. While a session is created, a
+    lock file kept for each array and credentials is locked instead, so
+    processes that start together log in once without waiting on the
+    logins to other arrays.
+
+    A session key that the array refused is replaced by the first process
+    to report it. The processes that report it after that get the new key
+    without logging in again.
+
+    The file only holds session keys and an HMAC of the credentials, keyed
+    with a random secret kept in ``<path>.key``. The files are created
+    readable by their owner only, all processes sharing them must run as
+    the same user. A file that is a symbolic link, is owned by another user
+    or can be read by others is refused.
+
+    :param path: The session file. Default is a file in
+                 ``$XDG_RUNTIME_DIR``, or else in the home directory.
+    :type path: str
+    :param max_sessions: The number of sessions per array and credentials.
+                         Default is 1.
+    :type max_sessions: int
+
+    """
+
+    def __init__(self, path=None, max_sessions=1):
+        if fcntl is None:
+            raise NotImplementedError(
+                "FileSessionBroker needs fcntl, which is not available on "
+                "this platform")
+        if path is None:
+            path = self._default_path()
+        self.path = path
+        self.max_sessions = max_sessions
+        self.logins = 0
+        self.borrowed = 0
+        self.refreshed = 0
+        self._key = None
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def _default_path():
+        # Not the shared temporary directory, where another user could
+        # create the file first.
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+        if runtime_dir:
+            return os.path.join(runtime_dir, 'hpe3parclient-sessions.json')
+        return os.path.join(os.path.expanduser('~'),
+                            '.hpe3parclient-sessions.json')
+
+    def _open(self, path):
+        fd = os.open(path,
+                     os.O_RDWR | os.O_CREAT | getattr(os, 'O_NOFOLLOW', 0),
+                     0o600)
+        try:
+            st = os.fstat(fd)
+            if (not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid() or
+                    stat.S_IMODE(st.st_mode) != 0o600):
+                raise IOError(
+                    "The session file %s must be a regular file owned by "
+                    "this user with mode 0600" % path)
+        except Exception:
+            os.close(fd)
+            raise
+        return os.fdopen(fd, 'r+')
+
+    @contextlib.contextmanager
+    def _locked(self, path):
+        with self._open(path) as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _secret(self):
+        if self._key is None:
+            # Kept apart from the session file, so that a copy of that
+            # file alone is no help to guess the passwords.
+            with self._locked(self.path + '.key') as f:
+                secret = f.read().strip()
+                if not secret:
+                    secret = binascii.hexlify(os.urandom(32)).decode('ascii')
+                    f.write(secret)
+                    f.flush()
+            self._key = secret.encode('ascii')
+        return self._key
+
+    def _digest(self, api_url, credentials):
+        data = json.dumps([api_url, credentials], sort_keys=True)
+        return hmac.new(self._secret(), data.encode('utf-8'),
+                        hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def _load(f):
+        try:
+            return json.load(f)
+        except ValueError:
+            # A new, empty, file.
+            return {}
+
+    @staticmethod
+    def _save(f, sessions):
+        f.seek(0)
+        f.truncate()
+        json.dump(sessions, f)
+        f.flush()
+
+    def borrow(self, api_url, credentials, login, failed_key=None):
+        """Get a session key for an array.
+
+        :param api_url: The url of the WSAPI service
+        :type api_url: str
+        :param credentials: The body of the login request, sessions are
+                            only shared by clients with the same one
+        :type credentials: dict
+        :param login: Creates a session and returns its key, called only
+                      when no session can be shared
+        :type login: callable
+        :param failed_key: The session key the array just refused
+        :type failed_key: str
+
+        :returns: The session key, or None when ``login`` returned none
+        """
+        digest = self._digest(api_url, credentials)
+        # Only the clients of the same array and credentials wait for one
+        # another to log in.
+        with self._locked('%s.%s.lock' % (self.path, digest[:16])):
+            with self._locked(self.path) as f:
+                sessions = self._load(f)
+                entry = sessions.get(digest, {'keys': [], 'next': 0})
+                keys = entry['keys']
+                refresh = failed_key is not None and failed_key in keys
+                if not refresh:
+                    index = entry['next'] % self.max_sessions
+                    if index < len(keys):
+                        entry['next'] = index + 1
+                        sessions[digest] = entry
+                        self._save(f, sessions)
+                        self._count(borrowed=1)
+                        return keys[index]
+
+            key = login()
+            if key is None:
+                # Nothing to share, the file is left as it was.
+                return None
+
+            with self._locked(self.path) as f:
+                # Read again, the other arrays may have changed it.
+                sessions = self._load(f)
+                entry = sessions.setdefault(digest, {'keys': [], 'next': 0})
+                keys = entry['keys']
+                if refresh and failed_key in keys:
+                    keys[keys.index(failed_key)] = key
+                    self._count(logins=1, refreshed=1)
+                else:
+                    keys.append(key)
+                    entry['next'] = len(keys)
+                    self._count(logins=1)
+                self._count(borrowed=1)
+                self._save(f, sessions)
+        return key
+
+    def _count(self, logins=0, borrowed=0, refreshed=0):
+        with self._stats_lock:
+            self.logins += logins
+            self.borrowed += borrowed
+            self.refreshed += refreshed
+
+    def stats(self):
+        """Get the counters of this process.
+
+        :returns: dict with the number of sessions borrowed, of logins and
+                  of refused sessions that were replaced
+        """
+        with self._stats_lock:
+            return {'borrowed': self.borrowed,
+                    'logins': self.logins,
+                    'refreshed': self.refreshed}
@@ -23,14 +23,21 @@ HPE 3PAR SSH Client
 
 """
 
+import codecs
+import collections
+import itertools
 import logging
 import os
 import paramiko
 from random import randint
 import re
+import socket
+import threading
 
 from eventlet import greenthread
 from hpe3parclient import exceptions
+from hpe3parclient import ssh_pool
+from hpe3parclient import tracing
 
 # Python 3+ override
 try:
@@ -50,7 +57,30 @@ tpd_commands = [
 
 
 class HPE3PARSSHClient(object):
-    """This class is used to execute SSH commands on a 3PAR."""
+    """This class is used to execute SSH commands on a 3PAR.
+
+    :param trace_hooks: Called when every command run starts and ends
+    :type trace_hooks: list of :class:`~hpe3parclient.tracing.TraceHook`
+    :param pool_size: Keep up to this many connections open, so commands
+                      run from several threads run at once. Default uses
+                      one connection.
+    :type pool_size: int
+    :param pool_max_idle: Seconds a pooled connection stays open unused
+    :type pool_max_idle: float
+    :param pool_max_lifetime: Seconds a pooled connection is used before
+                              being replaced
+    :type pool_max_lifetime: float
+    :param persistent_shell: Keep a CLI shell open on the connection and
+                             run the commands of :meth:`run` in it, rather
+                             than opening a new shell for every command.
+                             Without a pool, the threads take turns on the
+                             one shell.
+    :type persistent_shell: bool
+    :param shell_timeout: Seconds the persistent shell waits for the CLI
+                          to answer. Default waits as long as it takes.
+    :type shell_timeout: float
+
+    """
 
     log_debug = False
     _logger = logging.getLogger(__name__)
@@ -58,17 +88,35 @@ class HPE3PARSSHClient(object):
 
     def __init__(self, ip, login, password,
                  port=22, conn_timeout=None, privatekey=None,
-                 **kwargs):
+                 trace_hooks=None, pool_size=None, pool_max_idle=300,
+                 pool_max_lifetime=3600, persistent_shell=False,
+                 shell_timeout=None, **kwargs):
         self.san_ip = ip
         self.san_ssh_port = port
         self.ssh_conn_timeout = conn_timeout
         self.san_login = login
         self.san_password = password
         self.san_privatekey = privatekey
+        if trace_hooks is None:
+            trace_hooks = []
+        self.trace_hooks = trace_hooks
+        self._ssh_kwargs = kwargs
+        self.persistent_shell = persistent_shell
+        self.shell_timeout = shell_timeout
+        self.shell = None
+        self._shell_lock = threading.Lock()
 
         self._create_ssh(**kwargs)
+        self.pool = None
+        if pool_size:
+            self.pool = ssh_pool.SSHConnectionPool(
+                self._new_connection, size=pool_size,
+                max_idle=pool_max_idle, max_lifetime=pool_max_lifetime)
 
     def _create_ssh(self, **kwargs):
+        self.ssh = self._new_ssh(**kwargs)
+
+    def _new_ssh(self, **kwargs):
         try:
             ssh = paramiko.SSHClient()
 
@@ -103,7 +151,7 @@ class HPE3PARSSHClient(object):
 
             ssh.set_missing_host_key_policy(missing_key_policy)
 
-            self.ssh = ssh
+            return ssh
         except Exception as e:
             msg = "Error connecting via ssh: %s" % e
             self._logger.error(msg)
@@ -128,14 +176,28 @@ class HPE3PARSSHClient(object):
             msg = "Specify a password or private_key"
             raise exceptions.SSHException(msg)
 
+    def _new_connection(self):
+        ssh = self._new_ssh(**self._ssh_kwargs)
+        try:
+            self._connect(ssh)
+        except Exception as e:
+            msg = "Error connecting via ssh: %s" % e
+            self._logger.error(msg)
+            raise paramiko.SSHException(msg)
+        return ssh
+
     def open(self):
         """Opens a new SSH connection if the transport layer is missing.
 
         This can be called if an active SSH connection is open already.
+        With a pool, the connections are opened when needed instead, and a
+        pool that was closed is opened again.
 
         """
+        if self.pool is not None:
+            self.pool.open()
         # Create a new SSH connection if the transport layer is missing.
-        if self.ssh:
+        elif self.ssh:
             transport_active = False
             if self.ssh.get_transport():
                 transport_active = self.ssh.get_transport().is_active()
@@ -148,9 +210,25 @@ class HPE3PARSSHClient(object):
                     raise paramiko.SSHException(msg)
 
     def close(self):
+        if self.shell is not None:
+            self.shell.close()
+            self.shell = None
+        if self.pool is not None:
+            self.pool.close()
         if self.ssh:
             self.ssh.close()
 
+    def get_pool_stats(self):
+        """Get the state of the connection pool.
+
+        :returns: dict, see
+                  :meth:`~hpe3parclient.ssh_pool.SSHConnectionPool.stats`,
+                  or None without a pool
+        """
+        if self.pool is None:
+            return None
+        return self.pool.stats()
+
     def set_debug_flag(self, flag):
         """
         This turns on ssh debugging output to console
@@ -259,7 +337,29 @@ class HPE3PARSSHClient(object):
         """Runs a CLI command over SSH, without doing any result parsing."""
         self._logger.debug("SSH CMD = %s " % cmd)
 
-        (stdout, stderr) = self._run_ssh(cmd, False)
+        event = None
+        if self.trace_hooks:
+            # Only the command name, the arguments may be secrets.
+            event = tracing.start(self.trace_hooks, tracing.SSH, 'SSH',
+                                  cmd[0] if cmd else '')
+        try:
+            if self.persistent_shell:
+                out = self._run_shell(cmd)
+                size = sum(len(line) + 2 for line in out)
+            else:
+                (stdout, stderr) = self._run_ssh(cmd, False)
+                size = len(stdout)
+        except Exception as ex:
+            if event is not None:
+                tracing.end(self.trace_hooks, event, error=ex)
+            raise
+        if event is not None:
+            event.bytes = size
+            tracing.end(self.trace_hooks, event)
+        if self.persistent_shell:
+            # The shell already framed the output of the command.
+            self._logger.debug("OUT = %s" % self.sanitize_cert(out))
+            return out
         # we have to strip out the input and exit lines
         if python3:
             tmp = stdout.decode().split("\r\n")
@@ -275,18 +375,281 @@ class HPE3PARSSHClient(object):
             self._logger.debug("OUT = %s" % out)
         return out
 
+    @staticmethod
+    def strip_input_from_stream(cmd, lines):
+        """Strip the input commands from output lines, as they come.
+
+        The streaming version of :meth:`strip_input_from_output`. The lines
+        are yielded once the command echo is found, but for the last 2
+        which are never yielded.
+
+        :param cmd: The command
+        :type cmd: list of str
+        :param lines: The output lines
+        :type lines: iterator of str
+
+        :returns: iterator of str
+        """
+        lines = iter(lines)
+        skipped = []
+        for line in lines:
+            skipped.append(line)
+            if line == 'exit':
+                break
+        else:
+            reason = "Did not find 'exit' in output."
+            HPE3PARSSHClient.raise_stripper_error(reason, skipped)
+
+        line = next(lines, None)
+        if line is None:
+            reason = "Did not find any output after 'exit'."
+            HPE3PARSSHClient.raise_stripper_error(reason, [])
+        prompt_pct = line.find('% setclienv csvtable 1')
+        if prompt_pct < 0:
+            reason = "Did not find '% setclienv csvtable 1' in output."
+            HPE3PARSSHClient.raise_stripper_error(reason, [line])
+        prompt = line[0:prompt_pct + 1]
+
+        command_string = ' '.join(cmd)
+        if re.match('|'.join(tpd_commands), command_string):
+            escp_command_string = command_string.replace('"', '\\"')
+            command_string = "Tpd::rtpd " + '"' + escp_command_string + '"'
+        seek = ' '.join((prompt, command_string))
+        found = ''
+        skipped = []
+        for line in lines:
+            skipped.append(line)
+            found = ''.join((found, line.rstrip('\r\n')))
+            if found == seek:
+                break
+        else:
+            HPE3PARSSHClient._logger.debug("Command: %s" % command_string)
+            reason = "Did not find match for command in output"
+            HPE3PARSSHClient.raise_stripper_error(reason, skipped)
+
+        # Always strip the last 2
+        for line in _drop_last(lines, 2):
+            yield line
+
+    def run_stream(self, cmd, multi_line_stripper=False):
+        """Runs a CLI command over SSH, and yields the output lines as
+        they come.
+
+        The output is the same as the one of :meth:`run`, but it is not
+        kept in memory all at once and can be parsed while the command
+        runs. A command that fails before its first output line is tried
+        again like with :meth:`run`, after that the error is raised.
+
+        With the persistent shell or a connection pool, the output is read
+        whole before the first line is yielded, so that the shell or the
+        connection is free again whether all the lines are read or not.
+
+        .. code-block:: python
+
+            HPE3ParClient.convert_cli_output_to_wsapi_format(
+                ssh.run_stream(['showpatch', '-hist']))
+
+        :param cmd: The command
+        :type cmd: list of str
+        :param multi_line_stripper: See :meth:`run`
+        :type multi_line_stripper: bool
+
+        :returns: iterator of str
+        """
+        self._logger.debug("SSH CMD = %s " % cmd)
+        self.check_ssh_injection(cmd)
+        command = self._tpd_command(' '.join(cmd))
+
+        event = None
+        if self.trace_hooks:
+            event = tracing.start(self.trace_hooks, tracing.SSH, 'SSH',
+                                  cmd[0] if cmd else '')
+        size = 0
+        try:
+            for line in self._stream_attempts(cmd, command,
+                                              multi_line_stripper):
+                size += len(line) + 2
+                yield line
+        except Exception as ex:
+            if event is not None:
+                event.bytes = size
+                tracing.end(self.trace_hooks, event, error=ex)
+            raise
+        if event is not None:
+            event.bytes = size
+            tracing.end(self.trace_hooks, event)
+
+    def _stream_attempts(self, cmd, command, multi_line_stripper,
+                         attempts=2):
+        total_attempts = attempts
+        while attempts > 0:
+            attempts -= 1
+            started = False
+            try:
+                if self.pool is not None:
+                    # Read whole, the connection goes back to the pool
+                    # whatever the caller does with the lines.
+                    with self.pool.connection() as connection:
+                        lines = list(self._stream_on(connection, cmd,
+                                                     command,
+                                                     multi_line_stripper))
+                else:
+                    self.open()
+                    lines = self._stream_on(self, cmd, command,
+                                            multi_line_stripper)
+                for line in lines:
+                    started = True
+                    yield line
+                return
+            except Exception as e:
+                if started:
+                    # The lines handed out cannot be taken back.
+                    raise
+                self._logger.error(e)
+                if attempts > 0:
+                    greenthread.sleep(randint(20, 500) / 100.0)
+                # The pool replaces the connections that are down.
+                if self.pool is None:
+                    transport = self.ssh.get_transport()
+                    if transport is None or not transport.is_alive():
+                        self._create_ssh(**self._ssh_kwargs)
+
+        msg = ("SSH Command failed after '%(total_attempts)r' "
+               "attempts : '%(command)s'" %
+               {'total_attempts': total_attempts, 'command': command})
+        self._logger.error(msg)
+        raise exceptions.SSHException(message=msg)
+
+    def _stream_on(self, owner, cmd, command, multi_line_stripper):
+        if self.persistent_shell:
+            return self._shell_execute_on(owner, command)
+        lines = iter_lines(self._stream_execute(owner.ssh, command))
+        if multi_line_stripper:
+            return self.strip_input_from_stream(cmd, lines)
+        return _drop_last(itertools.islice(lines, 5, None), 2)
+
+    def _stream_execute(self, ssh, cmd):
+        self._logger.debug('Running cmd (SSH stream): %s', cmd)
+        channel = ssh.invoke_shell()
+        try:
+            channel.sendall('setclienv csvtable 1\n%s\nexit\n' % cmd)
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            data = channel.recv(HPE3PARCLIShell.RECV_SIZE)
+            while data:
+                yield decoder.decode(data)
+                data = channel.recv(HPE3PARCLIShell.RECV_SIZE)
+            yield decoder.decode(b'', True)
+        finally:
+            channel.close()
+
+    def run_batch(self, cmds):
+        """Runs many CLI commands in one shell session.
+
+        The commands run in order, whether the ones before failed or not.
+        A command is only sent once the CLI prompt shows after the one
+        before it. A command that does not pass the injection check is not
+        run. A command that asks for a confirmation is not answered, it
+        gets an error and the commands after it run in a new shell.
+
+        :param cmds: The commands, each a list like for :meth:`run`
+        :type cmds: list of list
+
+        :returns: list of :class:`CommandResult`, in the order of the
+                  commands
+        """
+        results = [CommandResult(cmd) for cmd in cmds]
+        to_run = []
+        for result in results:
+            try:
+                self.check_ssh_injection(result.cmd)
+            except exceptions.SSHInjectionThreat as ex:
+                result.error = ex
+            else:
+                to_run.append(result)
+        if not to_run:
+            return results
+        commands = [self._tpd_command(' '.join(result.cmd))
+                    for result in to_run]
+        self._logger.debug("SSH batch = %s " % commands)
+
+        event = None
+        if self.trace_hooks:
+            event = tracing.start(self.trace_hooks, tracing.SSH, 'SSH',
+                                  'batch')
+        try:
+            if self.persistent_shell:
+                self._run_batch_shell(to_run, commands)
+            else:
+                self._run_batch_once(to_run, commands)
+        except Exception as ex:
+            self._logger.error("Error running ssh batch: %s" % ex)
+            for result in to_run:
+                result.error = ex
+        if event is not None:
+            event.bytes = sum(len(line) + 2 for result in to_run
+                              for line in result.output or [])
+            errors = [result.error for result in to_run if result.error]
+            tracing.end(self.trace_hooks, event,
+                        error=errors[0] if errors else None)
+        return results
+
+    def _run_batch_once(self, to_run, commands):
+        # A shell of its own, closed when the batch is done.
+        if self.pool is not None:
+            with self.pool.connection() as connection:
+                return self._run_batch_in(connection.ssh, to_run, commands)
+        self.open()
+        return self._run_batch_in(self.ssh, to_run, commands)
+
+    def _run_batch_in(self, ssh, to_run, commands):
+        shell = None
+        try:
+            for result, command in zip(to_run, commands):
+                if shell is None:
+                    shell = HPE3PARCLIShell(ssh, self.shell_timeout)
+                try:
+                    result.output = shell.execute(command)
+                except Exception as ex:
+                    result.error = ex
+                    # The state of the shell is unknown, the next command
+                    # must not be taken as an answer.
+                    shell.close()
+                    shell = None
+        finally:
+            if shell is not None:
+                shell.close()
+
+    def _run_batch_shell(self, to_run, commands):
+        if self.pool is not None:
+            with self.pool.connection() as connection:
+                return self._run_batch_on(connection, to_run, commands)
+        self.open()
+        return self._run_batch_on(self, to_run, commands)
+
+    def _run_batch_on(self, owner, to_run, commands):
+        for result, command in zip(to_run, commands):
+            try:
+                result.output = self._shell_execute_on(owner, command)
+            except Exception as ex:
+                result.error = ex
+
     def _ssh_execute(self, cmd, check_exit_code=True):
         """We have to do this in order to get CSV output from the CLI command.
 
         We first have to issue a command to tell the CLI that we want the
         output to be formatted in CSV, then we issue the real command.
         """
-        if re.match('|'.join(tpd_commands), cmd):
-            cmd = 'Tpd::rtpd "' + cmd.replace('"', '\\"') + '"'
-
+        cmd = self._tpd_command(cmd)
         self._logger.debug('Running cmd (SSH): %s', cmd)
 
-        channel = self.ssh.invoke_shell()
+        if self.pool is not None:
+            with self.pool.connection() as connection:
+                return self._shell_execute(connection.ssh, cmd,
+                                           check_exit_code)
+        return self._shell_execute(self.ssh, cmd, check_exit_code)
+
+    def _shell_execute(self, ssh, cmd, check_exit_code):
+        channel = ssh.invoke_shell()
         stdin_stream = channel.makefile('wb')
         stdout_stream = channel.makefile('rb')
         stderr_stream = channel.makefile('rb')
@@ -322,6 +685,63 @@ exit
         channel.close()
         return (stdout, stderr)
 
+    @staticmethod
+    def _tpd_command(cmd):
+        if re.match('|'.join(tpd_commands), cmd):
+            cmd = 'Tpd::rtpd "' + cmd.replace('"', '\\"') + '"'
+        return cmd
+
+    def _shell_execute_on(self, owner, cmd):
+        # The owner is this client or a pooled connection, both keep their
+        # SSH client in 'ssh' and its persistent shell in 'shell'. A pooled
+        # connection is used by one thread at a time, the shell of this
+        # client is shared by all of them. The output is read whole, so
+        # the shell is never left to a caller that stops reading.
+        if owner is not self:
+            return self._shell_output(owner, cmd)
+        with self._shell_lock:
+            return self._shell_output(self, cmd)
+
+    def _shell_output(self, owner, cmd):
+        shell = owner.shell
+        if shell is None or shell.ssh is not owner.ssh or not shell.is_open():
+            if shell is not None:
+                shell.close()
+            shell = owner.shell = HPE3PARCLIShell(owner.ssh,
+                                                  self.shell_timeout)
+        try:
+            return shell.execute(cmd)
+        except Exception:
+            # The state of the shell is unknown, start a new one next time.
+            shell.close()
+            owner.shell = None
+            raise
+
+    def _run_shell(self, cmd_list, attempts=2):
+        self.check_ssh_injection(cmd_list)
+        command = self._tpd_command(' '.join(cmd_list))
+        self._logger.debug('Running cmd (SSH shell): %s', command)
+
+        total_attempts = attempts
+        while attempts > 0:
+            attempts -= 1
+            try:
+                if self.pool is not None:
+                    with self.pool.connection() as connection:
+                        return self._shell_execute_on(connection, command)
+                self.open()
+                return self._shell_execute_on(self, command)
+            except Exception as e:
+                self._logger.error(e)
+                if attempts > 0:
+                    greenthread.sleep(randint(20, 500) / 100.0)
+
+        msg = ("SSH Command failed after '%(total_attempts)r' "
+               "attempts : '%(command)s'" %
+               {'total_attempts': total_attempts, 'command': command})
+        self._logger.error(msg)
+        raise exceptions.SSHException(message=msg)
+
     def _run_ssh(self, cmd_list, check_exit=True, attempts=2):
         self.check_ssh_injection(cmd_list)
         command = ' '. join(cmd_list)
@@ -337,7 +757,9 @@ exit
                     self._logger.error(e)
                     if attempts > 0:
                         greenthread.sleep(randint(20, 500) / 100.0)
-                    if not self.ssh.get_transport().is_alive():
+                    # The pool replaces the connections that are down.
+                    if (self.pool is None and
+                            not self.ssh.get_transport().is_alive()):
                         self._create_ssh()
 
             msg = ("SSH Command failed after '%(total_attempts)r' "
@@ -384,3 +806,187 @@ exit
                 if not result == -1:
                     if result == 0 or not arg[result - 1] == '\\':
                         raise exceptions.SSHInjectionThreat(command=cmd_list)
+
+
+def iter_lines(chunks):
+    """Split text into lines as it comes.
+
+    Like ``''.join(chunks).split('\\r\\n')``, the text after the last line
+    break is the last line, even if empty.
+
+    :param chunks: The text
+    :type chunks: iterator of str
+
+    :returns: iterator of str
+    """
+    pending = ''
+    for chunk in chunks:
+        lines = (pending + chunk).split('\r\n')
+        pending = lines.pop()
+        for line in lines:
+            yield line
+    yield pending
+
+
+def _drop_last(lines, count):
+    # Yields the lines but for the last count ones.
+    kept = collections.deque()
+    for line in lines:
+        kept.append(line)
+        if len(kept) > count:
+            yield kept.popleft()
+
+
+class CommandResult(object):
+    """
+    The outcome of a command of :meth:`HPE3PARSSHClient.run_batch`.
+
+    :ivar cmd: The command
+    :ivar output: The output lines of the command, None if it failed
+    :ivar error: The exception, None if the command ran. The CLI errors
+                 are in the output, like with :meth:`HPE3PARSSHClient.run`.
+
+    """
+
+    def __init__(self, cmd, output=None, error=None):
+        self.cmd = cmd
+        self.output = output
+        self.error = error
+
+    @property
+    def ok(self):
+        """True if the command ran."""
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return "CommandResult(%r, output=%r)" % (self.cmd, self.output)
+        return "CommandResult(%r, error=%r)" % (self.cmd, self.error)
+
+
+class HPE3PARCLIShell(object):
+    """A CLI shell kept open to run many commands.
+
+    The CSV table output is set once when the shell opens. Every command is
+    then written to the shell, and its output is read until the CLI prompt
+    shows again, so a command does not pay for a new channel and CLI
+    environment.
+
+    A shell runs one command at a time.
+
+    :param ssh: The connected client
+    :type ssh: paramiko.SSHClient
+    :param timeout: Seconds to wait for the CLI to answer. Default waits as
+                    long as it takes.
+    :type timeout: float
+
+    """
+
+    RECV_SIZE = 65536
+    SETCLIENV = 'setclienv csvtable 1'
+    # The end of the questions of the commands run without -f.
+    QUESTION = re.compile(r'(select q=quit y=yes n=no|\(y(es)?/n(o)?\)\??):?'
+                          r'\s*$')
+
+    def __init__(self, ssh, timeout=None):
+        self.ssh = ssh
+        self.timeout = timeout
+        self.channel = None
+        self.prompt = None
+        self._decoder = None
+
+    def is_open(self):
+        return self.channel is not None and not self.channel.closed
+
+    def _recv(self):
+        try:
+            data = self.channel.recv(self.RECV_SIZE)
+        except socket.timeout:
+            raise exceptions.SSHException(
+                "The CLI did not answer in %s seconds" % self.timeout)
+        if not data:
+            raise exceptions.SSHException("The CLI shell closed")
+        return self._decoder.decode(data)
+
+    def open(self):
+        """Open the shell and find out the CLI prompt."""
+        self.channel = self.ssh.invoke_shell()
+        self.channel.settimeout(self.timeout)
+        self._decoder = codecs.getincrementaldecoder('utf-8')(
+            errors='replace')
+        self.channel.sendall('%s\n' % self.SETCLIENV)
+
+        # The CLI echoes the command after its prompt, ie.
+        # 'cli% setclienv csvtable 1', then shows the prompt again.
+        pattern = re.compile(r'(?m)^([^\r\n]*%%) %s\r\n' % self.SETCLIENV)
+        output = ''
+        match = None
+        while match is None:
+            output += self._recv()
+            match = pattern.search(output)
+        self.prompt = match.group(1) + ' '
+        output = output[match.end():]
+        while not output.endswith(self.prompt):
+            output += self._recv()
+
+    def execute(self, cmd):
+        """Run a command.
+
+        :param cmd: The command line
+        :type cmd: str
+
+        :returns: list of the output lines, without the command echo and
+                  the prompt
+        """
+        return list(self.iter_lines(cmd))
+
+    def iter_lines(self, cmd):
+        """Run a command, and yield its output lines as they come.
+
+        The shell must not be used for another command before all the
+        lines are read. A command that asks for a confirmation raises
+        SSHException, the shell must then be closed.
+
+        :param cmd: The command line
+        :type cmd: str
+
+        :returns: iterator of the output lines, without the command echo
+                  and the prompt
+        """
+        if self.channel is None:
+            self.open()
+        self.channel.sendall('%s\n' % cmd)
+
+        # The command echo might be broken into multiple lines.
+        seek = self.prompt + cmd
+        found = ''
+        echoed = False
+        # The line being received, the output ends when it is the prompt.
+        pending = self.prompt
+        while not (echoed and pending == self.prompt):
+            lines = (pending + self._recv()).split('\r\n')
+            pending = lines.pop()
+            for line in lines:
+                if echoed:
+                    yield line
+                    continue
+                found = ''.join((found, line.rstrip('\r\n')))
+                if found == seek:
+                    echoed = True
+                elif not seek.startswith(found):
+                    HPE3PARSSHClient._logger.debug("Command: %s" % cmd)
+                    reason = "Did not find match for command in output"
+                    HPE3PARSSHClient.raise_stripper_error(reason, [found])
+            if echoed and self.QUESTION.search(pending):
+                raise exceptions.SSHException(
+                    "The command asks for a confirmation: %s" %
+                    pending.strip())
+
+    def close(self):
+        if self.channel is not None:
+            try:
+                self.channel.close()
+            except Exception as ex:
+                HPE3PARSSHClient._logger.debug(
+                    "Error closing the CLI shell: %s", ex)
+            self.channel = None
@@ -0,0 +1,304 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR SSH connection pool
+
+.. module: ssh_pool
+
+:Description: Keeps several authenticated SSH connections to an array
+ open, so CLI commands run in parallel and do not pay the key exchange and
+ the login every time.
+
+.. code-block:: python
+
+    cl.setSSHOptions(ip, login, password, pool_size=4)
+
+"""
+
+import contextlib
+import logging
+import threading
+
+from hpe3parclient import exceptions
+from hpe3parclient import timings
+
+LOG = logging.getLogger(__name__)
+
+
+class PooledSSHConnection(object):
+    """
+    An SSH connection of a pool.
+
+    :param ssh: The connected client
+    :type ssh: paramiko.SSHClient
+
+    The persistent CLI shell opened on the connection, if any, is kept in
+    ``shell`` and closed with it.
+
+    """
+
+    def __init__(self, ssh, generation=0):
+        self.ssh = ssh
+        self.generation = generation
+        self.shell = None
+        self.created = timings.monotonic()
+        self.last_used = self.created
+        self.uses = 0
+
+    def is_healthy(self):
+        """Is the transport of the connection still up?
+
+        :returns: bool
+        """
+        try:
+            transport = self.ssh.get_transport()
+            if transport is None or not transport.is_active():
+                return False
+            # Fails at once when the peer is gone, without a round trip.
+            transport.send_ignore()
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        try:
+            if self.shell is not None:
+                self.shell.close()
+            self.ssh.close()
+        except Exception as ex:
+            LOG.debug("Error closing a pooled SSH connection: %s", ex)
+
+
+class SSHConnectionPool(object):
+    """
+    A thread safe pool of SSH connections to one array.
+
+    :meth:`checkout` hands out an idle connection, or opens a new one while
+    there are fewer than ``size``, or else waits for one to be checked in.
+    An idle connection is checked before it is handed out and replaced when
+    its transport is down. Connections idle for more than ``max_idle``
+    seconds, or open for more than ``max_lifetime`` seconds, are closed.
+
+    :param connect: Opens a new authenticated connection
+    :type connect: callable returning a paramiko.SSHClient
+    :param size: The most connections open at once
+    :type size: int
+    :param max_idle: Seconds a connection stays open unused. None keeps it.
+    :type max_idle: float
+    :param max_lifetime: Seconds a connection is used before being replaced.
+                         None keeps it.
+    :type max_lifetime: float
+
+    """
+
+    def __init__(self, connect, size=4, max_idle=300, max_lifetime=3600):
+        if size < 1:
+            raise ValueError("The pool size must be at least 1")
+        self.connect = connect
+        self.size = size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        # Most recently used last, the others are left to go idle.
+        self._idle = []
+        self._open = 0
+        self._closed = False
+        # Connections of an earlier generation were open when the pool was
+        # closed, they are not kept once checked in.
+        self._generation = 0
+        self._condition = threading.Condition()
+        self.created = 0
+        self.evicted = 0
+        self.waits = 0
+
+    def _expired(self, connection, now):
+        if (self.max_lifetime is not None and
+                now - connection.created >= self.max_lifetime):
+            return True
+        return (self.max_idle is not None and
+                now - connection.last_used >= self.max_idle)
+
+    def _evict(self, now):
+        # Called with the lock held, returns the connections to close.
+        expired = [connection for connection in self._idle
+                   if self._expired(connection, now)]
+        for connection in expired:
+            self._idle.remove(connection)
+        self._open -= len(expired)
+        self.evicted += len(expired)
+        if expired:
+            self._condition.notify_all()
+        return expired
+
+    def evict_idle(self):
+        """Close the idle connections that expired."""
+        with self._condition:
+            expired = self._evict(timings.monotonic())
+        for connection in expired:
+            connection.close()
+
+    def checkout(self, timeout=None):
+        """Get a connection, to give back with :meth:`checkin`.
+
+        :param timeout: Seconds to wait for a connection. Default waits as
+                        long as it takes.
+        :type timeout: float
+
+        :returns: :class:`PooledSSHConnection`
+        :raises: :class:`~hpe3parclient.exceptions.SSHException` when no
+                 connection is free in time
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = timings.monotonic() + timeout
+        while True:
+            to_close = []
+            connection = None
+            with self._condition:
+                if self._closed:
+                    raise exceptions.SSHException("The SSH pool is closed")
+                to_close = self._evict(timings.monotonic())
+                if self._idle:
+                    connection = self._idle.pop()
+                elif self._open < self.size:
+                    # Keep the slot while connecting without the lock.
+                    self._open += 1
+                else:
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - timings.monotonic()
+                        if remaining <= 0:
+                            raise exceptions.SSHException(
+                                "No SSH connection free after %s seconds" %
+                                timeout)
+                    self.waits += 1
+                    self._condition.wait(remaining)
+                    continue
+            for expired in to_close:
+                expired.close()
+
+            if connection is None:
+                try:
+                    connection = PooledSSHConnection(self.connect(),
+                                                     self._generation)
+                except Exception:
+                    with self._condition:
+                        self._open -= 1
+                        self._condition.notify_all()
+                    raise
+                with self._condition:
+                    self.created += 1
+            elif not connection.is_healthy():
+                LOG.info("Replacing a pooled SSH connection that is down")
+                self._discard(connection)
+                continue
+            connection.uses += 1
+            return connection
+
+    def _discard(self, connection):
+        with self._condition:
+            self._open -= 1
+            self.evicted += 1
+            self._condition.notify_all()
+        connection.close()
+
+    def checkin(self, connection, broken=False):
+        """Give back a connection.
+
+        :param connection: What :meth:`checkout` returned
+        :type connection: :class:`PooledSSHConnection`
+        :param broken: Close the connection rather than reusing it
+        :type broken: bool
+
+        """
+        now = timings.monotonic()
+        connection.last_used = now
+        with self._condition:
+            keep = not (broken or self._closed or
+                        connection.generation != self._generation or
+                        self._expired(connection, now))
+            if keep:
+                self._idle.append(connection)
+                self._condition.notify_all()
+        if not keep:
+            self._discard(connection)
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        """Check out a connection for a with block.
+
+        A connection whose transport went down in the block is closed
+        rather than checked in.
+
+        .. code-block:: python
+
+            with pool.connection() as connection:
+                channel = connection.ssh.invoke_shell()
+
+        :param timeout: See :meth:`checkout`
+        :type timeout: float
+
+        """
+        connection = self.checkout(timeout)
+        try:
+            yield connection
+        except Exception:
+            self.checkin(connection, broken=not connection.is_healthy())
+            raise
+        except BaseException:
+            # ie. a generator using the connection was closed early.
+            self.checkin(connection)
+            raise
+        self.checkin(connection)
+
+    def open(self):
+        """Hand out connections again after :meth:`close`.
+
+        The connections that were in use when the pool was closed are still
+        closed once checked in.
+
+        """
+        with self._condition:
+            self._closed = False
+
+    def close(self):
+        """Close the idle connections, and the others once checked in.
+
+        :meth:`checkout` fails until the pool is opened again.
+
+        """
+        with self._condition:
+            self._closed = True
+            self._generation += 1
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for connection in idle:
+            connection.close()
+
+    def stats(self):
+        """Get the state of the pool.
+
+        :returns: dict with the size, the connections open, idle and in
+                  use, and the number of connections created and evicted
+                  and of checkouts that had to wait
+        """
+        with self._condition:
+            return {'size': self.size,
+                    'open': self._open,
+                    'idle': len(self._idle),
+                    'in_use': self._open - len(self._idle),
+                    'created': self.created,
+                    'evicted': self.evicted,
+                    'waits': self.waits}
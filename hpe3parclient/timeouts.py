@@ -0,0 +1,171 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI adaptive timeouts
+
+.. module: timeouts
+
+:Description: Gives every kind of request a timeout of its own, derived
+ from how long the same requests took so far. ``GET /ports`` is given up on
+ after seconds while ``PUT /volumes/<id> 3``, a grow, is left minutes to
+ finish.
+
+"""
+
+import threading
+
+from hpe3parclient import timings
+
+
+def endpoint_key(method, url, action=None):
+    """The kind of a request, ie. ``POST /volumes/<id> createSnapshot``.
+
+    The ``action`` of the body is part of it, because the requests sent to
+    one url template take very different times depending on the action.
+
+    :param method: The HTTP method of the request
+    :type method: str
+    :param url: The url of the request
+    :type url: str
+    :param action: The action of the body of the request, if any
+    :type action: str or int
+
+    :returns: str
+    """
+    key = "%s %s" % (method, timings.url_template(url))
+    if action is not None:
+        key = "%s %s" % (key, action)
+    return key
+
+
+class AdaptiveTimeouts(object):
+    """
+    Timeouts per kind of request.
+
+    The kind of a request is its method, url template and body action, ie.
+    ``POST /volumes/<id> createSnapshot``. The timeout is ``multiplier``
+    times the ``percentile`` time of a single attempt of the same kind,
+    kept between ``floor`` and ``ceiling``. Kinds with fewer than
+    ``min_samples`` attempts timed get ``ceiling``, as do the
+    :attr:`LONG_REQUESTS`. ``overrides`` sets a fixed timeout for some
+    kinds.
+
+    .. code-block:: python
+
+        timeouts = timeouts.AdaptiveTimeouts(
+            floor=2, ceiling=300,
+            overrides={'POST /volumes/<id> createSnapshot': 60})
+        cl = client.HPE3ParClient(api_url, adaptive_timeouts=timeouts)
+
+    :param percentile: The latency percentile the timeout is based on
+    :type percentile: float
+    :param multiplier: The timeout as a multiple of the percentile
+    :type multiplier: float
+    :param floor: The shortest timeout, in seconds
+    :type floor: float
+    :param ceiling: The longest timeout, in seconds
+    :type ceiling: float
+    :param min_samples: Attempts of a kind timed before its timeout adapts
+    :type min_samples: int
+    :param overrides: Timeouts in seconds by "METHOD /template [action]"
+    :type overrides: dict
+
+    """
+
+    #: Requests that take as long as the data to copy: a physical copy,
+    #: its resync, and the promote of a virtual copy
+    LONG_REQUESTS = ('POST /volumes/<id> createPhysicalCopy',
+                     'PUT /volumes/<id> 2',
+                     'PUT /volumes/<id> 4')
+
+    def __init__(self, percentile=99, multiplier=3.0, floor=5.0,
+                 ceiling=600.0, min_samples=20, overrides=None):
+        if floor > ceiling:
+            raise ValueError("The floor must not be above the ceiling")
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.overrides = dict(overrides or {})
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, url, duration, action=None, error=False):
+        """Add the time of a single attempt of a request.
+
+        :param method: The HTTP method of the request
+        :type method: str
+        :param url: The url of the request
+        :type url: str
+        :param duration: Seconds until the response, or the error
+        :type duration: float
+        :param action: The action of the body of the request, if any
+        :type action: str or int
+        :param error: Did the attempt fail?
+        :type error: bool
+
+        """
+        key = endpoint_key(method, url, action)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = timings.LatencyHistogram()
+            histogram.record(duration, error)
+
+    def get(self, method, url, action=None, ceiling=None):
+        """Get the timeout of a request.
+
+        :param method: The HTTP method of the request
+        :type method: str
+        :param url: The url of the request
+        :type url: str
+        :param action: The action of the body of the request, if any
+        :type action: str or int
+        :param ceiling: The longest timeout, in place of the ``ceiling`` of
+                        this object, ie. the static timeout of the client
+        :type ceiling: float
+
+        :returns: The timeout in seconds
+        """
+        return self._get(endpoint_key(method, url, action), ceiling)
+
+    def _get(self, key, ceiling=None):
+        if key in self.overrides:
+            return self.overrides[key]
+        if ceiling is None:
+            ceiling = self.ceiling
+        if key in self.LONG_REQUESTS:
+            return ceiling
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None or histogram.count < self.min_samples:
+                return ceiling
+            latency = histogram.percentile(self.percentile)
+        return min(ceiling, max(self.floor, latency * self.multiplier))
+
+    def snapshot(self, ceiling=None):
+        """Get the current timeout of every kind of request timed.
+
+        :param ceiling: See :meth:`get`
+        :type ceiling: float
+
+        :returns: dict of timeouts in seconds by "METHOD /template [action]"
+        """
+        with self._lock:
+            keys = list(self.histograms)
+        result = dict((key, self._get(key, ceiling)) for key in keys)
+        result.update(self.overrides)
+        return result
@@ -0,0 +1,273 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR WSAPI request timings
+
+.. module: timings
+
+:Description: Keeps the most recent request timings in a fixed size ring
+ buffer and a latency histogram per endpoint, so the memory used does not
+ grow with the number of requests sent.
+
+"""
+
+import bisect
+import collections
+import threading
+import time
+
+try:
+    # For Python 3.0 and later
+    from urllib.parse import urlparse
+except ImportError:
+    # Fall back to Python 2's urllib2
+    from urlparse import urlparse
+
+try:
+    monotonic = time.monotonic
+except AttributeError:
+    # Python 2 has no monotonic clock in the standard library.
+    monotonic = time.time
+
+API_PREFIX = '/api/v1'
+
+
+def url_template(url):
+    """Turn a WSAPI url into the endpoint it belongs to.
+
+    The query string is dropped and every object name or id in the path is
+    replaced by a placeholder, so that all requests to the same kind of
+    object share one endpoint.
+
+    .. code-block:: python
+
+        url_template('https://3par:8080/api/v1/volumes/vol1?query=x')
+        # '/volumes/<id>'
+
+    :param url: The absolute or api_url relative url of the request
+    :type url: str
+
+    :returns: str
+    """
+    path = urlparse(url).path.rstrip('/')
+    if not path.startswith(API_PREFIX):
+        return path or '/'
+    # Collections and objects alternate: /volumes/<id>/objectKeyValues/<id>
+    parts = path[len(API_PREFIX):].split('/')[1:]
+    for i in range(1, len(parts), 2):
+        parts[i] = '<id>'
+    return '/' + '/'.join(parts)
+
+
+def _bucket_bounds(low=0.0005, high=600.0, per_doubling=4):
+    bounds = []
+    bound = low
+    factor = 2 ** (1.0 / per_doubling)
+    while bound < high:
+        bounds.append(bound)
+        bound *= factor
+    bounds.append(high)
+    return bounds
+
+
+class LatencyHistogram(object):
+    """
+    A streaming latency histogram with log sized buckets.
+
+    Recording a sample is a binary search and a counter increment, and the
+    memory used is fixed whatever the number of samples. Percentiles are
+    accurate to about 20% of the measured value.
+
+    """
+
+    BOUNDS = _bucket_bounds()
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, duration, error=False):
+        """Add one request to the histogram.
+
+        :param duration: The request time in seconds
+        :type duration: float
+        :param error: Did the request fail?
+        :type error: bool
+
+        """
+        self.buckets[bisect.bisect_left(self.BOUNDS, duration)] += 1
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total += duration
+        if self.min is None or duration < self.min:
+            self.min = duration
+        if self.max is None or duration > self.max:
+            self.max = duration
+
+    def percentile(self, percent):
+        """Get an estimate of a latency percentile.
+
+        :param percent: The percentile wanted, ie. 95
+        :type percent: float
+
+        :returns: The latency in seconds, or None when nothing was recorded
+        """
+        if not self.count:
+            return None
+        rank = percent / 100.0 * self.count
+        seen = 0
+        for i, hits in enumerate(self.buckets):
+            seen += hits
+            if hits and seen >= rank:
+                if i < len(self.BOUNDS):
+                    value = self.BOUNDS[i]
+                else:
+                    value = self.max
+                return max(self.min, min(value, self.max))
+        return self.max
+
+    def to_dict(self):
+        """The summary of the histogram.
+
+        :returns: dict
+        """
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+class RequestTimings(object):
+    """
+    The timings of the requests sent by a client.
+
+    The last ``maxlen`` requests are kept as ``("METHOD url", start, end)``
+    tuples, older ones are dropped. Every request is also added to the
+    :class:`LatencyHistogram` of its endpoint. Times come from a monotonic
+    clock, so only the difference between them is meaningful.
+
+    :param maxlen: The number of recent requests kept
+    :type maxlen: int
+
+    """
+
+    def __init__(self, maxlen=1000):
+        self.recent = collections.deque(maxlen=maxlen)
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, method, url, start, end, error=False):
+        """Add a finished request.
+
+        :param method: The HTTP method of the request
+        :type method: str
+        :param url: The url of the request
+        :type url: str
+        :param start: The monotonic time the request was sent
+        :type start: float
+        :param end: The monotonic time the request finished
+        :type end: float
+        :param error: Did the request fail?
+        :type error: bool
+
+        """
+        endpoint = "%s %s" % (method, url_template(url))
+        with self._lock:
+            self.recent.append(("%s %s" % (method, url), start, end))
+            histogram = self.histograms.get(endpoint)
+            if histogram is None:
+                histogram = self.histograms[endpoint] = LatencyHistogram()
+            histogram.record(end - start, error)
+
+    def percentile(self, method, url, percent, min_count=1):
+        """Get a latency percentile of the endpoint of a request.
+
+        :param method: The HTTP method of the request
+        :type method: str
+        :param url: The url of the request
+        :type url: str
+        :param percent: The percentile wanted, ie. 95
+        :type percent: float
+        :param min_count: The fewest requests recorded for the estimate to
+                          be trusted
+        :type min_count: int
+
+        :returns: The latency in seconds, or None when fewer than
+                  ``min_count`` requests were recorded
+        """
+        endpoint = "%s %s" % (method, url_template(url))
+        with self._lock:
+            histogram = self.histograms.get(endpoint)
+            if histogram is None or histogram.count < min_count:
+                return None
+            return histogram.percentile(percent)
+
+    def get_recent(self):
+        """The most recent requests, oldest first.
+
+        :returns: list of ("METHOD url", start, end) tuples
+        """
+        with self._lock:
+            return list(self.recent)
+
+    def snapshot(self, reset=False):
+        """Get the latency summary of every endpoint.
+
+        .. code-block:: python
+
+            {'GET /volumes/<id>': {'count': 12, 'errors': 1,
+                                   'mean': 0.031, 'min': 0.012,
+                                   'max': 0.201, 'p50': 0.022,
+                                   'p95': 0.19, 'p99': 0.201}}
+
+        :param reset: Start new histograms once the snapshot is taken
+        :type reset: bool
+
+        :returns: dict
+        """
+        with self._lock:
+            histograms = self.histograms
+            if reset:
+                self.histograms = {}
+            else:
+                histograms = dict(
+                    (endpoint, self._copy(histogram))
+                    for endpoint, histogram in histograms.items())
+        return dict((endpoint, histogram.to_dict())
+                    for endpoint, histogram in histograms.items())
+
+    @staticmethod
+    def _copy(histogram):
+        copy = LatencyHistogram()
+        copy.__dict__.update(histogram.__dict__)
+        copy.buckets = list(histogram.buckets)
+        return copy
+
+    def reset(self):
+        """Drop the recent requests and all histograms."""
+        with self._lock:
+            self.recent.clear()
+            self.histograms = {}
@@ -0,0 +1,283 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+"""
+HPE 3PAR call tracing
+
+.. module: tracing
+
+:Description: Hooks called when a WSAPI request or an SSH command starts
+ and ends, to find out where the time of a driver operation goes.
+
+ * :class:`TraceHook` - the interface of a hook
+ * :class:`TraceAggregator` - sums the calls up in process
+ * :class:`OpenTelemetryHook` - turns every call into an OpenTelemetry span
+
+.. code-block:: python
+
+    aggregator = tracing.TraceAggregator()
+    cl = client.HPE3ParClient(api_url, trace_hooks=[aggregator])
+    ...
+    aggregator.snapshot()
+
+The hooks run in the thread making the call. When a client has no hook, a
+call costs one extra list check.
+
+"""
+
+import logging
+import threading
+
+from hpe3parclient import timings
+
+try:
+    # For Python 3.0 and later
+    from urllib.parse import urlparse
+except ImportError:
+    # Fall back to Python 2's urllib2
+    from urlparse import urlparse
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+LOG = logging.getLogger(__name__)
+
+HTTP = 'http'
+SSH = 'ssh'
+
+
+class CallEvent(object):
+    """
+    One WSAPI request or SSH command.
+
+    The same event is handed to the hooks when the call starts and when it
+    ends. The fields known at the end are None until then.
+
+    * ``kind`` - ``http`` or ``ssh``
+    * ``method`` - the HTTP method, or ``SSH``
+    * ``template`` - the url template, ie. ``/volumes/<id>``, or the CLI
+      command, ie. ``showport``
+    * ``url`` - the url of the request, None for SSH. It may hold a
+      session key, ie. ``/credentials/<key>``, do not export it.
+    * ``status`` - the HTTP status of the last response, if any
+    * ``bytes`` - the size of the response body, or of the CLI output
+    * ``retries`` - the number of times the request was sent again
+    * ``start`` - the monotonic time the call started
+    * ``duration`` - the call time in seconds
+    * ``error`` - the exception the call raised, if any
+    * ``context`` - a dict where hooks keep their own state of the call
+
+    """
+
+    __slots__ = ('kind', 'method', 'template', 'url', 'status', 'bytes',
+                 'retries', 'start', 'duration', 'error', 'context')
+
+    def __init__(self, kind, method, template, url=None):
+        self.kind = kind
+        self.method = method
+        self.template = template
+        self.url = url
+        self.status = None
+        self.bytes = None
+        self.retries = 0
+        self.start = timings.monotonic()
+        self.duration = None
+        self.error = None
+        self.context = {}
+
+    @property
+    def name(self):
+        """The name of the call, ie. 'GET /volumes/<id>'."""
+        return "%s %s" % (self.method, self.template)
+
+
+class TraceHook(object):
+    """
+    The interface of a trace hook.
+
+    An exception raised by a hook is logged and does not fail the call.
+
+    """
+
+    def on_start(self, event):
+        """A call starts.
+
+        :param event: The call
+        :type event: :class:`CallEvent`
+
+        """
+
+    def on_end(self, event):
+        """A call ended, successfully or not.
+
+        :param event: The call
+        :type event: :class:`CallEvent`
+
+        """
+
+
+def _notify(hooks, name, event):
+    for hook in hooks:
+        try:
+            getattr(hook, name)(event)
+        except Exception:
+            LOG.exception("Trace hook %r failed", hook)
+
+
+def start(hooks, kind, method, template, url=None):
+    """Tell the hooks that a call starts.
+
+    :param hooks: The trace hooks
+    :type hooks: list of :class:`TraceHook`
+    :param kind: ``http`` or ``ssh``
+    :type kind: str
+    :param method: The HTTP method, or ``SSH``
+    :type method: str
+    :param template: The url template or the CLI command
+    :type template: str
+    :param url: The url of the request
+    :type url: str
+
+    :returns: :class:`CallEvent`, to pass to :func:`end`
+    """
+    event = CallEvent(kind, method, template, url)
+    _notify(hooks, 'on_start', event)
+    return event
+
+
+def end(hooks, event, error=None):
+    """Tell the hooks that a call ended.
+
+    :param hooks: The trace hooks
+    :type hooks: list of :class:`TraceHook`
+    :param event: What :func:`start` returned
+    :type event: :class:`CallEvent`
+    :param error: The exception the call raised, if any
+    :type error: Exception
+
+    """
+    event.duration = timings.monotonic() - event.start
+    event.error = error
+    _notify(hooks, 'on_end', event)
+
+
+class TraceAggregator(TraceHook):
+    """
+    Sums the calls up per method and template, ie. ``GET /volumes/<id>``
+    or ``SSH showport``.
+
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def on_end(self, event):
+        with self._lock:
+            calls = self._calls.get(event.name)
+            if calls is None:
+                calls = self._calls[event.name] = {
+                    'histogram': timings.LatencyHistogram(),
+                    'bytes': 0,
+                    'retries': 0,
+                    'statuses': {}}
+            calls['histogram'].record(event.duration, event.error is not None)
+            calls['bytes'] += event.bytes or 0
+            calls['retries'] += event.retries or 0
+            if event.status is not None:
+                calls['statuses'][event.status] = (
+                    calls['statuses'].get(event.status, 0) + 1)
+
+    def snapshot(self, reset=False):
+        """Get the summary of the calls.
+
+        .. code-block:: python
+
+            {'GET /volumes/<id>': {'count': 12, 'errors': 1, 'mean': 0.031,
+                                   'min': 0.012, 'max': 0.201,
+                                   'p50': 0.022, 'p95': 0.19,
+                                   'p99': 0.201, 'bytes': 20480,
+                                   'retries': 1,
+                                   'statuses': {200: 11, 404: 1}}}
+
+        :param reset: Start over once the snapshot is taken
+        :type reset: bool
+
+        :returns: dict
+        """
+        with self._lock:
+            result = {}
+            for name, calls in self._calls.items():
+                summary = calls['histogram'].to_dict()
+                summary['bytes'] = calls['bytes']
+                summary['retries'] = calls['retries']
+                summary['statuses'] = dict(calls['statuses'])
+                result[name] = summary
+            if reset:
+                self._calls = {}
+        return result
+
+
+class OpenTelemetryHook(TraceHook):
+    """
+    Turns every call into a client span of an OpenTelemetry tracer.
+
+    The span is named after the call, ie. ``GET /volumes/<id>``, and is a
+    child of the span current when the call starts. Like the arguments of
+    the CLI commands, the url is not exported, it may hold a session key:
+    only its host and template are. Needs the ``opentelemetry-api``
+    package unless a tracer is given.
+
+    :param tracer: The tracer. Default is the tracer of this module from
+                   the global tracer provider.
+    :type tracer: opentelemetry.trace.Tracer
+
+    """
+
+    def __init__(self, tracer=None):
+        if tracer is None:
+            if otel_trace is None:
+                raise ImportError("The opentelemetry-api package is not "
+                                  "installed")
+            tracer = otel_trace.get_tracer(__name__)
+        self.tracer = tracer
+
+    def on_start(self, event):
+        attributes = {'hpe3par.kind': event.kind,
+                      'hpe3par.template': event.template}
+        if event.kind == HTTP:
+            attributes['http.method'] = event.method
+            attributes['http.host'] = urlparse(event.url or '').netloc
+        kwargs = {'attributes': attributes}
+        if otel_trace is not None:
+            kwargs['kind'] = otel_trace.SpanKind.CLIENT
+        event.context[self] = self.tracer.start_span(event.name, **kwargs)
+
+    def on_end(self, event):
+        span = event.context.pop(self, None)
+        if span is None:
+            return
+        if event.status is not None:
+            span.set_attribute('http.status_code', event.status)
+        if event.bytes is not None:
+            span.set_attribute('hpe3par.bytes', event.bytes)
+        span.set_attribute('hpe3par.retries', event.retries)
+        if event.error is not None:
+            span.record_exception(event.error)
+            if otel_trace is not None:
+                span.set_status(otel_trace.Status(
+                    otel_trace.StatusCode.ERROR, str(event.error)))
+        span.end()
@@ -19,6 +19,8 @@ setup(
   keywords=["hpe", "3par", "rest"],
   requires=['paramiko', 'eventlet', 'requests'],
   install_requires=['paramiko', 'eventlet', 'requests'],
+  extras_require={'async': ['aiohttp', 'asyncssh'], 'orjson': ['orjson'],
+                  'opentelemetry': ['opentelemetry-api']},
   tests_require=["pytest", "pytest-runner", "pytest-testconfig",
                  "flask", "werkzeug", "requests", "pytest-cov"],
   license="Apache License, Version 2.0",
@@ -0,0 +1,205 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the asyncio 3PAR Client."""
+
+import asyncio
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import exceptions
+
+try:
+    from hpe3parclient import async_client
+    from hpe3parclient import async_http
+    import aiohttp  # noqa
+except ImportError:
+    async_client = None
+
+CPG_NAME1 = 'CPG1_ASYNC_TEST' + hpe3parbase.TIME
+VOLUME_NAME1 = 'VOLUME1_ASYNC_TEST' + hpe3parbase.TIME
+VOLUME_NAME2 = 'VOLUME2_ASYNC_TEST' + hpe3parbase.TIME
+VOLUME_SET_NAME1 = 'VOLUME_SET1_ASYNC_TEST' + hpe3parbase.TIME
+SIZE = 512
+
+
+@unittest.skipIf(async_client is None, "aiohttp is not installed")
+class HPE3ParAsyncClientTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParAsyncClientTestCase, self).setUp()
+        if self.unitTest:
+            url = self.flask_url
+        else:
+            url = self.url_3par
+        self.acl = async_client.AsyncHPE3ParClient(url)
+        self.loop = asyncio.new_event_loop()
+        self._await(self.acl.login(self.user, self.password))
+
+    def tearDown(self):
+        for coro in (self.acl.deleteVolumeSet(VOLUME_SET_NAME1),
+                     self.acl.deleteVolume(VOLUME_NAME1),
+                     self.acl.deleteVolume(VOLUME_NAME2),
+                     self.acl.deleteCPG(CPG_NAME1)):
+            try:
+                self._await(coro)
+            except Exception:
+                pass
+        self._await(self.acl.logout())
+        self._await(self.acl.close())
+        self.loop.close()
+        super(HPE3ParAsyncClientTestCase, self).tearDown()
+
+    def _await(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_1_get_ws_api_version(self):
+        self.printHeader('get_ws_api_version')
+
+        version = self._await(self.acl.getWsApiVersion())
+        self.assertIn('build', version)
+        # The version lives outside of the api url, which is left alone.
+        self.assertEqual(self.acl.http.api_url, self.acl.api_url.rstrip('/'))
+
+        self.printFooter('get_ws_api_version')
+
+    def test_2_volumes_concurrently(self):
+        self.printHeader('volumes_concurrently')
+
+        self._await(self.acl.createCPG(CPG_NAME1, self.CPG_OPTIONS))
+
+        async def create_and_get():
+            await asyncio.gather(
+                self.acl.createVolume(VOLUME_NAME1, CPG_NAME1, SIZE),
+                self.acl.createVolume(VOLUME_NAME2, CPG_NAME1, SIZE))
+            return await asyncio.gather(self.acl.getVolume(VOLUME_NAME1),
+                                        self.acl.getVolume(VOLUME_NAME2))
+
+        vol1, vol2 = self._await(create_and_get())
+        self.assertEqual(vol1['name'], VOLUME_NAME1)
+        self.assertEqual(vol2['name'], VOLUME_NAME2)
+
+        # The synchronous client sees the same volumes.
+        self.assertEqual(self.cl.getVolume(VOLUME_NAME1)['name'],
+                         VOLUME_NAME1)
+
+        self._await(self.acl.createVolumeSet(VOLUME_SET_NAME1,
+                                             setmembers=[VOLUME_NAME1]))
+        self._await(self.acl.addVolumeToVolumeSet(VOLUME_SET_NAME1,
+                                                  VOLUME_NAME2))
+        vvset = self._await(self.acl.getVolumeSet(VOLUME_SET_NAME1))
+        self.assertIn(VOLUME_NAME2, vvset['setmembers'])
+
+        self.printFooter('volumes_concurrently')
+
+    def test_3_exceptions(self):
+        self.printHeader('exceptions')
+
+        self.assertRaises(exceptions.HTTPNotFound, self._await,
+                          self.acl.getVolume('NOT_A_VOLUME'))
+        self.assertRaises(exceptions.HTTPNotFound, self._await,
+                          self.acl.getCPG('NOT_A_CPG'))
+        self.assertRaises(exceptions.HTTPNotFound, self._await,
+                          self.acl.getHost('NOT_A_HOST'))
+        self.assertRaises(exceptions.HTTPBadRequest, self._await,
+                          self.acl.getTask('not_an_int'))
+
+        self.printFooter('exceptions')
+
+
+@unittest.skipIf(async_client is None, "aiohttp is not installed")
+class AsyncHTTPJSONRESTClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.http = async_http.AsyncHTTPJSONRESTClient(
+            'http://localhost:5001/api/v1')
+        self.http.user = 'user'
+        self.http.password = 'pass'
+        self.http._auth_optional = None
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_reauth_single_flight(self):
+        logins = []
+
+        async def authenticate(user, password, optional=None):
+            logins.append(user)
+            await asyncio.sleep(0)
+            self.http.session_key = 'new'
+
+        async def request(url, method, **kwargs):
+            session_key = self.http.session_key
+            await asyncio.sleep(0)
+            if session_key == 'expired':
+                raise exceptions.HTTPUnauthorized()
+            return {}, {'key': session_key}
+
+        self.http.authenticate = authenticate
+        self.http.request = request
+        self.http.session_key = 'expired'
+
+        async def get_all():
+            return await asyncio.gather(*[self.http.get('/cpgs')
+                                          for i in range(5)])
+
+        results = self.loop.run_until_complete(get_all())
+
+        # Every request failed with the expired key, but only one of them
+        # logged in again and all of them were sent with the new key.
+        self.assertEqual(len(logins), 1)
+        self.assertEqual([body['key'] for resp, body in results],
+                         ['new'] * 5)
+
+    def test_reauth_with_real_authenticate(self):
+        logins = []
+        sent = []
+
+        async def request(url, method, **kwargs):
+            session_key = kwargs.get('session_key', self.http.session_key)
+            sent.append(session_key)
+            if url.endswith('/credentials'):
+                logins.append(kwargs['body']['user'])
+                # Let the other requests fail with the old key meanwhile.
+                await asyncio.sleep(0.01)
+                return {}, {'key': 'new'}
+            await asyncio.sleep(0)
+            if session_key != 'new':
+                raise exceptions.HTTPUnauthorized()
+            return {}, {'key': session_key}
+
+        self.http.request = request
+        self.http.session_key = 'expired'
+
+        async def get_all():
+            return await asyncio.gather(*[self.http.get('/cpgs')
+                                          for i in range(20)])
+
+        results = self.loop.run_until_complete(get_all())
+        self.assertEqual(logins, ['user'])
+        self.assertEqual([body['key'] for resp, body in results],
+                         ['new'] * 20)
+        # The login request itself is sent without a session key.
+        self.assertIn(None, sent)
+
+    def test_failed_login_not_retried(self):
+        async def request(url, method, **kwargs):
+            raise exceptions.HTTPForbidden()
+
+        self.http.request = request
+        self.assertRaises(exceptions.HTTPForbidden,
+                          self.loop.run_until_complete,
+                          self.http.authenticate('user', 'bad'))
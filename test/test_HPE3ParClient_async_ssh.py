@@ -0,0 +1,246 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the asyncio 3PAR SSH Client."""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+
+from hpe3parclient import exceptions
+
+try:
+    from hpe3parclient import async_client
+    from hpe3parclient import async_ssh
+    import aiohttp  # noqa
+except ImportError:
+    async_client = None
+
+OUTPUT = '\r\n'.join([
+    'setclienv csvtable 1',
+    'showpatch -hist',
+    'exit',
+    'array1 cli% setclienv csvtable 1',
+    'array1 cli% showpatch -hist',
+    'InstallTime,Id,Package,Version',
+    '2013-08-21 18:06:45 PDT,MU2,Complete,3.1.2.422',
+    'array1 cli% exit',
+    '']).encode('utf-8')
+
+
+class FakeConnection(object):
+
+    running = 0
+    most = 0
+
+    def __init__(self, output=OUTPUT, exit_status=0):
+        self.output = output
+        self.exit_status = exit_status
+        self.inputs = []
+        self.closed = False
+
+    async def run(self, **kwargs):
+        self.inputs.append(kwargs)
+        FakeConnection.running += 1
+        FakeConnection.most = max(FakeConnection.most,
+                                  FakeConnection.running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            FakeConnection.running -= 1
+        return mock.Mock(stdout=self.output, stderr=b'',
+                         exit_status=self.exit_status)
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+@unittest.skipIf(async_client is None, "aiohttp is not installed")
+class AsyncSSHClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.connections = []
+
+        async def connect(host, **kwargs):
+            connection = FakeConnection()
+            connection.host = host
+            connection.options = kwargs
+            self.connections.append(connection)
+            return connection
+        self.asyncssh = mock.Mock()
+        self.asyncssh.connect.side_effect = connect
+        patcher = mock.patch('hpe3parclient.async_ssh.asyncssh',
+                             self.asyncssh)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        FakeConnection.most = 0
+
+        # A home without known hosts.
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        patcher = mock.patch.dict(os.environ, {'HOME': self.tmpdir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.known_hosts = os.path.join(self.tmpdir, 'known_hosts')
+        with open(self.known_hosts, 'w') as f:
+            f.write('10.0.0.1 ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAA\n')
+
+        def match_known_hosts(path, host, addr, port):
+            with open(path) as f:
+                keys = [line.split()[2] for line in f
+                        if line.split()[0] == host]
+            return keys, [], []
+        self.asyncssh.match_known_hosts.side_effect = match_known_hosts
+
+    def _await(self, coro):
+        return asyncio.new_event_loop().run_until_complete(coro)
+
+    def test_run(self):
+        async def run():
+            async with async_ssh.AsyncHPE3PARSSHClient(
+                    '10.0.0.1', 'user', 'pass') as cl:
+                await cl.open()
+                await cl.open()
+                legacy = await cl.run(['showpatch', '-hist'])
+                stripped = await cl.run(['showpatch', '-hist'], True)
+            return legacy, stripped
+        legacy, stripped = self._await(run())
+        self.assertEqual(legacy, stripped)
+        self.assertEqual(stripped[1],
+                         '2013-08-21 18:06:45 PDT,MU2,Complete,3.1.2.422')
+        self.assertEqual(len(self.connections), 1)
+        connection = self.connections[0]
+        self.assertEqual(connection.options,
+                         {'port': 22, 'username': 'user',
+                          'password': 'pass', 'client_keys': None,
+                          'known_hosts': None})
+        self.assertEqual(connection.inputs[0]['input'],
+                         'setclienv csvtable 1\nshowpatch -hist\nexit\n')
+        self.assertEqual(connection.inputs[0]['term_type'], 'vt100')
+        self.assertTrue(connection.closed)
+
+    def test_injection(self):
+        cl = async_ssh.AsyncHPE3PARSSHClient('10.0.0.1', 'user', 'pass')
+        self.assertRaises(exceptions.SSHInjectionThreat, self._await,
+                          cl.run(['showpatch;reboot']))
+        self.assertEqual(self.connections, [])
+
+    def test_options(self):
+        cl = async_ssh.AsyncHPE3PARSSHClient(
+            '10.0.0.1', 'user', None, privatekey='/keys/id_rsa',
+            known_hosts_file=self.known_hosts,
+            missing_key_policy='RejectPolicy')
+        options = cl._connect_options()
+        self.assertEqual(options['client_keys'], ['/keys/id_rsa'])
+        self.assertEqual(options['known_hosts'], self.known_hosts)
+        self.assertRaises(exceptions.SSHException,
+                          async_ssh.AsyncHPE3PARSSHClient,
+                          '10.0.0.1', 'user', 'pass',
+                          missing_key_policy='bogus')
+
+    def test_known_hosts(self):
+        def known_hosts(ip, policy, known_hosts_file=self.known_hosts):
+            return async_ssh.AsyncHPE3PARSSHClient(
+                ip, 'user', 'pass', known_hosts_file=known_hosts_file,
+                missing_key_policy=policy)._connect_options()['known_hosts']
+
+        for policy in (None, 'AutoAddPolicy', 'WarningPolicy'):
+            # The key of a known host is checked, an unknown host is
+            # accepted.
+            self.assertEqual(known_hosts('10.0.0.1', policy),
+                             self.known_hosts)
+            self.assertIsNone(known_hosts('10.0.0.2', policy))
+        self.assertEqual(known_hosts('10.0.0.2', 'RejectPolicy'),
+                         self.known_hosts)
+
+        # The file of the user is the default.
+        self.assertIsNone(known_hosts('10.0.0.1', None, None))
+        self.assertEqual(known_hosts('10.0.0.1', 'RejectPolicy', None), ())
+        os.mkdir(os.path.join(self.tmpdir, '.ssh'))
+        default = os.path.join(self.tmpdir, '.ssh', 'known_hosts')
+        shutil.copy(self.known_hosts, default)
+        self.assertEqual(known_hosts('10.0.0.1', None, None), default)
+        self.assertEqual(known_hosts('10.0.0.1', 'RejectPolicy', None),
+                         default)
+
+    @mock.patch('hpe3parclient.async_ssh.randint', return_value=0)
+    def test_retry(self, mock_randint):
+        cl = async_ssh.AsyncHPE3PARSSHClient('10.0.0.1', 'user', 'pass')
+        connect = self.asyncssh.connect.side_effect
+        failures = [IOError('refused')]
+
+        async def connect_once_refused(host, **kwargs):
+            if failures:
+                raise failures.pop()
+            return await connect(host, **kwargs)
+        self.asyncssh.connect.side_effect = connect_once_refused
+        self.assertEqual(len(self._await(cl.run(['showpatch', '-hist']))),
+                         2)
+        self.assertEqual(failures, [])
+        self.assertEqual(mock_randint.call_count, 1)
+
+        self.asyncssh.connect.side_effect = IOError('refused')
+        cl = async_ssh.AsyncHPE3PARSSHClient('10.0.0.1', 'user', 'pass')
+        self.assertRaises(exceptions.SSHException, self._await,
+                          cl.run(['showpatch']))
+
+    def test_several_arrays(self):
+        async def run():
+            clients = []
+            for ip in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+                cl = async_client.AsyncHPE3ParClient(
+                    'https://%s:8080/api/v1' % ip)
+                cl.setSSHOptions(ip, 'user', 'pass')
+                clients.append(cl)
+            try:
+                return await asyncio.gather(*[cl.getPatches()
+                                              for cl in clients])
+            finally:
+                for cl in clients:
+                    await cl.close()
+        results = self._await(run())
+        self.assertEqual([result['total'] for result in results], [1, 1, 1])
+        self.assertEqual(results[0]['members'][0]['Id'], 'MU2')
+        self.assertEqual(sorted(connection.host
+                                for connection in self.connections),
+                         ['10.0.0.1', '10.0.0.2', '10.0.0.3'])
+        self.assertEqual(FakeConnection.most, 3)
+
+    def test_set_qos_rule(self):
+        async def run():
+            cl = async_client.AsyncHPE3ParClient(
+                'https://10.0.0.1:8080/api/v1')
+            cl.setSSHOptions('10.0.0.1', 'user', 'pass')
+            await cl.setQOSRule('vvset1', max_io=100)
+        self.assertRaises(exceptions.SetQOSRuleException, self._await,
+                          run())
+        self.assertEqual(self.connections[0].inputs[0]['input'],
+                         'setclienv csvtable 1\nsetqos -io 100 '
+                         'vvset:vvset1\nexit\n')
+
+    def test_not_initialized(self):
+        cl = async_client.AsyncHPE3ParClient('https://10.0.0.1:8080/api/v1')
+        self.assertRaises(exceptions.SSHException, self._await,
+                          cl.getPatch('P01'))
+
+    @mock.patch('hpe3parclient.async_ssh.asyncssh', None)
+    def test_needs_asyncssh(self):
+        self.assertRaises(ImportError, async_ssh.AsyncHPE3PARSSHClient,
+                          '10.0.0.1', 'user', 'pass')
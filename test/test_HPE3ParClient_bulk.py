@@ -0,0 +1,135 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client bulk executor."""
+
+import threading
+import time
+import unittest
+import mock
+
+from hpe3parclient import bulk
+from hpe3parclient import exceptions
+from hpe3parclient import ratelimit
+
+
+class FakeClient(object):
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.running = 0
+        self.most_running = 0
+
+    def _enter(self, call):
+        with self.lock:
+            self.calls.append(call)
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+
+    def createVolume(self, name, cpg, size):
+        self._enter(('createVolume', name))
+        if name == 'bad':
+            raise exceptions.HTTPConflict('exists')
+        return name
+
+    def createVLUN(self, name, hostname=None):
+        self._enter(('createVLUN', name))
+        return 'location-%s' % name
+
+
+class BulkExecutorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeClient()
+
+    def test_results_in_order(self):
+        operations = [bulk.Operation('createVolume', ('vol%d' % i, 'cpg', 1))
+                      for i in range(20)]
+        results = bulk.BulkExecutor(self.client, concurrency=4).run(
+            operations)
+
+        self.assertEqual([result.value for result in results],
+                         ['vol%d' % i for i in range(20)])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual([result.operation for result in results],
+                         operations)
+        self.assertEqual(self.client.most_running, 4)
+
+    def test_errors_do_not_stop_the_run(self):
+        results = bulk.BulkExecutor(self.client).run([
+            bulk.Operation('createVolume', ('vol1', 'cpg', 1)),
+            bulk.Operation('createVolume', ('bad', 'cpg', 1)),
+            bulk.Operation('createVolume', ('vol2', 'cpg', 1)),
+        ])
+        self.assertEqual([result.ok for result in results],
+                         [True, False, True])
+        self.assertIsInstance(results[1].error, exceptions.HTTPConflict)
+        self.assertIsNone(results[1].value)
+
+    def test_unknown_method(self):
+        results = bulk.BulkExecutor(self.client).run(
+            [bulk.Operation('createVolumes', ('vol1', 'cpg', 1))])
+        self.assertIsInstance(results[0].error, AttributeError)
+
+    def test_dependencies(self):
+        create = bulk.Operation('createVolume', ('vol1', 'cpg', 1))
+        export = bulk.Operation('createVLUN', ('vol1',),
+                                {'hostname': 'host1'}, depends_on=[create])
+        create_bad = bulk.Operation('createVolume', ('bad', 'cpg', 1))
+        export_bad = bulk.Operation('createVLUN', ('bad',),
+                                    depends_on=[create_bad])
+        after_bad = bulk.Operation(self.client.createVLUN, ('other',),
+                                   depends_on=[0, 3])
+
+        results = bulk.BulkExecutor(self.client, concurrency=8).run(
+            [create, create_bad, export, export_bad, after_bad])
+
+        self.assertEqual(results[2].value, 'location-vol1')
+        self.assertLess(self.client.calls.index(('createVolume', 'vol1')),
+                        self.client.calls.index(('createVLUN', 'vol1')))
+        for result in results[3:]:
+            self.assertIsInstance(result.error, exceptions.DependencyFailed)
+        self.assertNotIn(('createVLUN', 'bad'), self.client.calls)
+        self.assertNotIn(('createVLUN', 'other'), self.client.calls)
+
+    def test_dependency_must_come_first(self):
+        create = bulk.Operation('createVolume', ('vol1', 'cpg', 1))
+        export = bulk.Operation('createVLUN', ('vol1',), depends_on=[create])
+        executor = bulk.BulkExecutor(self.client)
+        self.assertRaises(ValueError, executor.run, [export, create])
+        self.assertRaises(ValueError, executor.run, [export])
+        self.assertEqual(self.client.calls, [])
+
+    def test_empty_run(self):
+        self.assertEqual(bulk.BulkExecutor(self.client).run([]), [])
+
+    def test_bad_concurrency(self):
+        self.assertRaises(ValueError, bulk.BulkExecutor, self.client, 0)
+
+    @mock.patch('hpe3parclient.ratelimit.TokenBucket.acquire')
+    def test_rate_limit(self, mock_acquire):
+        executor = bulk.BulkExecutor(self.client, rate_limit=5)
+        self.assertIsInstance(executor.rate_limit, ratelimit.TokenBucket)
+        executor.run([bulk.Operation('createVolume', ('vol%d' % i, 'cpg', 1))
+                      for i in range(3)])
+        self.assertEqual(mock_acquire.call_count, 3)
+
+        bucket = ratelimit.TokenBucket(10)
+        self.assertIs(bulk.BulkExecutor(self.client,
+                                        rate_limit=bucket).rate_limit,
+                      bucket)
@@ -0,0 +1,184 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client response cache."""
+
+import unittest
+
+import mock
+
+from hpe3parclient import cache
+from hpe3parclient import client
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    @mock.patch('hpe3parclient.timings.monotonic')
+    def test_ttl(self, mock_monotonic):
+        response_cache = cache.ResponseCache(ttls={'cpg': 10})
+
+        mock_monotonic.return_value = 100
+        response_cache.put('cpg', {'name': 'cpg1'}, 'cpg1')
+        mock_monotonic.return_value = 109
+        self.assertEqual(response_cache.get('cpg', 'cpg1'), {'name': 'cpg1'})
+        mock_monotonic.return_value = 110
+        self.assertIsNone(response_cache.get('cpg', 'cpg1'))
+
+        self.assertEqual(response_cache.stats(),
+                         {'hits': 1, 'misses': 1, 'evictions': 0,
+                          'size': 0})
+
+    def test_uncached_resource(self):
+        response_cache = cache.ResponseCache(ttls={'ports': 0})
+        response_cache.put('ports', {'members': []})
+        response_cache.put('volumes', {'members': []})
+        self.assertIsNone(response_cache.get('ports'))
+        self.assertIsNone(response_cache.get('volumes'))
+
+    def test_lru(self):
+        response_cache = cache.ResponseCache(maxsize=2)
+        response_cache.put('cpg', 1, 'cpg1')
+        response_cache.put('cpg', 2, 'cpg2')
+        # cpg1 becomes the most recently used entry.
+        response_cache.get('cpg', 'cpg1')
+        response_cache.put('cpg', 3, 'cpg3')
+
+        self.assertIsNone(response_cache.get('cpg', 'cpg2'))
+        self.assertEqual(response_cache.get('cpg', 'cpg1'), 1)
+        self.assertEqual(response_cache.get('cpg', 'cpg3'), 3)
+        self.assertEqual(response_cache.stats()['evictions'], 1)
+
+    def test_copies(self):
+        response_cache = cache.ResponseCache()
+        body = {'members': [{'name': 'cpg1'}]}
+        response_cache.put('cpgs', body)
+        body['members'].append({'name': 'cpg2'})
+        response_cache.get('cpgs')['members'].append({'name': 'cpg3'})
+
+        self.assertEqual(response_cache.get('cpgs'),
+                         {'members': [{'name': 'cpg1'}]})
+
+    def test_invalidate(self):
+        response_cache = cache.ResponseCache()
+        response_cache.put('cpgs', {})
+        response_cache.put('cpg', {}, 'cpg1')
+        response_cache.put('cpg', {}, 'cpg2')
+
+        response_cache.invalidate('cpg', 'cpg1')
+        self.assertIsNone(response_cache.get('cpg', 'cpg1'))
+        self.assertIsNotNone(response_cache.get('cpg', 'cpg2'))
+
+        response_cache.invalidate('cpg')
+        self.assertIsNone(response_cache.get('cpg', 'cpg2'))
+        self.assertIsNotNone(response_cache.get('cpgs'))
+
+        response_cache.clear()
+        self.assertIsNone(response_cache.get('cpgs'))
+
+
+class HPE3ParClientCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cl = client.HPE3ParClient('http://fake-url:8080/api/v1',
+                                       response_cache=True)
+        self.cl.http.get = mock.Mock(
+            side_effect=lambda url: ({}, {'url': url}))
+        self.cl.http.post = mock.Mock(return_value=({}, None))
+        self.cl.http.put = mock.Mock(return_value=({}, None))
+        self.cl.http.delete = mock.Mock(return_value=({}, None))
+
+    def test_no_cache_by_default(self):
+        cl = client.HPE3ParClient('http://fake-url:8080/api/v1')
+        cl.http.get = mock.Mock(return_value=({}, {}))
+        cl.getCPGs()
+        cl.getCPGs()
+
+        self.assertEqual(cl.http.get.call_count, 2)
+        self.assertIsNone(cl.getCacheStats())
+
+    def test_cached_calls(self):
+        for i in range(3):
+            self.cl.getStorageSystemInfo()
+            self.cl.getWSAPIConfigurationInfo()
+            self.cl.getCPGs()
+            self.assertEqual(self.cl.getCPG('cpg1'),
+                             {'url': '/cpgs/cpg1'})
+            self.cl.getCPG('cpg2')
+
+        self.assertEqual(self.cl.http.get.call_count, 5)
+        self.assertEqual(self.cl.getCacheStats(),
+                         {'hits': 10, 'misses': 5, 'evictions': 0,
+                          'size': 5})
+
+    def test_ws_api_version(self):
+        client.HPE3ParClient.WSAPI_VERSIONS.clear()
+        self.cl.http.get.side_effect = None
+        self.cl.http.get.return_value = ({}, {'build': 40000128})
+        self.cl.getWsApiVersion()
+        self.cl.getWsApiVersion()
+
+        self.cl.http.get.assert_called_once_with('http://fake-url:8080/api')
+        self.assertTrue(self.cl.primera_supported)
+        self.assertEqual(self.cl.http.api_url, 'http://fake-url:8080/api/v1')
+
+    def test_cpg_mutations_invalidate(self):
+        self.cl.getCPGs()
+        self.cl.getCPG('cpg1')
+        self.cl.getCPG('cpg2')
+
+        self.cl.createCPG('cpg3')
+        self.cl.getCPGs()
+        self.cl.getCPG('cpg1')
+        self.assertEqual(self.cl.http.get.call_count, 4)
+
+        self.cl.deleteCPG('cpg1')
+        self.cl.getCPG('cpg1')
+        self.cl.getCPG('cpg2')
+        self.assertEqual(self.cl.http.get.call_count, 5)
+
+    def test_modify_volume_invalidates(self):
+        self.cl.getStorageSystemInfo()
+        self.cl.getCPGs()
+        self.cl.getCPG('cpg1')
+
+        self.cl.modifyVolume('vol1', {'userCPG': 'cpg2'})
+        self.cl.getStorageSystemInfo()
+        self.cl.getCPGs()
+        self.cl.getCPG('cpg1')
+        self.assertEqual(self.cl.http.get.call_count, 5)
+
+    def test_volume_space_changes_invalidate(self):
+        calls = [
+            lambda: self.cl.createVolume('vol1', 'cpg1', 1024),
+            lambda: self.cl.deleteVolume('vol1'),
+            lambda: self.cl.growVolume('vol1', 1024),
+            lambda: self.cl.copyVolume('vol1', 'vol2', 'cpg1'),
+            lambda: self.cl.createSnapshot('snap1', 'vol1'),
+            lambda: self.cl.createSnapshotOfVolumeSet('snap1', 'vvs1'),
+            lambda: self.cl.promoteVirtualCopy('snap1'),
+            lambda: self.cl.tuneVolume('vol1', 1),
+        ]
+        for i, call in enumerate(calls):
+            self.cl.getCPGs()
+            self.cl.getCPG('cpg1')
+            call()
+            self.cl.getCPGs()
+            self.cl.getCPG('cpg1')
+            self.assertEqual(self.cl.http.get.call_count, 2 * (i + 2))
+
+    def test_clear_cache(self):
+        self.cl.getCPGs()
+        self.cl.clearCache()
+        self.cl.getCPGs()
+        self.assertEqual(self.cl.http.get.call_count, 2)
@@ -0,0 +1,185 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client circuit breakers."""
+
+import json
+import unittest
+import mock
+import requests
+
+from hpe3parclient import breaker
+from hpe3parclient import client
+from hpe3parclient import exceptions
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('hpe3parclient.timings.monotonic')
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monotonic.return_value = 100.0
+        self.changes = []
+        self.breaker = breaker.CircuitBreaker(
+            'node0:8080', failure_threshold=2, recovery_timeout=10,
+            listener=lambda *change: self.changes.append(change))
+
+    def _fail(self):
+        self.breaker.before_call()
+        self.breaker.record_failure()
+
+    def test_opens_after_failures_in_a_row(self):
+        self._fail()
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self._fail()
+        self.assertEqual(self.breaker.state, breaker.CLOSED)
+        self._fail()
+        self.assertEqual(self.breaker.state, breaker.OPEN)
+        self.assertRaises(exceptions.CircuitOpen, self.breaker.before_call)
+        self.assertEqual(self.changes, [('node0:8080', 'closed', 'open')])
+
+    def test_half_open_probe_closes(self):
+        self._fail()
+        self._fail()
+        self.monotonic.return_value = 110.0
+        self.assertEqual(self.breaker.state, breaker.HALF_OPEN)
+        self.breaker.before_call()
+        # One probe at a time.
+        self.assertRaises(exceptions.CircuitOpen, self.breaker.before_call)
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, breaker.CLOSED)
+        self.breaker.before_call()
+        self.assertEqual([change[2] for change in self.changes],
+                         ['open', 'half-open', 'closed'])
+
+    def test_half_open_failure_opens_again(self):
+        self._fail()
+        self._fail()
+        self.monotonic.return_value = 110.0
+        self._fail()
+        self.assertEqual(self.breaker.state, breaker.OPEN)
+        self.monotonic.return_value = 119.0
+        self.assertRaises(exceptions.CircuitOpen, self.breaker.before_call)
+        self.monotonic.return_value = 120.0
+        self.breaker.before_call()
+
+    def test_stats(self):
+        self._fail()
+        self._fail()
+        self.assertRaises(exceptions.CircuitOpen, self.breaker.before_call)
+        self.assertEqual(self.breaker.stats(),
+                         {'state': 'open', 'failures': 0, 'times_opened': 1,
+                          'rejected': 1})
+
+    def test_registry(self):
+        breakers = breaker.CircuitBreakerRegistry(failure_threshold=1)
+        first = breakers.get('node0:8080')
+        self.assertIs(breakers.get('node0:8080'), first)
+        self.assertEqual(first.failure_threshold, 1)
+        first.before_call()
+        first.record_failure()
+        stats = breakers.stats()
+        self.assertEqual(stats['node0:8080']['state'], 'open')
+
+
+class ClientCircuitBreakerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('hpe3parclient.timings.monotonic')
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monotonic.return_value = 100.0
+        breakers = breaker.CircuitBreakerRegistry(failure_threshold=3,
+                                                  recovery_timeout=30)
+        self.cl = client.HPE3ParClient('https://node0:8080/api/v1',
+                                       circuit_breaker=breakers)
+        self.cl.http.session_key = 'key'
+        self.down = True
+        self.sent = 0
+
+        def request(method, url, **kwargs):
+            self.sent += 1
+            if self.down:
+                raise requests.exceptions.ConnectionError('refused')
+            return mock.Mock(status_code=200, url='',
+                             content=json.dumps({'total': 0}).encode('utf-8'),
+                             headers=requests.structures.CaseInsensitiveDict())
+        self.cl.http.session = mock.Mock()
+        self.cl.http.session.request.side_effect = request
+
+    @mock.patch('time.sleep')
+    def test_fail_fast_while_open(self, mock_sleep):
+        # The retries stop once the breaker opens.
+        self.assertRaises(exceptions.CircuitOpen, self.cl.getVolumes)
+        self.assertEqual(self.sent, 3)
+        self.assertRaises(exceptions.CircuitOpen, self.cl.getVolumes)
+        self.assertEqual(self.sent, 3)
+        stats = self.cl.http.get_breaker_stats()
+        self.assertEqual(stats['node0:8080']['state'], 'open')
+
+        # A probe finds the array back.
+        self.down = False
+        self.monotonic.return_value = 130.0
+        self.assertEqual(self.cl.getVolumes(), {'total': 0})
+        stats = self.cl.http.get_breaker_stats()
+        self.assertEqual(stats['node0:8080']['state'], 'closed')
+
+    def test_client_errors_do_not_count(self):
+        self.cl.http.session.request.side_effect = None
+        self.cl.http.session.request.return_value = mock.Mock(
+            status_code=404, url='',
+            content=json.dumps({'code': 23}).encode('utf-8'),
+            headers=requests.structures.CaseInsensitiveDict())
+        for i in range(5):
+            self.assertRaises(exceptions.HTTPNotFound, self.cl.getVolume,
+                              'vol')
+        stats = self.cl.http.get_breaker_stats()
+        self.assertEqual(stats['node0:8080']['state'], 'closed')
+
+    def test_endpoint_released(self):
+        cl = client.HPE3ParClient(['https://node0:8080/api/v1',
+                                   'https://node1:8080/api/v1'],
+                                  circuit_breaker=True)
+        for name in ('node0:8080', 'node1:8080'):
+            cl.http.breakers.get(name)._set_state(breaker.OPEN)
+        cl.http.session = mock.Mock()
+        self.assertRaises(exceptions.CircuitOpen, cl.getVolumes)
+        self.assertFalse(cl.http.session.request.called)
+        self.assertEqual([e.in_flight for e in cl.http.endpoints.endpoints],
+                         [0, 0])
+
+    def test_open_breaker_fails_over(self):
+        cl = client.HPE3ParClient(['https://node0:8080/api/v1',
+                                   'https://node1:8080/api/v1'],
+                                  circuit_breaker=True)
+        cl.http.session_key = 'key'
+        cl.http.breakers.get('node0:8080')._set_state(breaker.OPEN)
+        cl.http.session = mock.Mock()
+        cl.http.session.request.return_value = mock.Mock(
+            status_code=200, url='',
+            content=json.dumps({'total': 0}).encode('utf-8'),
+            headers=requests.structures.CaseInsensitiveDict())
+        for i in range(10):
+            self.assertEqual(cl.getVolumes(), {'total': 0})
+        urls = set(call[0][1]
+                   for call in cl.http.session.request.call_args_list)
+        self.assertEqual(urls, set(['https://node1:8080/api/v1/volumes']))
+        self.assertEqual([e.in_flight for e in cl.http.endpoints.endpoints],
+                         [0, 0])
+
+    def test_no_breaker(self):
+        cl = client.HPE3ParClient('https://node0:8080/api/v1')
+        self.assertIsNone(cl.http.get_breaker_stats())
@@ -0,0 +1,97 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client JSON codecs."""
+
+import unittest
+
+import mock
+import requests
+
+from hpe3parclient import codec
+from hpe3parclient import http
+
+BODY = {'total': 1,
+        'members': [{'name': 'vol1', 'sizeMiB': 1024, 'readOnly': False,
+                     'comment': u'caf\xe9', 'policies': None}]}
+
+
+class JSONCodecTestCase(unittest.TestCase):
+
+    def _check_codec(self, json_codec):
+        data = json_codec.dumps(BODY)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(json_codec.loads(data), BODY)
+        self.assertRaises(ValueError, json_codec.loads,
+                          b'<html>Not JSON</html>')
+
+    def test_stdlib_codec(self):
+        self._check_codec(codec.get_codec('json'))
+
+    @unittest.skipIf(codec.orjson is None, "orjson is not installed")
+    def test_orjson_codec(self):
+        json_codec = codec.get_codec('orjson')
+        self._check_codec(json_codec)
+        # orjson refuses non str keys, the stdlib codec takes over.
+        self.assertEqual(json_codec.loads(json_codec.dumps({1: 'a'})),
+                         {'1': 'a'})
+
+    def test_default_codec(self):
+        expected = 'orjson' if codec.orjson is not None else 'json'
+        self.assertEqual(codec.get_codec().name, expected)
+        self.assertIn(expected, codec.available_codecs())
+
+    def test_unknown_codec(self):
+        self.assertRaises(ValueError, codec.get_codec, 'nojson')
+
+    def test_register_codec(self):
+        class UpperCodec(codec.StdlibJSONCodec):
+            name = 'upper'
+
+            def dumps(self, obj):
+                return super(UpperCodec, self).dumps(obj).upper()
+
+        codec.register_codec(UpperCodec)
+        try:
+            self.assertEqual(codec.get_codec('upper').dumps('a'), b'"A"')
+            instance = UpperCodec()
+            self.assertIs(codec.get_codec(instance), instance)
+        finally:
+            codec._codecs.pop('upper')
+
+    def test_http_request_uses_codec(self):
+        http_client = http.HTTPJSONRESTClient('http://fake-url:0000',
+                                              json_codec='json')
+        response = mock.Mock(status_code=200, url='http://fake-url:0000',
+                             content=b'{"name": "vol1"}',
+                             headers=requests.structures.CaseInsensitiveDict())
+        http_client.session = mock.Mock()
+        http_client.session.request.return_value = response
+
+        with mock.patch.object(http_client.codec, 'loads',
+                               wraps=http_client.codec.loads) as loads:
+            resp, body = http_client.request('http://fake-url:0000/volumes',
+                                             'POST', body={'name': 'vol1'})
+        loads.assert_called_once_with(b'{"name": "vol1"}')
+        self.assertEqual(body, {'name': 'vol1'})
+        self.assertEqual(
+            http_client.session.request.call_args[1]['data'],
+            b'{"name": "vol1"}')
+
+        # A body that is not JSON is handed back as text.
+        response.content = b'Not JSON'
+        response.text = 'Not JSON'
+        resp, body = http_client.request('http://fake-url:0000/volumes',
+                                         'GET')
+        self.assertEqual(body, 'Not JSON')
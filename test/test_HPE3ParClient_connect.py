@@ -0,0 +1,101 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client connection warm up."""
+
+import json
+import threading
+import unittest
+import mock
+import requests
+
+from hpe3parclient import client
+from hpe3parclient import exceptions
+
+VERSION = {'major': 1, 'minor': 6, 'revision': 0, 'build': 40000128}
+
+
+class ClientConnectTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cl = client.HPE3ParClient('https://node0:8080/api/v1',
+                                       response_cache=True)
+        self.cl.vlun_query_supported = False
+        self.probed = threading.Event()
+        self.sent = []
+        self.lock = threading.Lock()
+        self.version = VERSION
+
+        def request(method, url, headers=None, **kwargs):
+            path = url.split('8080', 1)[1]
+            with self.lock:
+                self.sent.append((method, path))
+            if path == '/api/v1/credentials':
+                # Only answers once the version probe was sent.
+                if not self.probed.wait(5):
+                    return self._response(500, {})
+                return self._response(201, {'key': 'key'})
+            if path == '/api':
+                self.probed.set()
+                return self._response(200, self.version)
+            if path == '/api/v1/system':
+                return self._response(200, {'name': 'array'})
+            return self._response(404, {})
+        self.cl.http.session = mock.Mock()
+        self.cl.http.session.request.side_effect = request
+
+    def _response(self, status, body):
+        return mock.Mock(status_code=status, url='',
+                         content=json.dumps(body).encode('utf-8'),
+                         headers=requests.structures.CaseInsensitiveDict())
+
+    def test_connect(self):
+        result = self.cl.connect('user', 'pass')
+        self.assertEqual(result, {'api_version': VERSION,
+                                  'system': {'name': 'array'}})
+        self.assertEqual(self.cl.http.session_key, 'key')
+        self.assertEqual(self.cl.api_version, VERSION)
+        self.assertEqual(self.cl.system_info, {'name': 'array'})
+        self.assertTrue(self.cl.primera_supported)
+        self.assertTrue(self.cl.vlun_query_supported)
+        self.assertTrue(self.cl.compression_supported)
+        # The http client url was never changed.
+        self.assertEqual(self.cl.http.api_url, 'https://node0:8080/api/v1')
+
+        # The results are cached.
+        self.assertEqual(self.cl.getWsApiVersion(), VERSION)
+        self.assertEqual(self.cl.getStorageSystemInfo(), {'name': 'array'})
+        self.assertEqual(sorted(self.sent),
+                         [('GET', '/api'), ('GET', '/api/v1/system'),
+                          ('POST', '/api/v1/credentials')])
+
+    def test_old_array(self):
+        self.version = {'major': 1, 'minor': 3, 'build': 30201256}
+        self.cl.connect('user', 'pass', system_info=False)
+        self.assertFalse(self.cl.primera_supported)
+        self.assertFalse(self.cl.vlun_query_supported)
+        self.assertFalse(self.cl.compression_supported)
+        self.assertIsNone(self.cl.system_info)
+
+    def test_warm_up_connections(self):
+        self.cl.connect('user', 'pass', connections=4, system_info=False)
+        self.assertEqual(self.sent.count(('GET', '/api')), 3)
+
+    def test_login_error(self):
+        self.cl.http.session.request.side_effect = None
+        self.cl.http.session.request.return_value = self._response(
+            403, {'code': 5, 'desc': 'invalid username or password'})
+        self.assertRaises(exceptions.HTTPForbidden, self.cl.connect,
+                          'user', 'bad')
+        self.assertIsNone(self.cl.api_version)
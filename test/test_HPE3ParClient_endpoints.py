@@ -0,0 +1,179 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client WSAPI endpoints."""
+
+import json
+import unittest
+import mock
+import requests
+
+from hpe3parclient import client
+from hpe3parclient import endpoints
+
+URLS = ['https://node0:8080/api/v1', 'https://node1:8080/api/v1']
+
+
+class EndpointPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('hpe3parclient.timings.monotonic')
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monotonic.return_value = 100.0
+        self.pool = endpoints.EndpointPool(URLS, down_time=30,
+                                           max_failures=2)
+
+    def _send(self, latency=0.01, **kwargs):
+        endpoint = self.pool.choose()
+        self.pool.record(endpoint, latency, **kwargs)
+        return endpoint
+
+    def test_rebase(self):
+        endpoint = self.pool.endpoints[1]
+        self.assertEqual(
+            endpoint.rebase('https://node0:8080/api/v1/volumes?query=x'),
+            'https://node1:8080/api/v1/volumes?query=x')
+        self.assertEqual(endpoint.rebase('https://node0:8080/api'),
+                         'https://node1:8080/api')
+
+    def test_spreads_load(self):
+        first = self.pool.choose()
+        second = self.pool.choose()
+        self.assertIsNot(first, second)
+
+    def test_prefers_healthy_endpoints(self):
+        slow, fast = self.pool.endpoints
+        self.pool.record(self.pool.choose(), 0)
+        slow.latency = 1.0
+        fast.latency = 0.01
+        chosen = set(self._send().url for i in range(10))
+        self.assertEqual(chosen, set([fast.url]))
+
+    def test_down_on_connection_error(self):
+        endpoint = self._send(error=requests.exceptions.ConnectionError())
+        self.assertTrue(endpoint.is_down(100.0))
+        self.assertFalse(self.pool.has_alternative(
+            self.pool.endpoints[1 - self.pool.endpoints.index(endpoint)]))
+        self.assertTrue(self.pool.has_alternative(endpoint))
+        for i in range(5):
+            self.assertIsNot(self._send(), endpoint)
+
+        # Back in use once the down time is over.
+        self.monotonic.return_value = 131.0
+        self.assertFalse(endpoint.is_down(131.0))
+        stats = self.pool.stats()
+        self.assertEqual(stats['failovers'], 1)
+        self.assertEqual([e['up'] for e in stats['endpoints']],
+                         [True, True])
+
+    def test_down_after_failures(self):
+        endpoint = self.pool.endpoints[0]
+        self.pool.endpoints[1].down_until = 1000.0
+        self._send(status=500)
+        self.assertFalse(endpoint.is_down(100.0))
+        self._send(status=500)
+        self.assertTrue(endpoint.is_down(100.0))
+        self.assertGreater(endpoint.error_rate, 0)
+
+        # Every endpoint is down, the first back is used.
+        self.assertIs(self.pool.choose(), endpoint)
+
+    def test_success_resets_failures(self):
+        self.pool.endpoints[1].down_until = 1000.0
+        self._send(status=500)
+        self._send(status=200)
+        self._send(status=500)
+        self.assertFalse(self.pool.endpoints[0].is_down(100.0))
+
+    def test_no_urls(self):
+        self.assertRaises(ValueError, endpoints.EndpointPool, [])
+
+
+class ClientFailoverTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # Equal endpoints are chosen in order.
+        patcher = mock.patch('random.sample', lambda seq, k: seq[:k])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cl = client.HPE3ParClient(URLS)
+        self.down = set()
+        self.keys = {}
+        self.sent = []
+
+        def request(method, url, headers=None, **kwargs):
+            host = url.split('/')[2]
+            self.sent.append((method, url))
+            if host in self.down:
+                raise requests.exceptions.ConnectionError('refused')
+            if url.endswith('/credentials'):
+                key = self.keys[host] = 'key-%s' % host
+                return self._response(201, {'key': key})
+            if headers.get(self.cl.http.SESSION_COOKIE_NAME) != \
+                    self.keys.get(host):
+                return self._response(401, {'code': 6})
+            return self._response(200, {'host': host})
+        self.cl.http.session = mock.Mock()
+        self.cl.http.session.request.side_effect = request
+
+    def _response(self, status, body):
+        return mock.Mock(status_code=status, url='',
+                         content=json.dumps(body).encode('utf-8'),
+                         headers=requests.structures.CaseInsensitiveDict())
+
+    @mock.patch('time.sleep')
+    def test_failover(self, mock_sleep):
+        self.assertEqual(self.cl.api_url, URLS[0])
+        self.cl.login('user', 'pass')
+        self.assertEqual(self.cl.http.session_key, 'key-node0:8080')
+        # node1 is slower.
+        self.cl.http.endpoints.endpoints[1].latency = 1.0
+        self.assertEqual(self.cl.getVolumes()['host'], 'node0:8080')
+
+        # node0 goes away, and node1 does not know the session: it is
+        # established again there without backing off.
+        self.down.add('node0:8080')
+        for i in range(3):
+            self.assertEqual(self.cl.getVolumes()['host'], 'node1:8080')
+        self.assertEqual(self.cl.http.session_key, 'key-node1:8080')
+        self.assertFalse(mock_sleep.called)
+
+        stats = self.cl.http.get_endpoint_stats()
+        self.assertEqual(stats['failovers'], 1)
+        self.assertFalse(stats['endpoints'][0]['up'])
+        self.assertEqual(stats['endpoints'][0]['errors'], 1)
+
+    @mock.patch('time.sleep')
+    def test_all_endpoints_down(self, mock_sleep):
+        self.down = set(['node0:8080', 'node1:8080'])
+        self.assertRaises(requests.exceptions.ConnectionError,
+                          self.cl.login, 'user', 'pass')
+        # POST is not sent again after a connection error.
+        self.assertEqual(len(self.sent), 1)
+
+        self.keys['node0:8080'] = self.cl.http.session_key = 'key'
+        self.assertRaises(requests.exceptions.ConnectionError,
+                          self.cl.getVolumes)
+        # GET is retried, backing off once no endpoint is left.
+        self.assertEqual(len(self.sent), 6)
+        self.assertEqual(mock_sleep.call_count, 4)
+
+    def test_single_url(self):
+        cl = client.HPE3ParClient(URLS[0])
+        self.assertIsNone(cl.http.endpoints)
+        self.assertIsNone(cl.http.get_endpoint_stats())
+        cl = client.HPE3ParClient(URLS[:1])
+        self.assertIsNone(cl.http.endpoints)
+        self.assertEqual(cl.api_url, URLS[0])
@@ -0,0 +1,223 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client hedged requests."""
+
+import json
+import threading
+import unittest
+import mock
+import requests
+
+from hpe3parclient import client
+from hpe3parclient import hedge
+from hpe3parclient import ratelimit
+from hpe3parclient import timings
+
+
+class HedgePolicyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = hedge.HedgePolicy(min_samples=3, max_ratio=0.5,
+                                        min_delay=0.01)
+        self.timings = timings.RequestTimings()
+        self.release = threading.Event()
+        self.calls = []
+        self.discarded = []
+
+    def tearDown(self):
+        self.release.set()
+
+    def _record(self, duration, count=3, url='/api/v1/vluns'):
+        for i in range(count):
+            self.timings.record('GET', url, 0.0, duration)
+
+    def _send(self):
+        # The first copy hangs until released, the others answer at once.
+        index = len(self.calls)
+        self.calls.append(index)
+        if index == 0:
+            self.release.wait(5)
+        return 'response %d' % index
+
+    def test_delay(self):
+        self.assertIsNone(self.policy.delay(self.timings, 'GET',
+                                            'https://a/api/v1/vluns'))
+        self._record(0.2)
+        delay = self.policy.delay(self.timings, 'GET',
+                                  'https://a/api/v1/vluns')
+        self.assertAlmostEqual(delay, 0.2, delta=0.05)
+        self.assertIsNone(self.policy.delay(self.timings, 'POST',
+                                            'https://a/api/v1/vluns'))
+
+    def test_delay_bounds(self):
+        self._record(0.0001)
+        self.assertEqual(self.policy.delay(self.timings, 'GET',
+                                           '/api/v1/vluns'), 0.01)
+        self._record(10.0, count=20, url='/api/v1/hosts/h1')
+        self.policy.max_delay = 2
+        self.assertEqual(self.policy.delay(self.timings, 'GET',
+                                           '/api/v1/hosts/h2'), 2)
+
+    def test_hedge_wins(self):
+        self.assertEqual(self.policy.send(self._send, 0.01,
+                                          self.discarded.append),
+                         'response 1')
+        self.assertEqual(self.calls, [0, 1])
+        self.release.set()
+        for i in range(100):
+            if self.discarded:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(self.discarded, ['response 0'])
+        self.assertEqual(self.policy.stats(),
+                         {'requests': 1, 'fired': 1, 'won': 1,
+                          'skipped': 0})
+
+    def test_fast_response_not_hedged(self):
+        self.release.set()
+        self.assertEqual(self.policy.send(self._send, 5), 'response 0')
+        self.assertEqual(self.calls, [0])
+        self.assertEqual(self.policy.stats()['fired'], 0)
+
+    def test_load_cap(self):
+        self.policy.max_ratio = 0.0
+        threading.Timer(0.1, self.release.set).start()
+        self.assertEqual(self.policy.send(self._send, 0.01), 'response 0')
+        self.assertEqual(self.calls, [0])
+        self.assertEqual(self.policy.stats()['skipped'], 1)
+
+    def test_threads_are_bounded(self):
+        self.policy = hedge.HedgePolicy(max_ratio=1, max_threads=1)
+        threading.Timer(0.1, self.release.set).start()
+        self.assertEqual(self.policy.send(self._send, 0.01), 'response 0')
+        self.assertEqual(self.calls, [0])
+        self.assertEqual(self.policy.stats()['skipped'], 1)
+
+        # The thread is kept for the next requests.
+        threads = threading.active_count()
+        for i in range(5):
+            self.assertEqual(self.policy.send(lambda: 'response', 5),
+                             'response')
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_no_permit_no_hedge(self):
+        threading.Timer(0.1, self.release.set).start()
+        try_hedge = mock.Mock(return_value=None)
+        self.assertEqual(self.policy.send(self._send, 0.01,
+                                          try_hedge=try_hedge),
+                         'response 0')
+        self.assertEqual(self.calls, [0])
+        try_hedge.assert_called_once_with()
+        self.assertEqual(self.policy.stats(),
+                         {'requests': 1, 'fired': 0, 'won': 0,
+                          'skipped': 1})
+
+    def test_error_waits_for_other_copy(self):
+        def send():
+            index = len(self.calls)
+            self.calls.append(index)
+            if index == 0:
+                self.release.wait(5)
+                raise requests.exceptions.ConnectionError('reset')
+            self.release.set()
+            self.release.wait(5)
+            threading.Event().wait(0.05)
+            return 'response 1'
+        self.assertEqual(self.policy.send(send, 0.01), 'response 1')
+
+    def test_all_copies_fail(self):
+        def send():
+            self.calls.append(len(self.calls))
+            threading.Event().wait(0.05)
+            raise requests.exceptions.ConnectionError('reset')
+        self.assertRaises(requests.exceptions.ConnectionError,
+                          self.policy.send, send, 0.01)
+        self.assertEqual(len(self.calls), 2)
+
+
+class ClientHedgeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = hedge.HedgePolicy(min_samples=5, max_ratio=1)
+        self.cl = client.HPE3ParClient('https://node0:8080/api/v1',
+                                       hedge_gets=self.policy)
+        self.cl.http.session_key = 'key'
+        self.release = threading.Event()
+        self.responses = []
+        self.lock = threading.Lock()
+
+        def request(method, url, **kwargs):
+            with self.lock:
+                index = len(self.responses)
+                response = mock.Mock(
+                    status_code=200, url='',
+                    content=json.dumps({'total': index}).encode('utf-8'),
+                    headers=requests.structures.CaseInsensitiveDict())
+                self.responses.append(response)
+            if index == 0:
+                self.release.wait(5)
+            return response
+        self.cl.http.session = mock.Mock()
+        self.cl.http.session.request.side_effect = request
+
+    def tearDown(self):
+        self.release.set()
+
+    def test_hedged_get(self):
+        for i in range(5):
+            self.cl.http.timings.record('GET', '/api/v1/volumes', 0.0, 0.01)
+        self.assertEqual(self.cl.getVolumes(), {'total': 1})
+        self.assertEqual(self.cl.http.get_hedge_stats()['won'], 1)
+
+        # The response that lost is closed.
+        self.release.set()
+        for i in range(100):
+            if self.responses[0].close.called:
+                break
+            threading.Event().wait(0.01)
+        self.assertTrue(self.responses[0].close.called)
+
+    def test_not_enough_samples(self):
+        self.release.set()
+        self.assertEqual(self.cl.getVolumes(), {'total': 0})
+        self.assertEqual(self.cl.http.get_hedge_stats()['requests'], 0)
+
+    def test_hedge_takes_a_permit(self):
+        limiter = ratelimit.AdaptiveConcurrencyLimiter(initial=1)
+        self.cl.http.concurrency_limiter = limiter
+        for i in range(5):
+            self.cl.http.timings.record('GET', '/api/v1/volumes', 0.0, 0.01)
+        threading.Timer(0.1, self.release.set).start()
+        # The request holds the only slot, the hedge is not sent.
+        self.assertEqual(self.cl.getVolumes(), {'total': 0})
+        self.assertEqual(len(self.responses), 1)
+        self.assertEqual(self.cl.http.get_hedge_stats()['skipped'], 1)
+        self.assertEqual(limiter.stats()['in_flight'], 0)
+
+        limiter.window = 2.0
+        self.release.clear()
+        del self.responses[:]
+        self.assertEqual(self.cl.getVolumes(), {'total': 1})
+        self.release.set()
+        for i in range(100):
+            if not limiter.stats()['in_flight']:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(limiter.stats()['in_flight'], 0)
+
+    def test_no_hedging(self):
+        cl = client.HPE3ParClient('https://node0:8080/api/v1')
+        self.assertIsNone(cl.http.hedge_policy)
+        self.assertIsNone(cl.http.get_hedge_stats())
@@ -0,0 +1,106 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client streaming JSON parser."""
+
+import json
+import unittest
+
+import mock
+import requests
+
+from hpe3parclient import exceptions
+from hpe3parclient import http
+from hpe3parclient import jsonstream
+
+MEMBERS = [{'name': u'vol\xe9%s' % i, 'id': 1000 + i, 'sizeMiB': 12345678,
+            'policies': {'tpvv': True, 'comment': 'a "quoted" } ]'}}
+           for i in range(20)]
+DOCUMENT = json.dumps({'total': len(MEMBERS), 'members': MEMBERS},
+                      ensure_ascii=False).encode('utf-8')
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class JSONStreamTestCase(unittest.TestCase):
+
+    def test_chunk_sizes(self):
+        for size in (1, 2, 3, 7, 64, 4096, len(DOCUMENT)):
+            members = list(jsonstream.iter_members(chunked(DOCUMENT, size)))
+            self.assertEqual(members, MEMBERS, "chunk size %s" % size)
+
+    def test_is_lazy(self):
+        chunks = iter(chunked(DOCUMENT, 16))
+        members = jsonstream.iter_members(chunks)
+        self.assertEqual(next(members), MEMBERS[0])
+        # Only the start of the document was read.
+        self.assertTrue(len(list(chunks)) > len(DOCUMENT) // 16 // 2)
+
+    def test_fields(self):
+        members = jsonstream.iter_members(chunked(DOCUMENT, 5),
+                                          fields=['name', 'missing'])
+        self.assertEqual(list(members),
+                         [{'name': member['name']} for member in MEMBERS])
+
+    def test_other_keys(self):
+        data = (b'{"links": [{"href": "/x"}], "members": [{"a": 1}],'
+                b' "total": 123}')
+        self.assertEqual(list(jsonstream.iter_members(chunked(data, 3))),
+                         [{'a': 1}])
+
+    def test_no_members(self):
+        for data in (b'{}', b'{"total": 0}', b'{"total": 0, "members": []}',
+                     b' { "members" : null } '):
+            self.assertEqual(list(jsonstream.iter_members([data])), [])
+
+    def test_invalid(self):
+        for data in (b'', b'[]', b'{"members": [{"a": 1}',
+                     b'{"members": [{"a": }]}', b'{"members": [1 2]}'):
+            self.assertRaises(ValueError, list,
+                              jsonstream.iter_members(chunked(data, 2)))
+
+
+class HTTPIterMembersTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.http = http.HTTPJSONRESTClient('http://fake-url:0000/api/v1')
+        self.response = mock.Mock(
+            status_code=200, url='http://fake-url:0000/api/v1/volumes',
+            headers=requests.structures.CaseInsensitiveDict())
+        self.response.iter_content.return_value = chunked(DOCUMENT, 100)
+        self.http.session = mock.Mock()
+        self.http.session.request.return_value = self.response
+
+    def test_iter_members(self):
+        members = list(self.http.iter_members('/volumes', fields=['id']))
+
+        self.assertEqual(members, [{'id': m['id']} for m in MEMBERS])
+        self.assertTrue(
+            self.http.session.request.call_args[1]['stream'])
+        self.response.iter_content.assert_called_once_with(65536)
+        self.response.close.assert_called_once_with()
+
+    def test_iter_members_error(self):
+        self.response.status_code = 404
+        self.response.content = b'{"code": 23, "desc": "not found"}'
+        self.assertRaises(exceptions.HTTPNotFound, list,
+                          self.http.iter_members('/volumes'))
+
+    def test_iter_members_closes_early(self):
+        members = self.http.iter_members('/volumes')
+        next(members)
+        members.close()
+        self.response.close.assert_called_once_with()
@@ -0,0 +1,316 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client rate limiting."""
+
+import threading
+import time
+import unittest
+import weakref
+import mock
+
+from hpe3parclient import client
+from hpe3parclient import ratelimit
+
+
+class TokenBucketTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('hpe3parclient.timings.monotonic')
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monotonic.return_value = 100.0
+
+    def test_burst(self):
+        bucket = ratelimit.TokenBucket(2, burst=3)
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    def test_refill(self):
+        bucket = ratelimit.TokenBucket(2)
+        self.assertTrue(bucket.try_acquire(2))
+        self.assertFalse(bucket.try_acquire())
+        self.monotonic.return_value = 100.5
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        # Never more than the burst.
+        self.monotonic.return_value = 200.0
+        self.assertFalse(bucket.try_acquire(3))
+
+    @mock.patch('time.sleep')
+    def test_acquire_waits(self, mock_sleep):
+        bucket = ratelimit.TokenBucket(4)
+        bucket.try_acquire(4)
+
+        def sleep(delay):
+            self.monotonic.return_value += delay
+        mock_sleep.side_effect = sleep
+
+        self.assertEqual(bucket.acquire(), 0.25)
+        mock_sleep.assert_called_once_with(0.25)
+        self.assertEqual(bucket.acquire(0), 0.0)
+
+    def test_bad_rate(self):
+        self.assertRaises(ValueError, ratelimit.TokenBucket, 0)
+
+
+class AdaptiveConcurrencyLimiterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('hpe3parclient.timings.monotonic')
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monotonic.return_value = 100.0
+
+    def _fill(self, limiter):
+        return [limiter.acquire() for i in range(limiter.limit)]
+
+    def test_grows_when_saturated(self):
+        limiter = ratelimit.AdaptiveConcurrencyLimiter(initial=2, maximum=3)
+        for round_trip in range(2):
+            for started in self._fill(limiter):
+                limiter.release(started)
+        self.assertEqual(limiter.limit, 3)
+
+        for round_trip in range(5):
+            for started in self._fill(limiter):
+                limiter.release(started)
+        self.assertEqual(limiter.window, 3)
+
+    def test_no_growth_below_the_limit(self):
+        limiter = ratelimit.AdaptiveConcurrencyLimiter(initial=4)
+        for i in range(10):
+            limiter.release(limiter.acquire())
+        self.assertEqual(limiter.window, 4)
+
+    def test_no_growth_when_slow(self):
+        limiter = ratelimit.AdaptiveConcurrencyLimiter(
+            initial=1, latency_threshold=0.5)
+        started = limiter.acquire()
+        self.monotonic.return_value = 101.0
+        limiter.release(started)
+        self.assertEqual(limiter.window, 1)
+
+    def test_one_decrease_per_round_trip(self):
+        limiter = ratelimit.AdaptiveConcurrencyLimiter(initial=16)
+        in_flight = self._fill(limiter)
+        self.monotonic.return_value = 101.0
+        for started in in_flight:
+            limiter.release(started, overloaded=True)
+        self.assertEqual(limiter.window, 8)
+
+        # Requests sent after the decrease can shrink it again.
+        started = limiter.acquire()
+        limiter.release(started, overloaded=True)
+        self.assertEqual(limiter.window, 4)
+        self.assertEqual(limiter.stats()['decreases'], 2)
+
+    def test_minimum(self):
+        limiter = ratelimit.AdaptiveConcurrencyLimiter(initial=2, minimum=2)
+        limiter.release(limiter.acquire(), overloaded=True)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_waits_when_full(self):
+        self.monotonic.side_effect = time.time
+        limiter = ratelimit.AdaptiveConcurrencyLimiter(initial=1)
+        started = limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limiter.acquire()
+            acquired.set()
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        for i in range(100):
+            if limiter.stats()['queued']:
+                break
+            time.sleep(0.01)
+        self.assertEqual(limiter.stats()['queued'], 1)
+        self.assertFalse(acquired.is_set())
+
+        limiter.release(started)
+        thread.join(5)
+        self.assertTrue(acquired.is_set())
+        stats = limiter.stats()
+        self.assertEqual(stats['in_flight'], 1)
+        self.assertEqual(stats['queued'], 0)
+        self.assertEqual(stats['max_queued'], 1)
+
+    def test_try_acquire(self):
+        limiter = ratelimit.AdaptiveConcurrencyLimiter(initial=2)
+        self._fill(limiter)
+        self.assertIsNone(limiter.try_acquire())
+        limiter.release(100.0)
+        self.assertEqual(limiter.try_acquire(), 100.0)
+        self.assertEqual(limiter.stats()['in_flight'], 2)
+
+    def test_bad_window(self):
+        self.assertRaises(ValueError, ratelimit.AdaptiveConcurrencyLimiter,
+                          initial=2, minimum=4)
+
+
+class PriorityLimiterTestCase(unittest.TestCase):
+
+    def _start(self, limiter, lane, started):
+        def acquire():
+            limiter.acquire(lane)
+            started.append(lane)
+        thread = threading.Thread(target=acquire)
+        thread.daemon = True
+        thread.start()
+        for i in range(100):
+            if limiter.stats()['lanes'][lane]['queued']:
+                break
+            time.sleep(0.01)
+        return thread
+
+    def test_reserved_slots(self):
+        limiter = ratelimit.PriorityLimiter(limit=4, reserved=1)
+        for i in range(3):
+            limiter.acquire('background')
+        started = []
+        normal = self._start(limiter, 'normal', started)
+        self.assertEqual(started, [])
+
+        # The reserved slot is still free for an interactive request.
+        limiter.acquire('interactive')
+        stats = limiter.stats()['lanes']
+        self.assertEqual(stats['interactive']['in_flight'], 1)
+        self.assertEqual(stats['normal']['queued'], 1)
+
+        limiter.release('background')
+        normal.join(5)
+        self.assertEqual(started, ['normal'])
+
+    def test_higher_lanes_go_first(self):
+        limiter = ratelimit.PriorityLimiter(limit=1, reserved=0)
+        limiter.acquire('normal')
+        started = []
+        threads = [self._start(limiter, 'background', started),
+                   self._start(limiter, 'normal', started),
+                   self._start(limiter, 'interactive', started)]
+        for i in range(3):
+            limiter.release(started[-1] if started else 'normal')
+            for j in range(100):
+                if len(started) > i:
+                    break
+                time.sleep(0.01)
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(started, ['interactive', 'normal', 'background'])
+        self.assertEqual(limiter.stats()['lanes']['background']['sent'], 1)
+
+    def test_background_limit(self):
+        limiter = ratelimit.PriorityLimiter(limit=8, background_limit=1)
+        limiter.acquire('background')
+        started = []
+        thread = self._start(limiter, 'background', started)
+        limiter.acquire('normal')
+        self.assertEqual(started, [])
+        limiter.release('background')
+        thread.join(5)
+        self.assertEqual(started, ['background'])
+
+    def test_window(self):
+        window = ratelimit.AdaptiveConcurrencyLimiter(initial=6)
+        limiter = ratelimit.PriorityLimiter(limit=100, reserved=2,
+                                            window=window)
+        self.assertEqual(limiter.stats()['limit'], 6)
+        self.assertEqual(limiter._capacity('normal'), 4)
+        window.window = 2
+        # Other lanes always get a slot.
+        self.assertEqual(limiter._capacity('background'), 1)
+
+    def test_try_acquire(self):
+        limiter = ratelimit.PriorityLimiter(limit=2, reserved=1)
+        self.assertTrue(limiter.try_acquire('normal'))
+        self.assertFalse(limiter.try_acquire('normal'))
+        self.assertTrue(limiter.try_acquire('interactive'))
+        self.assertFalse(limiter.try_acquire('interactive'))
+        limiter.release('normal')
+        self.assertTrue(limiter.try_acquire('background'))
+
+    def test_unknown_lane(self):
+        limiter = ratelimit.PriorityLimiter()
+        self.assertRaises(ValueError, limiter.acquire, 'urgent')
+        self.assertRaises(ValueError, limiter.try_acquire, 'urgent')
+
+
+class ClientPriorityLaneTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cl = client.HPE3ParClient('http://fake-url:0000/api/v1',
+                                       priority_lanes=True,
+                                       method_lanes={'getVolume':
+                                                     'interactive'})
+        self.lanes = []
+
+        def get(url, **kwargs):
+            self.lanes.append(getattr(self.cl.http._local, 'lane', None))
+            return None, {'members': [{'id': 1}], 'total': 1}
+        self.cl.http.get = mock.Mock(side_effect=get)
+        self.cl.http.post = mock.Mock(side_effect=get)
+
+    def test_method_lanes(self):
+        self.assertEqual(self.cl.method_lanes['createVLUN'], 'interactive')
+        self.cl.getOverallSystemCapacity()
+        self.cl.getVolume('vol1')
+        self.cl.getVolumes()
+        self.assertEqual(self.lanes, ['background', 'interactive', None])
+        self.assertEqual(self.cl.getOverallSystemCapacity.__name__,
+                         'getOverallSystemCapacity')
+
+    def test_per_call_lane_wins(self):
+        with self.cl.priorityLane('normal'):
+            self.cl.getOverallSystemCapacity()
+            self.cl.getVolumes()
+        self.assertEqual(self.lanes, ['normal', 'normal'])
+
+    def test_set_method_lane(self):
+        self.cl.setMethodLane('getVolumes', 'background')
+        self.cl.setMethodLane('getOverallSystemCapacity', None)
+        self.cl.getVolumes()
+        self.cl.getOverallSystemCapacity()
+        self.assertEqual(self.lanes, ['background', None])
+        self.assertNotIn('getOverallSystemCapacity', self.cl.method_lanes)
+        self.assertRaises(ValueError, self.cl.setMethodLane, 'getVolumes',
+                          'urgent')
+        self.assertRaises(AttributeError, self.cl.setMethodLane,
+                          'getVolumez', 'normal')
+
+    def test_class_patches_are_used(self):
+        with mock.patch.object(client.HPE3ParClient, 'getHostVLUNs',
+                               return_value=['vlun']) as getHostVLUNs:
+            self.assertEqual(self.cl.getHostVLUNs('host1'), ['vlun'])
+        getHostVLUNs.assert_called_once_with(self.cl, 'host1')
+
+        class Client(client.HPE3ParClient):
+            def getHostVLUNs(self, hostName):
+                return 'overridden'
+        cl = Client('http://fake-url:0000/api/v1', priority_lanes=True)
+        self.assertEqual(cl.getHostVLUNs('host1'), 'overridden')
+
+    def test_no_wrappers_without_priority_lanes(self):
+        cl = client.HPE3ParClient('http://fake-url:0000/api/v1')
+        self.assertEqual(cl.method_lanes['createVLUN'], 'interactive')
+        self.assertNotIn('createVLUN', cl.__dict__)
+        cl.setMethodLane('getVolumes', 'background')
+        self.assertNotIn('getVolumes', cl.__dict__)
+
+    def test_no_reference_cycle(self):
+        cl = weakref.ref(client.HPE3ParClient('http://fake-url:0000/api/v1',
+                                              priority_lanes=True))
+        self.assertIsNone(cl())
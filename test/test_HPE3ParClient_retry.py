@@ -14,13 +14,14 @@
 
 """Test class of 3PAR Client handling WSAPI retries."""
 
-import importlib
 import mock
 import requests
+import unittest
 
 from test import HPE3ParClient_base as hpe3parbase
 
 from hpe3parclient import exceptions
+from hpe3parclient import retry
 
 
 class HPE3ParClientRetryTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
@@ -29,68 +30,137 @@ class HPE3ParClientRetryTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
         super(HPE3ParClientRetryTestCase, self).setUp()
 
     def tearDown(self):
-        # NOTE(aorourke): We mock out the requests library's request method in
-        # order to force exceptions so we can test retry attempts. By doing
-        # this, we completely destroy the functionaility of requests.
-        # Therefore, after every unit test we run, we need to reimport the
-        # library to restore proper functionality or all future tests will
-        # fail. In Python 2.7 we must use the built in reload() method while
-        # in Python 3.4 we must use importlib.reload().
-        try:
-            reload(requests)
-        except NameError:
-            importlib.reload(requests)
+        # NOTE(aorourke): We mock out the session's request method in order
+        # to force exceptions so we can test retry attempts. Put a fresh
+        # session back so that the logout in tearDown still works.
+        self.cl.http.session = self.cl.http._create_session()
         super(HPE3ParClientRetryTestCase, self).tearDown()
 
-    def test_retry_exhaust_all_attempts_service_unavailable(self):
+    @mock.patch('time.sleep')
+    def test_retry_exhaust_all_attempts_service_unavailable(self, mock_sleep):
         http = self.cl.http
 
-        # There should be 5 tries before anything is called.
-        self.assertEqual(http.tries, 5)
+        # There should be 5 tries for every request.
+        self.assertEqual(http.retry_policy.tries, 5)
 
         # The requests object needs to raise an exception in order for us
         # to test the retry functionality.
-        requests.request = mock.Mock()
-        requests.request.side_effect = exceptions.HTTPServiceUnavailable(
+        http.session.request = mock.Mock()
+        http.session.request.side_effect = exceptions.HTTPServiceUnavailable(
             "Maximum number of WSAPI connections reached.")
 
-        # This will take ~30 seconds to fail.
         self.assertRaises(
             exceptions.HTTPServiceUnavailable,
             http.get,
             '/volumes')
+        self.assertEqual(http.session.request.call_count, 5)
 
-        # There should be 0 tries left after the call.
-        self.assertEqual(http.tries, 0)
+        # The next request starts with a fresh retry budget.
+        self.assertRaises(
+            exceptions.HTTPServiceUnavailable,
+            http.get,
+            '/volumes')
+        self.assertEqual(http.session.request.call_count, 10)
 
-    def test_retry_exhaust_all_attempts_connection_error(self):
+    @mock.patch('time.sleep')
+    def test_retry_exhaust_all_attempts_connection_error(self, mock_sleep):
         http = self.cl.http
 
-        # There should be 5 tries before anything is called.
-        self.assertEqual(http.tries, 5)
-
         # The requests object needs to raise an exception in order for us
         # to test the retry functionality.
-        requests.request = mock.Mock()
-        requests.request.side_effect = requests.exceptions.ConnectionError(
-            "There was a connection error.")
+        http.session.request = mock.Mock()
+        http.session.request.side_effect = \
+            requests.exceptions.ConnectionError(
+                "There was a connection error.")
 
-        # This will take ~30 seconds to fail.
         self.assertRaises(
             requests.exceptions.ConnectionError,
             http.get,
             '/volumes')
 
-        # There should be 0 tries left after the call.
-        self.assertEqual(http.tries, 0)
+        # There should be 5 attempts with a backoff between each of them.
+        self.assertEqual(http.session.request.call_count, 5)
+        self.assertEqual(mock_sleep.call_count, 4)
 
-    def test_no_retry(self):
+    @mock.patch('time.sleep')
+    def test_no_retry_non_idempotent_connection_error(self, mock_sleep):
         http = self.cl.http
 
-        # There should be 5 tries before anything is called.
-        self.assertEqual(http.tries, 5)
+        http.session.request = mock.Mock()
+        http.session.request.side_effect = \
+            requests.exceptions.ConnectionError(
+                "There was a connection error.")
 
-        http.get('/volumes')
+        # A POST might have reached the array, so it is not sent again.
+        self.assertRaises(
+            requests.exceptions.ConnectionError,
+            http.post,
+            '/volumes', body={'name': 'vol'})
+        self.assertEqual(http.session.request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_no_retry(self):
+        http = self.cl.http
 
-        # There should be 5 tries left after the call.
-        self.assertEqual(http.tries, 5)
+        with mock.patch.object(http.session, 'request',
+                               wraps=http.session.request) as mock_request:
+            http.get('/volumes')
+
+        self.assertEqual(mock_request.call_count, 1)
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+
+    def test_matches(self):
+        policy = retry.RetryPolicy(retry_error_codes=(22,))
+        self.assertTrue(policy.matches(
+            exceptions.HTTPServiceUnavailable()))
+        self.assertTrue(policy.matches(
+            requests.exceptions.ConnectionError()))
+        self.assertTrue(policy.matches(
+            exceptions.HTTPConflict({'code': 22})))
+        self.assertFalse(policy.matches(
+            exceptions.HTTPConflict({'code': 23})))
+        self.assertFalse(policy.matches(exceptions.HTTPNotFound()))
+
+    def test_allows(self):
+        policy = retry.RetryPolicy()
+        ex = requests.exceptions.ConnectionError()
+        self.assertTrue(policy.allows('GET', ex))
+        self.assertTrue(policy.allows('delete', ex))
+        self.assertFalse(policy.allows('POST', ex))
+        self.assertTrue(policy.allows(
+            'POST', exceptions.HTTPServiceUnavailable()))
+        self.assertTrue(policy.allows(
+            'POST', requests.exceptions.ConnectTimeout()))
+
+    @mock.patch('random.uniform', side_effect=lambda low, high: high)
+    def test_backoff_full_jitter(self, mock_uniform):
+        policy = retry.RetryPolicy(backoff_base=1, backoff_max=5)
+        delays = [policy.get_delay(attempt) for attempt in range(5)]
+        self.assertEqual(delays, [1, 2, 4, 5, 5])
+        mock_uniform.assert_called_with(0, 5)
+
+    def test_state_budget(self):
+        policy = retry.RetryPolicy(tries=3)
+        ex = exceptions.HTTPServiceUnavailable()
+
+        state = policy.new_state('GET')
+        self.assertTrue(state.retry(ex))
+        self.assertTrue(state.retry(ex))
+        self.assertFalse(state.retry(ex))
+
+        # Every request gets its own budget.
+        self.assertTrue(policy.new_state('GET').retry(ex))
+
+    def test_state_max_elapsed(self):
+        policy = retry.RetryPolicy(max_elapsed=10)
+        ex = exceptions.HTTPServiceUnavailable()
+
+        with mock.patch('time.time', return_value=100):
+            state = policy.new_state('GET')
+        with mock.patch('time.time', return_value=105):
+            with mock.patch('random.uniform', return_value=1):
+                self.assertTrue(state.retry(ex))
+            with mock.patch('random.uniform', return_value=6):
+                self.assertFalse(state.retry(ex))
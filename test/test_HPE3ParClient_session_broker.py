@@ -0,0 +1,241 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client session broker."""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import unittest
+import mock
+
+from hpe3parclient import exceptions
+from hpe3parclient import http
+from hpe3parclient import session_broker
+
+API_URL = 'https://3par:8080/api/v1'
+CREDENTIALS = {'user': 'user', 'password': 'pass'}
+
+
+def _borrow_in_process(path, login_log):
+    def login():
+        with open(login_log, 'a') as f:
+            f.write('login\n')
+        return 'key-%d' % os.getpid()
+
+    broker = session_broker.FileSessionBroker(path)
+    return broker.borrow(API_URL, CREDENTIALS, login)
+
+
+class Logins(object):
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return 'key%d' % self.count
+
+
+@unittest.skipIf(session_broker.fcntl is None, "Needs fcntl")
+class FileSessionBrokerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'sessions.json')
+        self.broker = session_broker.FileSessionBroker(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_sessions_are_shared(self):
+        login = Logins()
+        other = session_broker.FileSessionBroker(self.path)
+        self.assertEqual(self.broker.borrow(API_URL, CREDENTIALS, login),
+                         'key1')
+        self.assertEqual(other.borrow(API_URL, CREDENTIALS, login), 'key1')
+        self.assertEqual(login.count, 1)
+        self.assertEqual(other.stats(),
+                         {'borrowed': 1, 'logins': 0, 'refreshed': 0})
+
+    def test_file_is_private(self):
+        self.broker.borrow(API_URL, CREDENTIALS, Logins())
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        with open(self.path) as f:
+            self.assertNotIn('pass', f.read())
+
+    def test_digest_is_keyed(self):
+        self.broker.borrow(API_URL, CREDENTIALS, Logins())
+        data = json.dumps([API_URL, CREDENTIALS], sort_keys=True)
+        plain = hashlib.sha256(data.encode('utf-8')).hexdigest()
+        with open(self.path) as f:
+            sessions = json.load(f)
+        self.assertEqual(len(sessions), 1)
+        self.assertNotIn(plain, sessions)
+        key_path = self.path + '.key'
+        self.assertEqual(stat.S_IMODE(os.stat(key_path).st_mode), 0o600)
+
+        # The secret is created once and shared.
+        other = session_broker.FileSessionBroker(self.path)
+        self.assertEqual(other.borrow(API_URL, CREDENTIALS, Logins()),
+                         'key1')
+        other_path = os.path.join(self.tmpdir, 'other.json')
+        other = session_broker.FileSessionBroker(other_path)
+        other.borrow(API_URL, CREDENTIALS, Logins())
+        with open(other_path) as f:
+            self.assertNotIn(list(sessions)[0], json.load(f))
+
+    def test_default_path_is_private(self):
+        with mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.tmpdir}):
+            broker = session_broker.FileSessionBroker()
+        self.assertEqual(os.path.dirname(broker.path), self.tmpdir)
+        with mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': '',
+                                          'HOME': self.tmpdir}):
+            broker = session_broker.FileSessionBroker()
+        self.assertEqual(os.path.dirname(broker.path), self.tmpdir)
+        self.assertNotEqual(os.path.dirname(broker.path),
+                            tempfile.gettempdir())
+
+    def test_unsafe_file_is_refused(self):
+        login = Logins()
+        with open(self.path, 'w') as f:
+            f.write('{}')
+        os.chmod(self.path, 0o644)
+        self.assertRaises(IOError, self.broker.borrow, API_URL, CREDENTIALS,
+                          login)
+
+        target = os.path.join(self.tmpdir, 'target')
+        link = os.path.join(self.tmpdir, 'link')
+        os.symlink(target, link)
+        broker = session_broker.FileSessionBroker(link)
+        self.assertRaises(OSError, broker.borrow, API_URL, CREDENTIALS,
+                          login)
+        self.assertFalse(os.path.exists(target))
+
+        with mock.patch('os.getuid', return_value=os.getuid() + 1):
+            os.chmod(self.path, 0o600)
+            self.assertRaises(IOError, self.broker.borrow, API_URL,
+                              CREDENTIALS, login)
+        self.assertEqual(login.count, 0)
+
+    def test_missing_key_is_not_stored(self):
+        self.assertIsNone(self.broker.borrow(API_URL, CREDENTIALS,
+                                             lambda: None))
+        self.assertEqual(self.broker.borrow(API_URL, CREDENTIALS, Logins()),
+                         'key1')
+
+    def test_sessions_per_credentials(self):
+        login = Logins()
+        self.broker.borrow(API_URL, CREDENTIALS, login)
+        key = self.broker.borrow(API_URL,
+                                 {'user': 'user', 'password': 'wrong'},
+                                 login)
+        self.assertEqual(key, 'key2')
+        key = self.broker.borrow('https://other:8080/api/v1', CREDENTIALS,
+                                 login)
+        self.assertEqual(key, 'key3')
+
+    def test_max_sessions(self):
+        login = Logins()
+        self.broker.max_sessions = 2
+        keys = [self.broker.borrow(API_URL, CREDENTIALS, login)
+                for i in range(5)]
+        self.assertEqual(keys, ['key1', 'key2', 'key1', 'key2', 'key1'])
+        self.assertEqual(login.count, 2)
+
+    def test_refused_key_is_replaced_once(self):
+        login = Logins()
+        self.broker.borrow(API_URL, CREDENTIALS, login)
+        key = self.broker.borrow(API_URL, CREDENTIALS, login,
+                                 failed_key='key1')
+        self.assertEqual(key, 'key2')
+        # Another client reporting the same key gets the new one.
+        key = self.broker.borrow(API_URL, CREDENTIALS, login,
+                                 failed_key='key1')
+        self.assertEqual(key, 'key2')
+        self.assertEqual(login.count, 2)
+        self.assertEqual(self.broker.stats()['refreshed'], 1)
+
+    def test_failed_login_is_not_stored(self):
+        login = mock.Mock(side_effect=exceptions.HTTPForbidden())
+        self.assertRaises(exceptions.HTTPForbidden, self.broker.borrow,
+                          API_URL, CREDENTIALS, login)
+        self.assertEqual(self.broker.borrow(API_URL, CREDENTIALS, Logins()),
+                         'key1')
+
+    def test_processes_share_one_login(self):
+        login_log = os.path.join(self.tmpdir, 'logins')
+        pool = multiprocessing.Pool(4)
+        try:
+            keys = pool.starmap(_borrow_in_process,
+                                [(self.path, login_log)] * 8)
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(len(set(keys)), 1)
+        with open(login_log) as f:
+            self.assertEqual(f.read(), 'login\n')
+
+    def test_other_arrays_do_not_wait_for_a_login(self):
+        other_url = 'https://other:8080/api/v1'
+        other_keys = []
+
+        def login():
+            # Another array is served while this login is under way.
+            thread = threading.Thread(target=lambda: other_keys.append(
+                self.broker.borrow(other_url, CREDENTIALS, lambda: 'other')))
+            thread.start()
+            thread.join(10)
+            return 'key'
+
+        self.assertEqual(self.broker.borrow(API_URL, CREDENTIALS, login),
+                         'key')
+        self.assertEqual(other_keys, ['other'])
+        self.assertEqual(self.broker.borrow(other_url, CREDENTIALS,
+                                            Logins()), 'other')
+        self.assertEqual(self.broker.borrow(API_URL, CREDENTIALS,
+                                            Logins()), 'key')
+
+    def test_clients_share_sessions(self):
+        logins = []
+
+        def request(url, method, **kwargs):
+            logins.append(kwargs['body'])
+            return None, {'key': 'key%d' % len(logins)}
+
+        clients = []
+        for i in range(3):
+            cl = http.HTTPJSONRESTClient(API_URL, session_broker=self.broker)
+            cl.request = mock.Mock(side_effect=request)
+            cl.authenticate('user', 'pass')
+            clients.append(cl)
+        self.assertEqual([cl.session_key for cl in clients], ['key1'] * 3)
+        self.assertEqual(len(logins), 1)
+
+        # The first client to be refused logs in again, the others pick up
+        # the new key.
+        for cl in clients:
+            self.assertTrue(cl._reauth('key1'))
+        self.assertEqual([cl.session_key for cl in clients], ['key2'] * 3)
+        self.assertEqual(len(logins), 2)
+
+        # Logging out leaves the shared session alone.
+        clients[0].unauthenticate()
+        self.assertIsNone(clients[0].session_key)
+        self.assertEqual(clients[0].request.call_count, 2)
@@ -0,0 +1,219 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client SSH connection pool."""
+
+import threading
+import time
+import unittest
+import mock
+
+from hpe3parclient import exceptions
+from hpe3parclient import ssh
+from hpe3parclient import ssh_pool
+
+
+class SSHConnectionPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('hpe3parclient.timings.monotonic',
+                             side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connect = mock.Mock(side_effect=lambda: mock.Mock())
+        self.pool = ssh_pool.SSHConnectionPool(self.connect, size=2,
+                                               max_idle=60, max_lifetime=600)
+
+    def test_reuse(self):
+        first = self.pool.checkout()
+        self.pool.checkin(first)
+        self.assertIs(self.pool.checkout(), first)
+        self.assertEqual(first.uses, 2)
+        self.assertEqual(self.connect.call_count, 1)
+
+    def test_size(self):
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+        self.assertIsNot(first.ssh, second.ssh)
+        self.assertRaises(exceptions.SSHException, self.pool.checkout, 0)
+        self.assertEqual(self.pool.stats(),
+                         {'size': 2, 'open': 2, 'idle': 0, 'in_use': 2,
+                          'created': 2, 'evicted': 0, 'waits': 0})
+
+    def test_wait_for_checkin(self):
+        first = self.pool.checkout()
+        self.pool.checkout()
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(
+            self.pool.checkout()))
+        waiter.start()
+        while not self.pool.stats()['waits']:
+            time.sleep(0.001)
+        self.pool.checkin(first)
+        waiter.join(5)
+        self.assertEqual(got, [first])
+
+    def test_unhealthy_replaced(self):
+        first = self.pool.checkout()
+        self.pool.checkin(first)
+        first.ssh.get_transport.return_value.is_active.return_value = False
+        second = self.pool.checkout()
+        self.assertIsNot(second, first)
+        first.ssh.close.assert_called_once_with()
+        self.assertEqual(self.pool.stats()['open'], 1)
+
+    def test_idle_and_lifetime(self):
+        first = self.pool.checkout()
+        self.pool.checkin(first)
+        self.now += 61
+        self.pool.evict_idle()
+        first.ssh.close.assert_called_once_with()
+        self.assertEqual(self.pool.stats()['open'], 0)
+
+        second = self.pool.checkout()
+        self.now += 601
+        self.pool.checkin(second)
+        second.ssh.close.assert_called_once_with()
+        self.assertEqual(self.pool.stats()['evicted'], 2)
+
+    def test_broken_in_block(self):
+        def use():
+            with self.pool.connection() as connection:
+                transport = connection.ssh.get_transport.return_value
+                transport.is_active.return_value = False
+                raise IOError('gone')
+        self.assertRaises(IOError, use)
+        self.assertEqual(self.pool.stats()['open'], 0)
+
+    def test_connect_error(self):
+        self.connect.side_effect = IOError('refused')
+        self.assertRaises(IOError, self.pool.checkout)
+        self.assertEqual(self.pool.stats()['open'], 0)
+
+    def test_close(self):
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+        self.pool.checkin(first)
+        self.pool.close()
+        first.ssh.close.assert_called_once_with()
+        self.pool.checkin(second)
+        second.ssh.close.assert_called_once_with()
+        self.assertRaises(exceptions.SSHException, self.pool.checkout)
+
+    def test_reopen(self):
+        first = self.pool.checkout()
+        self.pool.close()
+        self.pool.open()
+        second = self.pool.checkout()
+        self.assertIsNot(second, first)
+        # A connection from before the close is not kept.
+        self.pool.checkin(first)
+        first.ssh.close.assert_called_once_with()
+        self.pool.checkin(second)
+        self.assertIs(self.pool.checkout(), second)
+        self.assertEqual(self.pool.stats()['open'], 1)
+
+
+class PooledSSHClientTestCase(unittest.TestCase):
+
+    @mock.patch('paramiko.SSHClient')
+    def test_parallel_commands(self, mock_ssh_client):
+        clients = []
+
+        def new_client():
+            client = mock.Mock()
+            channel = client.invoke_shell.return_value
+            channel.recv_exit_status.return_value = 0
+            channel.makefile.return_value.read.return_value = b''
+            clients.append(client)
+            return client
+        mock_ssh_client.side_effect = new_client
+
+        cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass', pool_size=3,
+                                  known_hosts_file=None)
+        cl.open()
+        self.assertFalse(clients[0].connect.called)
+
+        running = []
+        most = []
+        lock = threading.Lock()
+
+        def read():
+            with lock:
+                running.append(1)
+                most.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.pop()
+            return b''
+
+        def run():
+            for client in clients[1:]:
+                client.invoke_shell.return_value.makefile.return_value.\
+                    read.side_effect = read
+            cl._ssh_execute('showport')
+
+        # Open the connections first, so the reads can be patched.
+        connections = [cl.pool.checkout() for i in range(3)]
+        for connection in connections:
+            cl.pool.checkin(connection)
+        workers = [threading.Thread(target=run) for i in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(5)
+
+        self.assertEqual(len(clients), 4)
+        for client in clients[1:]:
+            self.assertEqual(client.connect.call_args[0], ('10.0.0.1',))
+        self.assertGreater(max(most), 1)
+        self.assertEqual(cl.get_pool_stats()['created'], 3)
+        self.assertFalse(clients[0].invoke_shell.called)
+
+        cl.close()
+        for client in clients:
+            client.close.assert_called_once_with()
+
+    @mock.patch('paramiko.SSHClient')
+    def test_close_open_run(self, mock_ssh_client):
+        clients = []
+
+        def new_client():
+            client = mock.Mock()
+            channel = client.invoke_shell.return_value
+            channel.recv_exit_status.return_value = 0
+            channel.makefile.return_value.read.return_value = b''
+            clients.append(client)
+            return client
+        mock_ssh_client.side_effect = new_client
+
+        cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass', pool_size=2,
+                                  known_hosts_file=None)
+        cl.open()
+        cl.run(['showport'])
+        cl.close()
+        self.assertRaises(exceptions.SSHException, cl.pool.checkout)
+
+        cl.open()
+        cl.run(['showport'])
+        self.assertEqual(len(clients), 3)
+        self.assertTrue(clients[2].invoke_shell.called)
+        self.assertEqual(cl.get_pool_stats()['created'], 2)
+
+    @mock.patch('paramiko.SSHClient')
+    def test_no_pool(self, mock_ssh_client):
+        cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass')
+        self.assertIsNone(cl.pool)
+        self.assertIsNone(cl.get_pool_stats())
@@ -0,0 +1,472 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client persistent CLI shell."""
+
+import socket
+import threading
+import time
+import unittest
+import mock
+import paramiko
+
+from hpe3parclient import client
+from hpe3parclient import exceptions
+from hpe3parclient import ssh
+
+PROMPT = 'array1 cli% '
+OUTPUTS = {
+    'setclienv csvtable 1': '',
+    'showport': 'N:S:P,Mode\r\n0:1:1,target\r\n0:1:2,initiator\r\n',
+    'showsys -d': 'Name,ID\r\narray1,12345\r\n',
+    'setqos -io 10 vvset:a': '',
+    'setqos -io 10 vvset:b': 'no matching QoS target found\r\n',
+    'removevv vol1': 'Do you want to proceed with removing VV vol1?\r\n'
+                     'select q=quit y=yes n=no: ',
+    'exit': None,
+}
+
+
+class FakeCLIChannel(object):
+    """Answers like the CLI of an array, a few bytes at a time."""
+
+    def __init__(self, chunk_size=7):
+        self.chunk_size = chunk_size
+        self.sent = []
+        self.closed = False
+        self.timeout = None
+        self.pending = b'Welcome\r\n' + PROMPT.encode('utf-8')
+        self.answers = []
+        self.asking = False
+
+    def settimeout(self, timeout):
+        self.timeout = timeout
+
+    def sendall(self, data):
+        self.sent.append(data)
+        for line in data.split('\n')[:-1]:
+            if self.asking:
+                # The line is taken as the answer to the question.
+                self.answers.append(line)
+                self.asking = False
+                self.pending += (line + '\r\n' + PROMPT).encode('utf-8')
+                continue
+            output = OUTPUTS.get(line, 'Invalid command\r\n')
+            if output is None:
+                self.closed = True
+                return
+            answer = line + '\r\n' + output
+            if output.endswith(': '):
+                self.asking = True
+            else:
+                answer += PROMPT
+            self.pending += answer.encode('utf-8')
+
+    def recv(self, size):
+        if not self.pending:
+            if self.closed:
+                return b''
+            raise socket.timeout()
+        size = min(size, self.chunk_size)
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+class CLIShellTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.channel = FakeCLIChannel()
+        self.ssh = mock.Mock()
+        self.ssh.invoke_shell.return_value = self.channel
+        self.shell = ssh.HPE3PARCLIShell(self.ssh, timeout=5)
+
+    def test_commands(self):
+        self.assertEqual(self.shell.execute('showport'),
+                         ['N:S:P,Mode', '0:1:1,target', '0:1:2,initiator'])
+        self.assertEqual(self.shell.prompt, PROMPT)
+        self.assertEqual(self.shell.execute('showsys -d'),
+                         ['Name,ID', 'array1,12345'])
+        self.assertEqual(self.ssh.invoke_shell.call_count, 1)
+        self.assertEqual(self.channel.sent,
+                         ['setclienv csvtable 1\n', 'showport\n',
+                          'showsys -d\n'])
+        self.assertEqual(self.channel.timeout, 5)
+
+    def test_wrapped_echo(self):
+        self.shell.open()
+        self.channel.pending = (
+            'showsys\r\n -d\r\nName,ID\r\n' + PROMPT).encode('utf-8')
+        self.channel.sendall = mock.Mock()
+        self.assertEqual(self.shell.execute('showsys -d'), ['Name,ID'])
+
+    def test_no_answer(self):
+        self.shell.open()
+        self.channel.sendall = mock.Mock()
+        self.assertRaises(exceptions.SSHException, self.shell.execute,
+                          'showport')
+
+    def test_closed(self):
+        self.assertRaises(exceptions.SSHException, self.shell.execute,
+                          'exit')
+
+    def test_close(self):
+        self.shell.open()
+        self.shell.close()
+        self.assertTrue(self.channel.closed)
+        self.assertFalse(self.shell.is_open())
+
+
+class PersistentShellTestCase(unittest.TestCase):
+
+    @mock.patch('paramiko.SSHClient')
+    def test_run(self, mock_ssh_client):
+        channels = []
+
+        def invoke_shell():
+            channels.append(FakeCLIChannel())
+            return channels[-1]
+        client = mock_ssh_client.return_value
+        client.invoke_shell.side_effect = invoke_shell
+
+        cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass',
+                                  persistent_shell=True)
+        self.assertEqual(cl.run(['showport']),
+                         ['N:S:P,Mode', '0:1:1,target', '0:1:2,initiator'])
+        self.assertEqual(cl.run(['showsys', '-d']),
+                         ['Name,ID', 'array1,12345'])
+        self.assertEqual(len(channels), 1)
+
+        # A shell that went away is opened again.
+        channels[0].closed = True
+        self.assertEqual(cl.run(['showsys', '-d']),
+                         ['Name,ID', 'array1,12345'])
+        self.assertEqual(len(channels), 2)
+
+        self.assertRaises(exceptions.SSHInjectionThreat, cl.run,
+                          ['showport;rm'])
+        cl.close()
+        self.assertTrue(channels[1].closed)
+        self.assertIsNone(cl.shell)
+
+    @mock.patch('hpe3parclient.ssh.greenthread.sleep')
+    @mock.patch('paramiko.SSHClient')
+    def test_retry(self, mock_ssh_client, mock_sleep):
+        channels = []
+
+        def invoke_shell():
+            channels.append(FakeCLIChannel())
+            if len(channels) == 1:
+                channels[0].sendall = mock.Mock()
+            return channels[-1]
+        client = mock_ssh_client.return_value
+        client.invoke_shell.side_effect = invoke_shell
+
+        cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass',
+                                  persistent_shell=True)
+        self.assertEqual(cl.run(['showport'])[0], 'N:S:P,Mode')
+        self.assertTrue(channels[0].closed)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    @mock.patch('paramiko.SSHClient')
+    def test_threads_take_turns(self, mock_ssh_client):
+        channels = []
+
+        class SlowChannel(FakeCLIChannel):
+            def recv(self, size):
+                time.sleep(0.001)
+                return FakeCLIChannel.recv(self, size)
+
+        def invoke_shell():
+            channels.append(SlowChannel())
+            return channels[-1]
+        mock_ssh_client.return_value.invoke_shell.side_effect = invoke_shell
+        cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass',
+                                  persistent_shell=True)
+
+        # A command waits for the one using the shell.
+        results = []
+        with cl._shell_lock:
+            worker = threading.Thread(
+                target=lambda: results.append(cl.run(['showsys', '-d'])))
+            worker.start()
+            worker.join(0.1)
+            self.assertTrue(worker.is_alive())
+        worker.join(5)
+        self.assertEqual(results, [['Name,ID', 'array1,12345']])
+
+        expected = {'showport': ['N:S:P,Mode', '0:1:1,target',
+                                 '0:1:2,initiator'],
+                    'showsys': ['Name,ID', 'array1,12345']}
+
+        def run(cmd):
+            for i in range(5):
+                results.append(cl.run(cmd) == expected[cmd[0]])
+        del results[:]
+        workers = [threading.Thread(target=run, args=(cmd,))
+                   for cmd in (['showport'], ['showsys', '-d']) * 3]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(10)
+        self.assertEqual(results, [True] * 30)
+        self.assertEqual(len(channels), 1)
+
+    @mock.patch('paramiko.SSHClient')
+    def test_pooled(self, mock_ssh_client):
+        mock_ssh_client.return_value.invoke_shell.side_effect = (
+            FakeCLIChannel)
+        cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass', pool_size=2,
+                                  persistent_shell=True)
+        cl.run(['showport'])
+        cl.run(['showport'])
+        connection = cl.pool.checkout()
+        self.assertTrue(connection.shell.is_open())
+        cl.pool.checkin(connection)
+        self.assertEqual(cl.get_pool_stats()['created'], 1)
+        cl.close()
+        self.assertIsNone(connection.shell.channel)
+
+
+class RunBatchTestCase(unittest.TestCase):
+
+    @mock.patch('paramiko.SSHClient')
+    def setUp(self, mock_ssh_client):
+        self.cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass')
+
+    def test_one_shell(self):
+        channel = FakeCLIChannel()
+        self.cl.ssh.invoke_shell.return_value = channel
+        cmds = [['setqos', '-io', '10', 'vvset:a'],
+                ['setqos', '-io', '10', 'vvset:b'],
+                ['showsys', '-d;reboot'],
+                ['showsys', '-d']]
+        results = self.cl.run_batch(cmds)
+        self.assertEqual([result.cmd for result in results], cmds)
+        self.assertEqual(results[0].output, [])
+        self.assertEqual(results[1].output,
+                         ['no matching QoS target found'])
+        self.assertIsInstance(results[2].error,
+                              exceptions.SSHInjectionThreat)
+        self.assertEqual(results[3].output, ['Name,ID', 'array1,12345'])
+        self.assertEqual([result.ok for result in results],
+                         [True, True, False, True])
+        # One command at a time, in one shell closed at the end.
+        self.assertEqual(channel.sent, ['setclienv csvtable 1\n',
+                                        'setqos -io 10 vvset:a\n',
+                                        'setqos -io 10 vvset:b\n',
+                                        'showsys -d\n'])
+        self.assertEqual(self.cl.ssh.invoke_shell.call_count, 1)
+        self.assertTrue(channel.closed)
+
+    def test_confirmation(self):
+        channels = []
+
+        def invoke_shell():
+            channels.append(FakeCLIChannel())
+            return channels[-1]
+
+        self.cl.ssh.invoke_shell.side_effect = invoke_shell
+        self.cl.shell_timeout = 5
+        results = self.cl.run_batch([['showsys', '-d'],
+                                     ['removevv', 'vol1'],
+                                     ['showport'],
+                                     ['showsys', '-d']])
+        self.assertEqual(results[0].output, ['Name,ID', 'array1,12345'])
+        self.assertIsInstance(results[1].error, exceptions.SSHException)
+        self.assertIn('confirmation', str(results[1].error))
+        self.assertEqual(results[2].output[0], 'N:S:P,Mode')
+        self.assertEqual(results[3].output, ['Name,ID', 'array1,12345'])
+        # The question was left unanswered, the rest ran in a new shell.
+        self.assertEqual(len(channels), 2)
+        self.assertEqual(channels[0].answers, [])
+        self.assertEqual(channels[0].sent[-1], 'removevv vol1\n')
+        self.assertTrue(channels[0].closed)
+        self.assertEqual(channels[1].sent, ['setclienv csvtable 1\n',
+                                            'showport\n',
+                                            'showsys -d\n'])
+
+    def test_session_error(self):
+        self.cl.ssh.invoke_shell.side_effect = exceptions.SSHException(
+            'down')
+        results = self.cl.run_batch([['showport'], ['showsys']])
+        self.assertEqual([str(result.error) for result in results],
+                         ['down', 'down'])
+
+    def test_persistent_shell(self):
+        channel = FakeCLIChannel()
+        self.cl.ssh.invoke_shell.return_value = channel
+        self.cl.ssh.get_transport.return_value.is_active.return_value = True
+        self.cl.persistent_shell = True
+        results = self.cl.run_batch([['showport'], ['showsys', '-d'],
+                                     ['exit']])
+        self.assertEqual(results[0].output[0], 'N:S:P,Mode')
+        self.assertEqual(results[1].output, ['Name,ID', 'array1,12345'])
+        self.assertIsInstance(results[2].error, exceptions.SSHException)
+        self.assertEqual(self.cl.ssh.invoke_shell.call_count, 1)
+
+
+class OneShotChannel(object):
+    """Answers a whole shell session, a few bytes at a time."""
+
+    def __init__(self, output, chunk_size=5):
+        self.output = output.encode('utf-8')
+        self.chunk_size = chunk_size
+        self.sent = []
+        self.closed = False
+
+    def sendall(self, data):
+        self.sent.append(data)
+
+    def recv(self, size):
+        data = self.output[:self.chunk_size]
+        self.output = self.output[self.chunk_size:]
+        return data
+
+    def close(self):
+        self.closed = True
+
+
+class RunStreamTestCase(unittest.TestCase):
+
+    OUTPUT = '\r\n'.join([
+        'setclienv csvtable 1',
+        'showpatch -hist',
+        'exit',
+        'array1 cli% setclienv csvtable 1',
+        'array1 cli% showpatch -hist',
+        'InstallTime,Id,Package,Version',
+        '2013-08-21 18:06:45 PDT,MU2,Complete,3.1.2.422',
+        '2013-10-10 15:20:05 PDT,MU3,Complete,3.1.2.484',
+        'array1 cli% exit',
+        ''])
+
+    @mock.patch('paramiko.SSHClient')
+    def setUp(self, mock_ssh_client):
+        self.cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass')
+        self.channel = OneShotChannel(self.OUTPUT)
+        self.cl.ssh.invoke_shell.return_value = self.channel
+        self.cl.ssh.get_transport.return_value.is_active.return_value = True
+
+    def _run(self, multi_line_stripper):
+        with mock.patch.object(self.cl, '_run_ssh',
+                               return_value=(self.OUTPUT.encode('utf-8'),
+                                             b'')):
+            return self.cl.run(['showpatch', '-hist'], multi_line_stripper)
+
+    def test_iter_lines(self):
+        chunks = ['a\r', '\nb', 'c\r\n', '\r\nd']
+        self.assertEqual(list(ssh.iter_lines(iter(chunks))),
+                         ''.join(chunks).split('\r\n'))
+        self.assertEqual(list(ssh.iter_lines(['a\r\n'])), ['a', ''])
+
+    def test_same_as_run(self):
+        for multi_line_stripper in (False, True):
+            self.channel.output = self.OUTPUT.encode('utf-8')
+            lines = self.cl.run_stream(['showpatch', '-hist'],
+                                       multi_line_stripper)
+            self.assertEqual(list(lines), self._run(multi_line_stripper))
+        self.assertEqual(self.channel.sent[0],
+                         'setclienv csvtable 1\nshowpatch -hist\nexit\n')
+        self.assertTrue(self.channel.closed)
+
+    def test_lines_as_they_come(self):
+        lines = self.cl.run_stream(['showpatch', '-hist'], True)
+        self.assertEqual(next(lines), 'InstallTime,Id,Package,Version')
+        # Only what the first line needed was read.
+        self.assertTrue(self.channel.output)
+        lines.close()
+        self.assertTrue(self.channel.closed)
+
+    @mock.patch('hpe3parclient.ssh.greenthread.sleep')
+    def test_stripper_error(self, mock_sleep):
+        self.channel.output = b'exit\r\nno prompt\r\n'
+        self.assertRaises(exceptions.SSHException, list,
+                          self.cl.run_stream(['showpatch'], True))
+        self.assertRaises(exceptions.SSHInjectionThreat, list,
+                          self.cl.run_stream(['showpatch;rm']))
+
+    @mock.patch('hpe3parclient.ssh.greenthread.sleep')
+    def test_retry_before_first_line(self, mock_sleep):
+        transport = self.cl.ssh.get_transport.return_value
+        transport.is_alive.return_value = False
+        self.cl.ssh.invoke_shell.side_effect = [
+            paramiko.SSHException('closed'), self.channel]
+        with mock.patch.object(self.cl, '_create_ssh') as create_ssh:
+            lines = list(self.cl.run_stream(['showpatch', '-hist'], True))
+        self.assertEqual(lines[0], 'InstallTime,Id,Package,Version')
+        self.assertEqual(mock_sleep.call_count, 1)
+        create_ssh.assert_called_once_with()
+
+        self.cl.ssh.invoke_shell.side_effect = paramiko.SSHException(
+            'closed')
+        with mock.patch.object(self.cl, '_create_ssh'):
+            self.assertRaises(exceptions.SSHException, list,
+                              self.cl.run_stream(['showpatch']))
+        self.assertEqual(self.cl.ssh.invoke_shell.call_count, 4)
+
+    def test_no_retry_after_first_line(self):
+        def recv(size):
+            if self.channel.output:
+                return OneShotChannel.recv(self.channel, size)
+            raise socket.timeout()
+        self.channel.recv = recv
+        lines = self.cl.run_stream(['showpatch', '-hist'], True)
+        self.assertEqual(next(lines), 'InstallTime,Id,Package,Version')
+        self.assertRaises(socket.timeout, list, lines)
+        self.assertEqual(self.cl.ssh.invoke_shell.call_count, 1)
+
+    def test_convert(self):
+        result = client.HPE3ParClient.convert_cli_output_to_wsapi_format(
+            self.cl.run_stream(['showpatch', '-hist'], True))
+        self.assertEqual(result['total'], 2)
+        self.assertEqual(result['members'][1]['Id'], 'MU3')
+        self.assertEqual(
+            client.HPE3ParClient.convert_cli_output_to_wsapi_format(
+                iter(['No patch is applied to the system.'])),
+            {'total': 0, 'members': []})
+
+    def test_persistent_shell(self):
+        self.cl.persistent_shell = True
+        channel = FakeCLIChannel()
+        self.cl.ssh.invoke_shell.return_value = channel
+        self.assertEqual(list(self.cl.run_stream(['showsys', '-d'])),
+                         ['Name,ID', 'array1,12345'])
+        lines = self.cl.run_stream(['showport'])
+        self.assertEqual(next(lines), 'N:S:P,Mode')
+
+        # The lines left unread do not keep the shell from the others.
+        outputs = []
+        worker = threading.Thread(
+            target=lambda: outputs.append(self.cl.run(['showsys', '-d'])))
+        worker.start()
+        worker.join(5)
+        self.assertEqual(outputs, [['Name,ID', 'array1,12345']])
+        self.assertEqual(list(lines), ['0:1:1,target', '0:1:2,initiator'])
+        self.assertFalse(channel.closed)
+
+    @mock.patch('paramiko.SSHClient')
+    def test_pooled(self, mock_ssh_client):
+        mock_ssh_client.return_value.invoke_shell.side_effect = (
+            lambda: OneShotChannel(self.OUTPUT))
+        cl = ssh.HPE3PARSSHClient('10.0.0.1', 'user', 'pass', pool_size=1)
+        lines = cl.run_stream(['showpatch', '-hist'], True)
+        first = next(lines)
+        # The connection is back in the pool before the lines are read.
+        self.assertEqual(cl.get_pool_stats()['in_use'], 0)
+        self.assertEqual(cl.get_pool_stats()['idle'], 1)
+        self.assertEqual([first] + list(lines),
+                         list(cl.run_stream(['showpatch', '-hist'], True)))
@@ -0,0 +1,102 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client used from many threads."""
+
+import json
+import threading
+import time
+import unittest
+import mock
+import requests
+
+from hpe3parclient import client
+
+API_URL = 'https://node0:8080/api/v1'
+VERSION = {'major': 1, 'minor': 6, 'build': 40000128}
+
+
+class ClientThreadingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        client.HPE3ParClient.WSAPI_VERSIONS.clear()
+        self.addCleanup(client.HPE3ParClient.WSAPI_VERSIONS.clear)
+        self.urls = []
+        self.lock = threading.Lock()
+
+    def _client(self):
+        cl = client.HPE3ParClient(API_URL, pool_maxsize=32)
+        cl.http.session_key = 'key'
+
+        def request(method, url, **kwargs):
+            with self.lock:
+                self.urls.append(url)
+            # Let the other threads run while this request is in flight.
+            time.sleep(0.001)
+            if url.endswith('/api'):
+                body = VERSION
+            else:
+                body = {'total': 0, 'members': []}
+            return mock.Mock(status_code=200, url='',
+                             content=json.dumps(body).encode('utf-8'),
+                             headers=requests.structures.CaseInsensitiveDict())
+        cl.http.session = mock.Mock()
+        cl.http.session.request.side_effect = request
+        return cl
+
+    def _run(self, threads, target):
+        errors = []
+
+        def run():
+            try:
+                for i in range(20):
+                    target(i)
+            except Exception as ex:
+                errors.append(ex)
+        workers = [threading.Thread(target=run) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+        self.assertEqual(errors, [])
+
+    def test_version_probe_along_with_calls(self):
+        cl = self._client()
+
+        def call(i):
+            if i % 2:
+                self.assertEqual(cl.getWsApiVersion()['build'], 40000128)
+                client.HPE3ParClient.WSAPI_VERSIONS.clear()
+            else:
+                cl.getVolumes()
+        self._run(8, call)
+
+        self.assertEqual(cl.http.api_url, API_URL)
+        self.assertTrue(cl.primera_supported)
+        self.assertEqual(
+            set(self.urls),
+            set(['https://node0:8080/api', API_URL + '/volumes']))
+
+    def test_version_cached_per_array(self):
+        first = self._client()
+        first.getWsApiVersion()
+        second = self._client()
+        self.assertEqual(second.getWsApiVersion(), VERSION)
+        self.assertTrue(second.primera_supported)
+        self.assertEqual(self.urls, ['https://node0:8080/api'])
+
+        other = client.HPE3ParClient('https://node1:8080/api/v1')
+        other.http.session = second.http.session
+        other.getWsApiVersion()
+        self.assertEqual(self.urls[-1], 'https://node1:8080/api')
@@ -0,0 +1,159 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client adaptive timeouts."""
+
+import json
+import unittest
+import mock
+import requests
+
+from hpe3parclient import client
+from hpe3parclient import timeouts
+
+
+class AdaptiveTimeoutsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.timeouts = timeouts.AdaptiveTimeouts(
+            multiplier=3, floor=1, ceiling=100, min_samples=5,
+            overrides={'POST /volumes/<id> createSnapshot': 3600})
+
+    def _record(self, method, url, duration, count=5, action=None):
+        for i in range(count):
+            self.timeouts.record(method, url, duration, action)
+
+    def test_no_samples(self):
+        self.assertEqual(self.timeouts.get('GET', '/api/v1/ports'), 100)
+        self._record('GET', '/api/v1/ports', 0.5, count=4)
+        self.assertEqual(self.timeouts.get('GET', '/api/v1/ports'), 100)
+
+    def test_follows_latency(self):
+        self._record('GET', '/api/v1/volumes/vol1', 2.0)
+        timeout = self.timeouts.get('GET',
+                                    'https://3par:8080/api/v1/volumes/vol2')
+        self.assertAlmostEqual(timeout, 6.0, delta=1.5)
+
+    def test_floor_and_ceiling(self):
+        self._record('GET', '/api/v1/ports', 0.01)
+        self._record('GET', '/api/v1/vluns', 60.0)
+        self.assertEqual(self.timeouts.get('GET', '/api/v1/ports'), 1)
+        self.assertEqual(self.timeouts.get('GET', '/api/v1/vluns'), 100)
+        # The static timeout of the client is the ceiling.
+        self.assertEqual(self.timeouts.get('GET', '/api/v1/vluns',
+                                           ceiling=30), 30)
+
+    def test_actions(self):
+        self._record('POST', '/api/v1/volumes/vol1', 0.1,
+                     action='createSnapshot')
+        self._record('PUT', '/api/v1/volumes/vol1', 0.1, action=3)
+        self.assertEqual(self.timeouts.get('PUT', '/api/v1/volumes/vol2',
+                                           3), 1)
+        self.assertEqual(self.timeouts.get('PUT', '/api/v1/volumes/vol2',
+                                           6), 100)
+        # Fast snapshots do not shorten the timeout of copies.
+        self._record('POST', '/api/v1/volumes/vol1', 0.1, count=50,
+                     action='createPhysicalCopy')
+        self.assertEqual(self.timeouts.get('POST', '/api/v1/volumes/vol2',
+                                           'createPhysicalCopy'), 100)
+
+    def test_overrides(self):
+        self.assertEqual(self.timeouts.get('POST', '/api/v1/volumes/vol2',
+                                           'createSnapshot'), 3600)
+
+    def test_snapshot(self):
+        self._record('GET', '/api/v1/ports', 0.01)
+        self._record('PUT', '/api/v1/volumes/vol1', 0.1, action=3)
+        self.assertEqual(self.timeouts.snapshot(),
+                         {'GET /ports': 1, 'PUT /volumes/<id> 3': 1,
+                          'POST /volumes/<id> createSnapshot': 3600})
+
+    def test_bad_bounds(self):
+        self.assertRaises(ValueError, timeouts.AdaptiveTimeouts, floor=10,
+                          ceiling=1)
+
+
+class ClientTimeoutsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cl = client.HPE3ParClient(
+            'https://node0:8080/api/v1', timeout=30,
+            adaptive_timeouts=timeouts.AdaptiveTimeouts(floor=2,
+                                                        ceiling=120,
+                                                        min_samples=1))
+        self.cl.http.session_key = 'key'
+        self.cl.http.session = mock.Mock()
+        self.cl.http.session.request.return_value = mock.Mock(
+            status_code=200, url='',
+            content=json.dumps({'members': []}).encode('utf-8'),
+            headers=requests.structures.CaseInsensitiveDict())
+
+    def _timeout(self):
+        return self.cl.http.session.request.call_args[1]['timeout']
+
+    def test_adaptive_timeout(self):
+        self.cl.getPorts()
+        # The static timeout is the ceiling.
+        self.assertEqual(self._timeout(), 30)
+        self.cl.getPorts()
+        self.assertEqual(self._timeout(), 2)
+        self.assertEqual(self.cl.http.get_timeouts(), {'GET /ports': 2})
+
+    def test_copy_keeps_a_long_timeout(self):
+        for i in range(3):
+            self.cl.createSnapshot('snap%d' % i, 'vol1')
+        self.assertEqual(self._timeout(), 2)
+        self.cl.copyVolume('vol1', 'vol2', 'cpg')
+        self.assertEqual(self._timeout(), 30)
+
+    def test_attempts_are_timed(self):
+        clock = [100.0]
+        response = self.cl.http.session.request.return_value
+        responses = [requests.exceptions.ConnectionError('reset'), response]
+
+        def request(*args, **kwargs):
+            clock[0] += 0.1
+            result = responses.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        def sleep(delay):
+            clock[0] += 50
+        self.cl.http.session.request.side_effect = request
+        with mock.patch('hpe3parclient.timings.monotonic',
+                        side_effect=lambda: clock[0]):
+            with mock.patch('time.sleep', side_effect=sleep) as mock_sleep:
+                self.cl.getPorts()
+        self.assertTrue(mock_sleep.called)
+        histogram = self.cl.http.adaptive_timeouts.histograms['GET /ports']
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.errors, 1)
+        self.assertAlmostEqual(histogram.percentile(100), 0.1, delta=0.02)
+
+    def test_per_call_override(self):
+        self.cl.http.get('/ports', timeout=7)
+        self.assertEqual(self._timeout(), 7)
+        with self.cl.callTimeout(3600):
+            self.cl.getPorts()
+            self.assertEqual(self._timeout(), 3600)
+        self.cl.getPorts()
+        self.assertEqual(self._timeout(), 2)
+
+    def test_static_timeout(self):
+        cl = client.HPE3ParClient('https://node0:8080/api/v1', timeout=30)
+        self.assertIsNone(cl.http.get_timeouts())
+        self.assertEqual(cl.http._get_timeout('GET', cl.api_url), 30)
+        with cl.callTimeout(5):
+            self.assertEqual(cl.http._get_timeout('GET', cl.api_url), 5)
@@ -0,0 +1,98 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client request timings."""
+
+import unittest
+
+from hpe3parclient import timings
+
+
+class RequestTimingsTestCase(unittest.TestCase):
+
+    def test_url_template(self):
+        self.assertEqual(
+            timings.url_template('https://3par:8080/api/v1/volumes'),
+            '/volumes')
+        self.assertEqual(
+            timings.url_template('https://3par:8080/api/v1/volumes/vol1'),
+            '/volumes/<id>')
+        self.assertEqual(
+            timings.url_template('/api/v1/vluns?query="volumeName EQ v"'),
+            '/vluns')
+        self.assertEqual(
+            timings.url_template(
+                'https://3par:8080/api/v1/volumes/vol1/objectKeyValues/key'),
+            '/volumes/<id>/objectKeyValues/<id>')
+        self.assertEqual(timings.url_template('https://3par:8080/api'),
+                         '/api')
+
+    def test_histogram_percentiles(self):
+        histogram = timings.LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+
+        for i in range(1, 101):
+            histogram.record(i / 1000.0, error=(i % 10 == 0))
+
+        stats = histogram.to_dict()
+        self.assertEqual(stats['count'], 100)
+        self.assertEqual(stats['errors'], 10)
+        self.assertEqual(stats['min'], 0.001)
+        self.assertEqual(stats['max'], 0.1)
+        self.assertAlmostEqual(stats['mean'], 0.0505)
+        # Buckets are about 19% wide.
+        self.assertAlmostEqual(stats['p50'], 0.05, delta=0.05 * 0.2)
+        self.assertAlmostEqual(stats['p95'], 0.095, delta=0.095 * 0.2)
+        self.assertAlmostEqual(stats['p99'], 0.099, delta=0.099 * 0.2)
+        self.assertLessEqual(stats['p99'], stats['max'])
+
+    def test_histogram_outliers(self):
+        histogram = timings.LatencyHistogram()
+        histogram.record(0)
+        histogram.record(10000)
+        self.assertLessEqual(histogram.percentile(50), 0.0005)
+        self.assertEqual(histogram.percentile(100), 10000)
+
+    def test_ring_buffer(self):
+        request_timings = timings.RequestTimings(maxlen=2)
+        for i in range(3):
+            request_timings.record('GET', '/api/v1/hosts/h%s' % i, i, i + 1)
+
+        self.assertEqual(request_timings.get_recent(),
+                         [('GET /api/v1/hosts/h1', 1, 2),
+                          ('GET /api/v1/hosts/h2', 2, 3)])
+        self.assertEqual(
+            request_timings.snapshot()['GET /hosts/<id>']['count'], 3)
+
+    def test_snapshot_is_a_copy(self):
+        request_timings = timings.RequestTimings()
+        request_timings.record('GET', '/api/v1/cpgs', 0, 1)
+        snapshot = request_timings.snapshot()
+        request_timings.record('GET', '/api/v1/cpgs', 0, 1)
+
+        self.assertEqual(snapshot['GET /cpgs']['count'], 1)
+        self.assertEqual(
+            request_timings.snapshot(reset=True)['GET /cpgs']['count'], 2)
+        self.assertEqual(request_timings.snapshot(), {})
+
+    def test_endpoint_percentile(self):
+        request_timings = timings.RequestTimings()
+        for i in range(3):
+            request_timings.record('GET', '/api/v1/cpgs/cpg1', 0, 1)
+        self.assertEqual(request_timings.percentile(
+            'GET', 'https://3par:8080/api/v1/cpgs/cpg2', 95), 1)
+        self.assertIsNone(request_timings.percentile(
+            'GET', '/api/v1/cpgs/cpg2', 95, min_count=4))
+        self.assertIsNone(request_timings.percentile(
+            'DELETE', '/api/v1/cpgs/cpg2', 95))
@@ -0,0 +1,162 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the 3PAR Client call tracing."""
+
+import json
+import unittest
+import mock
+import requests
+
+from hpe3parclient import client
+from hpe3parclient import exceptions
+from hpe3parclient import ssh
+from hpe3parclient import tracing
+
+
+class RecordingHook(tracing.TraceHook):
+
+    def __init__(self):
+        self.events = []
+
+    def on_start(self, event):
+        self.events.append(('start', event.name, event.duration))
+
+    def on_end(self, event):
+        self.events.append(('end', event.name, event.status, event.bytes,
+                            event.retries, event.error))
+
+
+class ClientTracingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = RecordingHook()
+        self.aggregator = tracing.TraceAggregator()
+        self.cl = client.HPE3ParClient(
+            'https://node0:8080/api/v1',
+            trace_hooks=[self.hook, self.aggregator])
+        self.cl.http.session_key = 'key'
+        self.cl.http.session = mock.Mock()
+
+    def _response(self, status, body):
+        return mock.Mock(status_code=status, url='',
+                         content=json.dumps(body).encode('utf-8'),
+                         headers=requests.structures.CaseInsensitiveDict())
+
+    @mock.patch('time.sleep')
+    def test_http_events(self, mock_sleep):
+        body = {'name': 'vol1'}
+        size = len(json.dumps(body))
+        self.cl.http.session.request.side_effect = [
+            self._response(503, {}), self._response(200, body)]
+        self.cl.getVolume('vol1')
+        self.assertEqual(self.hook.events,
+                         [('start', 'GET /volumes/<id>', None),
+                          ('end', 'GET /volumes/<id>', 200, size, 1,
+                           None)])
+
+        self.cl.http.session.request.side_effect = None
+        self.cl.http.session.request.return_value = self._response(
+            404, {'code': 23})
+        self.assertRaises(exceptions.HTTPNotFound, self.cl.getVolume, 'vol2')
+        event = self.hook.events[-1]
+        self.assertEqual(event[2], 404)
+        self.assertIsInstance(event[5], exceptions.HTTPNotFound)
+
+        stats = self.aggregator.snapshot(reset=True)['GET /volumes/<id>']
+        self.assertEqual(stats['count'], 2)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['retries'], 1)
+        self.assertEqual(stats['statuses'], {200: 1, 404: 1})
+        self.assertEqual(self.aggregator.snapshot(), {})
+
+    def test_failing_hook(self):
+        hook = mock.Mock()
+        hook.on_start.side_effect = ValueError('broken hook')
+        self.cl.trace_hooks[:] = [hook]
+        self.cl.http.session.request.return_value = self._response(
+            200, {'name': 'vol1'})
+        self.assertEqual(self.cl.getVolume('vol1'), {'name': 'vol1'})
+        self.assertTrue(hook.on_end.called)
+
+    @mock.patch('hpe3parclient.tracing.start')
+    def test_no_hooks(self, mock_start):
+        self.cl.trace_hooks[:] = []
+        self.cl.http.session.request.return_value = self._response(
+            200, {'name': 'vol1'})
+        self.cl.getVolume('vol1')
+        self.assertFalse(mock_start.called)
+
+    @mock.patch('paramiko.SSHClient')
+    def test_ssh_events(self, mock_ssh_client):
+        self.cl.setSSHOptions('10.0.0.1', 'user', 'pass')
+        self.assertIs(self.cl.ssh.trace_hooks, self.cl.trace_hooks)
+        with mock.patch.object(ssh.HPE3PARSSHClient, '_run_ssh',
+                               return_value=(b'a\r\nb\r\n', b'')):
+            self.cl.ssh.run(['showport', '-d'])
+        with mock.patch.object(ssh.HPE3PARSSHClient, '_run_ssh',
+                               side_effect=exceptions.SSHException('down')):
+            self.assertRaises(exceptions.SSHException, self.cl.ssh.run,
+                              ['showvv', 'secret'])
+        self.assertEqual(self.hook.events[1],
+                         ('end', 'SSH showport', None, 6, 0, None))
+        self.assertEqual(self.hook.events[2][1], 'SSH showvv')
+        self.assertIsInstance(self.hook.events[3][5], exceptions.SSHException)
+
+
+class OpenTelemetryHookTestCase(unittest.TestCase):
+
+    def test_spans(self):
+        tracer = mock.Mock()
+        span = tracer.start_span.return_value
+        hook = tracing.OpenTelemetryHook(tracer)
+        event = tracing.start([hook], tracing.HTTP, 'GET', '/volumes/<id>',
+                              'https://node0:8080/api/v1/volumes/vol1')
+        self.assertEqual(tracer.start_span.call_args[0][0],
+                         'GET /volumes/<id>')
+        attributes = tracer.start_span.call_args[1]['attributes']
+        self.assertEqual(attributes['http.method'], 'GET')
+        self.assertEqual(attributes['hpe3par.template'], '/volumes/<id>')
+
+        event.status = 500
+        error = exceptions.HTTPInternalServerError()
+        tracing.end([hook], event, error=error)
+        span.set_attribute.assert_any_call('http.status_code', 500)
+        span.record_exception.assert_called_once_with(error)
+        span.end.assert_called_once_with()
+        self.assertEqual(event.context, {})
+
+    def test_session_key_not_exported(self):
+        tracer = mock.Mock()
+        span = tracer.start_span.return_value
+        cl = client.HPE3ParClient('https://node0:8080/api/v1',
+                                  trace_hooks=[tracing.OpenTelemetryHook(
+                                      tracer)])
+        cl.http.session_key = 'secret-session-key'
+        cl.http.session = mock.Mock()
+        cl.http.session.request.return_value = mock.Mock(
+            status_code=200, url='', content=b'',
+            headers=requests.structures.CaseInsensitiveDict())
+        cl.http.unauthenticate()
+        self.assertEqual(tracer.start_span.call_args[0][0],
+                         'DELETE /credentials/<id>')
+        attributes = tracer.start_span.call_args[1]['attributes']
+        self.assertEqual(attributes['http.host'], 'node0:8080')
+        exported = repr([tracer.start_span.call_args] +
+                        span.set_attribute.call_args_list)
+        self.assertNotIn('secret-session-key', exported)
+
+    @mock.patch('hpe3parclient.tracing.otel_trace', None)
+    def test_needs_opentelemetry(self):
+        self.assertRaises(ImportError, tracing.OpenTelemetryHook)
@@ -19,6 +19,7 @@ import unittest
 from pytest_testconfig import config
 from test import HPE3ParClient_base as hpe3parbase
 
+from hpe3parclient import bulk
 from hpe3parclient import exceptions
 
 
@@ -313,6 +314,48 @@ class HPE3ParClientVolumeTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
 
         self.printFooter('get_volumes')
 
+    def test_2_iter_volumes(self):
+        self.printHeader('iter_volumes')
+
+        self.cl.createVolume(VOLUME_NAME1, CPG_NAME1, SIZE)
+        self.cl.createVolume(VOLUME_NAME2, CPG_NAME1, SIZE)
+
+        vols = self.cl.getVolumes()
+        self.assertEqual(list(self.cl.iterVolumes()), vols['members'])
+
+        names = list(self.cl.iterVolumes(fields=['name', 'sizeMiB']))
+        self.assertIn({'name': VOLUME_NAME1, 'sizeMiB': SIZE}, names)
+        self.assertIn({'name': VOLUME_NAME2, 'sizeMiB': SIZE}, names)
+
+        self.printFooter('iter_volumes')
+
+    def test_2_bulk_create_volumes(self):
+        self.printHeader('bulk_create_volumes')
+
+        create1 = bulk.Operation('createVolume',
+                                 (VOLUME_NAME1, CPG_NAME1, SIZE))
+        create2 = bulk.Operation('createVolume',
+                                 (VOLUME_NAME2, CPG_NAME1, SIZE))
+        tag1 = bulk.Operation('setVolumeMetaData',
+                              (VOLUME_NAME1, 'owner', 'flask'),
+                              depends_on=[create1])
+        duplicate = bulk.Operation('createVolume',
+                                   (VOLUME_NAME1, CPG_NAME1, SIZE),
+                                   depends_on=[create1])
+        results = self.cl.bulk([create1, create2, tag1, duplicate],
+                               concurrency=2)
+
+        self.assertEqual([result.ok for result in results],
+                         [True, True, True, False])
+        self.assertIsInstance(results[3].error, exceptions.HTTPConflict)
+        self.assertEqual(self.cl.getVolume(VOLUME_NAME2)['name'],
+                         VOLUME_NAME2)
+        self.assertEqual(
+            self.cl.getVolumeMetaData(VOLUME_NAME1, 'owner')['value'],
+            'flask')
+
+        self.printFooter('bulk_create_volumes')
+
     def test_3_delete_volume_nonExist(self):
         self.printHeader('delete_volume_nonExist')
 
@@ -14,12 +14,17 @@
 
 """Test class of 3PAR Client handling HTTPJSONRESTClient."""
 
+import json
+import threading
+import time
 import unittest
 import mock
 import requests
 
 from hpe3parclient import exceptions
 from hpe3parclient import http
+from hpe3parclient import ratelimit
+from hpe3parclient import retry
 
 
 class HTTPJSONRESTClientTestCase(unittest.TestCase):
@@ -86,7 +91,7 @@ class HTTPJSONRESTClientTestCase(unittest.TestCase):
         http_method = 'fake this'
         http_url = 'http://fake-url:0000'
 
-        with mock.patch('requests.request', retest, create=True):
+        with mock.patch.object(self.http.session, 'request', retest):
             # Test timeout exception
             retest.side_effect = requests.exceptions.Timeout
             self.assertRaises(exceptions.Timeout,
@@ -128,3 +133,315 @@ class HTTPJSONRESTClientTestCase(unittest.TestCase):
             self.assertRaises(requests.exceptions.ConnectionError,
                               self.http.request,
                               http_url, http_method)
+
+    def test_request_reuses_session(self):
+        session = mock.Mock()
+        session.request.return_value = mock.Mock(
+            status_code=200, content=b'', url='http://fake-url:0000',
+            headers=requests.structures.CaseInsensitiveDict())
+        self.http.session = session
+
+        self.http.request('http://fake-url:0000/volumes', 'GET')
+        self.http.request('http://fake-url:0000/hosts', 'GET')
+
+        self.assertEqual(session.request.call_count, 2)
+        session.close.assert_not_called()
+
+    def test_pool_settings(self):
+        http_client = http.HTTPJSONRESTClient('http://fake-url:0000',
+                                              pool_connections=2,
+                                              pool_maxsize=4,
+                                              pool_block=True)
+        adapter = http_client.session.get_adapter('https://fake-url:0000')
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertTrue(adapter._pool_block)
+
+    def test_pool_idle_timeout(self):
+        self.http.session = mock.Mock()
+        self.http.pool_idle_timeout = 60
+
+        with mock.patch('time.time', return_value=1000):
+            self.http._get_session()
+        with mock.patch('time.time', return_value=1030):
+            self.http._get_session()
+        self.http.session.close.assert_not_called()
+
+        with mock.patch('time.time', return_value=1100):
+            self.http._get_session()
+        self.http.session.close.assert_called_once_with()
+
+    def test_timings_are_bounded(self):
+        http_client = http.HTTPJSONRESTClient('http://fake-url:0000/api/v1',
+                                              timings_maxlen=3)
+        http_client.request = mock.Mock(return_value=({}, None))
+        for i in range(5):
+            http_client._time_request(
+                'http://fake-url:0000/api/v1/volumes/vol%s' % i, 'GET')
+
+        timings = http_client.get_timings()
+        self.assertEqual(
+            [name for name, start, end in timings],
+            ['GET http://fake-url:0000/api/v1/volumes/vol%s' % i
+             for i in range(2, 5)])
+
+        stats = http_client.get_timing_stats()
+        self.assertEqual(list(stats.keys()), ['GET /volumes/<id>'])
+        self.assertEqual(stats['GET /volumes/<id>']['count'], 5)
+
+        http_client.reset_timings()
+        self.assertEqual(http_client.get_timings(), [])
+        self.assertEqual(http_client.get_timing_stats(), {})
+
+    def test_timings_count_errors(self):
+        self.http.request = mock.Mock(side_effect=exceptions.HTTPNotFound())
+        self.assertRaises(exceptions.HTTPNotFound, self.http._time_request,
+                          'http://fake-url:0000/api/v1/cpgs/cpg1', 'GET')
+
+        stats = self.http.get_timing_stats(reset=True)
+        self.assertEqual(stats['GET /cpgs/<id>']['count'], 1)
+        self.assertEqual(stats['GET /cpgs/<id>']['errors'], 1)
+        self.assertEqual(self.http.get_timing_stats(), {})
+
+    def _start_gets(self, urls):
+        results = [None] * len(urls)
+
+        def get(i, url):
+            try:
+                results[i] = self.http.get(url)
+            except Exception as ex:
+                results[i] = ex
+
+        threads = [threading.Thread(target=get, args=(i, url))
+                   for i, url in enumerate(urls)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def _wait_for_waiters(self, url, waiters):
+        key = self.http.api_url + url
+        for i in range(500):
+            flight = self.http._flights.get(key)
+            if flight is not None and flight.waiters == waiters:
+                return
+            time.sleep(0.01)
+        self.fail("GETs were not coalesced")
+
+    def test_coalesce_gets(self):
+        release = threading.Event()
+        resp = requests.structures.CaseInsensitiveDict({'status': '200'})
+        resp.status = 200
+
+        def send(url, method, **kwargs):
+            release.wait()
+            return resp, {'members': [{'name': 'port1'}]}
+
+        self.http._send_cs_request = mock.Mock(side_effect=send)
+        self.http.coalesce_gets = True
+        threads, results = self._start_gets(['/ports'] * 5)
+        self._wait_for_waiters('/ports', 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.http._send_cs_request.assert_called_once_with('/ports', 'GET')
+        self.assertEqual(self.http.get_coalescing_stats(),
+                         {'sent': 1, 'coalesced': 4})
+        for result in results:
+            self.assertEqual(result[0].status, 200)
+            self.assertEqual(result[1], {'members': [{'name': 'port1'}]})
+        # Every caller gets its own copy.
+        bodies = [result[1] for result in results]
+        self.assertEqual(len(set(id(body) for body in bodies)), 5)
+        self.assertEqual(
+            len(set(id(body['members'][0]) for body in bodies)), 5)
+
+    def test_coalesce_gets_error(self):
+        release = threading.Event()
+        ex = exceptions.HTTPNotFound()
+
+        def send(url, method, **kwargs):
+            release.wait()
+            raise ex
+
+        self.http._send_cs_request = mock.Mock(side_effect=send)
+        self.http.coalesce_gets = True
+        threads, results = self._start_gets(['/hosts/h1'] * 3)
+        self._wait_for_waiters('/hosts/h1', 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.http._send_cs_request.call_count, 1)
+        self.assertEqual(results, [ex] * 3)
+        self.assertEqual(self.http._flights, {})
+
+    def test_no_coalescing(self):
+        self.assertFalse(self.http.coalesce_gets)
+        self.http.coalesce_gets = True
+        self.http._send_cs_request = mock.Mock(return_value=({}, None))
+        self.http.get('/ports')
+        self.http.get('/ports')
+        self.http.post('/ports', body={})
+        self.http.coalesce_gets = False
+        self.http.get('/ports')
+
+        self.assertEqual(self.http._send_cs_request.call_count, 4)
+        self.assertEqual(self.http.get_coalescing_stats(),
+                         {'sent': 2, 'coalesced': 0})
+
+    def _fake_array(self, keys, wait_for=0):
+        # Answers like an array whose sessions expired, except for the keys
+        # handed out by the logins.
+        calls = {'logins': 0, 'rejected': 0}
+        herd = threading.Event()
+        if not wait_for:
+            herd.set()
+        lock = threading.Lock()
+
+        def response(status, body):
+            return mock.Mock(
+                status_code=status, url='http://fake-url:0000',
+                content=json.dumps(body).encode('utf-8'),
+                headers=requests.structures.CaseInsensitiveDict())
+
+        def request(method, url, headers=None, **kwargs):
+            if url.endswith('/credentials'):
+                with lock:
+                    calls['logins'] += 1
+                    key = keys[calls['logins'] - 1]
+                return response(201, {'key': key})
+            session_key = headers.get(self.http.SESSION_COOKIE_NAME)
+            if session_key not in keys:
+                with lock:
+                    calls['rejected'] += 1
+                    if calls['rejected'] == wait_for:
+                        herd.set()
+                herd.wait(5)
+                return response(401, {'code': 6, 'desc': 'invalid session'})
+            return response(200, {'key': session_key})
+
+        self.http.session = mock.Mock()
+        self.http.session.request.side_effect = request
+        return calls
+
+    def test_reauth_single_flight(self):
+        calls = self._fake_array(['key1', 'key2'], wait_for=10)
+        self.http.authenticate('user', 'pass')
+        self.http.session_key = 'expired'
+
+        threads, results = self._start_gets(['/volumes/vol%s' % i
+                                             for i in range(10)])
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls['logins'], 2)
+        self.assertEqual([body['key'] for resp, body in results],
+                         ['key2'] * 10)
+
+    def test_no_reauth_after_failed_login(self):
+        self.http.request = mock.Mock(side_effect=exceptions.HTTPForbidden())
+        self.assertRaises(exceptions.HTTPForbidden,
+                          self.http.authenticate, 'user', 'bad')
+        self.assertIsNone(self.http.session_key)
+
+        self.http.request.side_effect = exceptions.HTTPUnauthorized()
+        self.assertRaises(exceptions.HTTPUnauthorized,
+                          self.http.get, '/volumes')
+        self.assertEqual(self.http.request.call_count, 2)
+
+    @mock.patch('hpe3parclient.timings.monotonic')
+    def test_proactive_session_renewal(self, mock_monotonic):
+        calls = self._fake_array(['key1', 'key2'])
+        self.http.session_idle_timeout = 900
+        self.http.session_renew_margin = 60
+
+        mock_monotonic.return_value = 1000
+        self.http.authenticate('user', 'pass')
+        mock_monotonic.return_value = 1800
+        self.assertEqual(self.http.get('/volumes')[1]['key'], 'key1')
+        mock_monotonic.return_value = 2600
+        self.assertEqual(self.http.get('/volumes')[1]['key'], 'key1')
+        self.assertEqual(calls['logins'], 1)
+
+        # Idle for longer than the timeout minus the margin.
+        mock_monotonic.return_value = 3441
+        self.assertEqual(self.http.get('/volumes')[1]['key'], 'key2')
+        self.assertEqual(calls, {'logins': 2, 'rejected': 0})
+
+    @mock.patch('time.sleep')
+    def test_limiters(self, mock_sleep):
+        self.http.rate_limiter = ratelimit.TokenBucket(1, burst=3)
+        self.http.concurrency_limiter = \
+            ratelimit.AdaptiveConcurrencyLimiter(initial=8)
+        statuses = [503, 503, 200]
+
+        def request(method, url, **kwargs):
+            return mock.Mock(status_code=statuses.pop(0), url=url,
+                             content=b'{}',
+                             headers=requests.structures.CaseInsensitiveDict())
+        self.http.session = mock.Mock()
+        self.http.session.request.side_effect = request
+
+        self.http.get('/volumes')
+
+        stats = self.http.get_limiter_stats()
+        # Every retry was let through, each 503 halved the window and the
+        # success grew it again.
+        self.assertLess(stats['rate']['tokens'], 1)
+        self.assertEqual(stats['concurrency']['window'], 2.5)
+        self.assertEqual(stats['concurrency']['decreases'], 2)
+        self.assertEqual(stats['concurrency']['increases'], 1)
+        self.assertEqual(stats['concurrency']['in_flight'], 0)
+
+    def test_concurrency_limiter_timeout(self):
+        self.http.concurrency_limiter = \
+            ratelimit.AdaptiveConcurrencyLimiter(initial=8)
+        self.http.retry_policy = retry.RetryPolicy(tries=1)
+        self.http.session = mock.Mock()
+        self.http.session.request.side_effect = \
+            requests.exceptions.ReadTimeout()
+
+        self.assertRaises(exceptions.Timeout, self.http.get, '/volumes')
+        self.assertEqual(self.http.get_limiter_stats()['concurrency'],
+                         {'window': 4, 'limit': 4, 'in_flight': 0,
+                          'queued': 0, 'max_queued': 0, 'increases': 0,
+                          'decreases': 1})
+
+    def test_no_limiters(self):
+        self.assertEqual(self.http.get_limiter_stats(),
+                         {'rate': None, 'concurrency': None, 'lanes': None})
+        cl = http.HTTPJSONRESTClient('http://fake-url:0000', rate_limit=5,
+                                     concurrency_limiter=True)
+        self.assertEqual(cl.rate_limiter.rate, 5)
+        self.assertIsInstance(cl.concurrency_limiter,
+                              ratelimit.AdaptiveConcurrencyLimiter)
+
+    def test_lanes(self):
+        self.http.priority_limiter = ratelimit.PriorityLimiter()
+        lanes = []
+
+        def request(method, url, **kwargs):
+            stats = self.http.priority_limiter.stats()['lanes']
+            lanes.extend(lane for lane in stats
+                         if stats[lane]['in_flight'])
+            return mock.Mock(status_code=200, url=url, content=b'{}',
+                             headers=requests.structures.CaseInsensitiveDict())
+        self.http.session = mock.Mock()
+        self.http.session.request.side_effect = request
+
+        self.http.get('/volumes')
+        with self.http.lane('background'):
+            self.http.get('/cpgs')
+            with self.http.lane('interactive', override=False):
+                self.http.get('/cpgs')
+            with self.http.lane('interactive'):
+                self.http.get('/vluns')
+        self.assertEqual(lanes, ['normal', 'background', 'background',
+                                 'interactive'])
+        self.assertIsNone(self.http._local.lane)
+        stats = self.http.get_limiter_stats()['lanes']['lanes']
+        self.assertEqual(stats['background']['sent'], 2)
+        self.assertEqual(stats['background']['in_flight'], 0)
+
+        self.assertRaises(ValueError, self.http.lane('urgent').__enter__)
@@ -0,0 +1,136 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare the JSON codecs on large synthetic WSAPI responses.
+
+Usage: python tools/json_codec_benchmark.py [-members 30000] [-repeat 5]
+
+For every installed codec this prints the best time to decode and encode a
+/volumes and a /vluns response. The "json (str)" line is the old way of
+decoding the body to a str first and parsing that with the json module.
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..'))
+
+from hpe3parclient import codec  # noqa
+
+
+def make_volume(i):
+    return {
+        'id': i,
+        'name': 'volume-%08d-1a2b-3c4d-5e6f-%012d' % (i, i),
+        'uuid': '%08x-1a2b-3c4d-5e6f-%012x' % (i, i),
+        'wwn': '60002AC%025X' % i,
+        'provisioningType': 2,
+        'copyType': 1,
+        'baseId': i,
+        'readOnly': False,
+        'state': 1,
+        'failedStates': [],
+        'degradedStates': [],
+        'additionalStates': [],
+        'adminSpace': {'reservedMiB': 384, 'rawReservedMiB': 1152,
+                       'usedMiB': 7, 'freeMiB': 377},
+        'snapshotSpace': {'reservedMiB': 512, 'rawReservedMiB': 1536,
+                          'usedMiB': 0, 'freeMiB': 512},
+        'userSpace': {'reservedMiB': 10240, 'rawReservedMiB': 30720,
+                      'usedMiB': 2048, 'freeMiB': 8192},
+        'totalReservedMiB': 11136,
+        'totalUsedMiB': 2055,
+        'sizeMiB': 102400,
+        'hostWriteMiB': 4096,
+        'wrtieMiB': 4096,
+        'userCPG': 'OpenStackCPG',
+        'snapCPG': 'OpenStackCPGSnap',
+        'comment': '{"display_name": "vol %d", "type": "Cinder"}' % i,
+        'policies': {'staleSS': True, 'oneHost': False, 'zeroDetect': True,
+                     'system': False, 'caching': True, 'fsvc': False,
+                     'hostDIF': 3},
+        'capacityEfficiency': {'compaction': 9.5, 'deduplication': 1.2},
+        'creationTime8601': '2026-01-14T16:58:41+00:00',
+        'creationTimeSec': 1768409921,
+        'links': [{'href': 'https://3par:8080/api/v1/volumes/volume-%d' % i,
+                   'rel': 'self'}],
+    }
+
+
+def make_vlun(i):
+    return {
+        'lun': i % 255,
+        'volumeName': 'volume-%08d-1a2b-3c4d-5e6f-%012d' % (i, i),
+        'hostname': 'compute-%04d' % (i % 500),
+        'remoteName': '100000109B1BC4%02X' % (i % 256),
+        'portPos': {'node': i % 2, 'slot': 1, 'cardPort': 1 + i % 2},
+        'type': 4,
+        'volumeWWN': '60002AC%025X' % i,
+        'multipathing': 1,
+        'failedPathPol': 1,
+        'failedPathInterval': 0,
+        'active': True,
+    }
+
+
+def make_payload(factory, members):
+    return {'total': members,
+            'members': [factory(i) for i in range(members)]}
+
+
+def best_time(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-members', type=int, default=30000)
+    parser.add_argument('-repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    codecs = [codec.get_codec(name) for name in codec.available_codecs()]
+
+    print("%-10s %-12s %12s %12s" % ('payload', 'codec', 'decode (ms)',
+                                     'encode (ms)'))
+    for name, factory in (('/volumes', make_volume), ('/vluns', make_vlun)):
+        payload = make_payload(factory, args.members)
+        data = json.dumps(payload).encode('utf-8')
+
+        def decode_str():
+            return json.loads(data.decode('utf-8'))
+
+        def encode_str():
+            return json.dumps(payload)
+
+        rows = [('json (str)', decode_str, encode_str)]
+        for json_codec in codecs:
+            rows.append((json_codec.name,
+                         lambda c=json_codec: c.loads(data),
+                         lambda c=json_codec: c.dumps(payload)))
+
+        for codec_name, decode, encode in rows:
+            print("%-10s %-12s %12.1f %12.1f" % (
+                name, codec_name,
+                best_time(decode, args.repeat) * 1000,
+                best_time(encode, args.repeat) * 1000))
+        print("%-10s %d members, %.1f MB" % (name, args.members,
+                                             len(data) / 1024.0 / 1024.0))
+
+
+if __name__ == '__main__':
+    main()